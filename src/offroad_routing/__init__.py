@@ -1,4 +1,5 @@
 from .osm_data.geometry import Geometry
 from .pathfinding.astar import AStar
 from .pathfinding.gpx_track import GpxTrack
+from .pathfinding.reachability import Reachability
 from .visibility.visibility_graph import VisibilityGraph
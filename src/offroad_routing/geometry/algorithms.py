@@ -1,13 +1,34 @@
+from math import asin
 from math import atan2
+from math import cos as math_cos
+from math import degrees
 from math import fabs
 from math import pi
-
+from math import radians as math_radians
+from math import sin as math_sin
+from math import sqrt as math_sqrt
+from typing import Sequence
+from typing import Tuple
+
+from numpy import abs as np_abs
+from numpy import arange
 from numpy import arctan2
+from numpy import argsort
+from numpy import array
+from numpy import asarray
 from numpy import cos
+from numpy import cumsum
+from numpy import errstate
+from numpy import maximum
+from numpy import minimum
+from numpy import ndarray
 from numpy import radians
-from numpy import round
+from numpy import repeat
+from numpy import rint
+from numpy import searchsorted
 from numpy import sin
 from numpy import sqrt
+from offroad_routing.geometry.geom_types import TBBox
 from offroad_routing.geometry.geom_types import TPoint
 
 
@@ -17,11 +38,73 @@ def point_distance(a: TPoint, b: TPoint) -> float:
     Points a and b given in format (lon, lat).
     """
     (lon1, lat1), (lon2, lat2) = a, b
-    phi1, phi2 = radians(lat1), radians(lat2)
-    delta_phi = radians(lat2 - lat1)
-    delta_lambda = radians(lon2 - lon1)
-    a = sin(delta_phi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(delta_lambda / 2) ** 2
-    return round(6371 * (2 * arctan2(sqrt(a), sqrt(1 - a))), 4)
+    phi1, phi2 = math_radians(lat1), math_radians(lat2)
+    delta_phi = math_radians(lat2 - lat1)
+    delta_lambda = math_radians(lon2 - lon1)
+    a = math_sin(delta_phi / 2) ** 2 + math_cos(phi1) * math_cos(phi2) * math_sin(delta_lambda / 2) ** 2
+    # same as numpy.round(distance, 4): half to even rounding of distance * 10000
+    return round(6371 * (2 * atan2(math_sqrt(a), math_sqrt(1 - a))) * 10000) / 10000
+
+
+# number of points from which numpy calls are cheaper than python loop in point_distances
+VECTORIZED_DISTANCES_SIZE = 32
+
+
+def point_distances(origin: TPoint, points) -> ndarray:
+    """
+    Geodesic distances from origin to each of points, equal to point_distance(origin, point).
+
+    :param origin: point (lon, lat)
+    :param points: sequence or array of points of shape (n, 2)
+    """
+    if len(points) < VECTORIZED_DISTANCES_SIZE:
+        return array([point_distance(origin, point) for point in points], dtype=float)
+    points = asarray(points, dtype=float).reshape(-1, 2)
+    lon1, lat1 = origin
+    phi2 = radians(points[:, 1])
+    a = sin(radians(points[:, 1] - lat1) / 2)
+    a *= a
+    b = sin(radians(points[:, 0] - lon1) / 2)
+    b *= b
+    a += math_cos(math_radians(lat1)) * cos(phi2) * b
+    return _round_distance(arctan2(sqrt(a), sqrt(1 - a)))
+
+
+def pairwise_point_distances(a, b) -> ndarray:
+    """
+    Geodesic distances between all pairs of points, equal to point_distance(a[i], b[j]).
+
+    :param a: sequence or array of points of shape (n, 2)
+    :param b: sequence or array of points of shape (m, 2)
+    :return: array of shape (n, m)
+    """
+    a, b = asarray(a, dtype=float).reshape(-1, 2), asarray(b, dtype=float).reshape(-1, 2)
+    lon1, lat1, lon2, lat2 = a[:, 0, None], a[:, 1, None], b[None, :, 0], b[None, :, 1]
+    h = sin(radians(lat2 - lat1) / 2) ** 2 + \
+        cos(radians(lat1)) * cos(radians(lat2)) * sin(radians(lon2 - lon1) / 2) ** 2
+    return _round_distance(arctan2(sqrt(h), sqrt(1 - h)))
+
+
+def _round_distance(central_angle: ndarray) -> ndarray:
+    # km rounded to 4 decimals the same way as numpy.round does it
+    distance = 2 * central_angle
+    distance *= 6371
+    distance *= 10000
+    return rint(distance, out=distance) / 10000
+
+
+def distance_bbox(point: TPoint, distance: float) -> TBBox:
+    """
+    Bounding box of all points within geodesic distance (km) from point.
+    Point given in format (lon, lat), bounding box in format (min_lon, min_lat, max_lon, max_lat).
+    """
+    lon, lat = point
+    angular_distance = distance / 6371
+    delta_lat = degrees(angular_distance)
+    if angular_distance >= pi / 2 - fabs(math_radians(lat)):
+        return lon - 180, max(lat - delta_lat, -90), lon + 180, min(lat + delta_lat, 90)
+    delta_lon = degrees(asin(math_sin(angular_distance) / math_cos(math_radians(lat))))
+    return lon - delta_lon, lat - delta_lat, lon + delta_lon, lat + delta_lat
 
 
 def cross_product(p: TPoint, q: TPoint) -> float:
@@ -67,5 +150,83 @@ def check_ray_segment_intersection(p: TPoint, b: TPoint, q: TPoint, d: TPoint,
     return 0 <= t and 0 <= u <= 1 if end_intersection else 0 < t and 0 < u < 1
 
 
+# vectorized versions of the functions above: each point argument is either a single point
+# or an array of points of shape (n, 2), arguments are broadcast against each other,
+# results are equal to results of scalar functions applied elementwise
+
+
+def turns(a, b, c) -> ndarray:
+    a, b, c = asarray(a, dtype=float), asarray(b, dtype=float), asarray(c, dtype=float)
+    return (b[..., 0] - a[..., 0]) * (c[..., 1] - b[..., 1]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - b[..., 0])
+
+
+def polar_angles(a, b) -> ndarray:
+    a, b = asarray(a, dtype=float), asarray(b, dtype=float)
+    return (arctan2(b[..., 1] - a[..., 1], b[..., 0] - a[..., 0]) + 2 * pi) % (2 * pi)
+
+
+def points_in_angle(points, lt: TPoint, pt: TPoint, rt: TPoint) -> ndarray:
+    if turn(lt, pt, rt) > 0:
+        return (turns(pt, lt, points) < 0) & (0 < turns(pt, rt, points))
+    return (turns(pt, rt, points) < 0) & (0 < turns(pt, lt, points))
+
+
+def check_segment_intersections(a0, b0, c0, d0) -> ndarray:
+    return (turns(a0, b0, c0) * turns(a0, b0, d0) < 0) & (turns(c0, d0, a0) * turns(c0, d0, b0) < 0)
+
+
+def check_ray_segment_intersections(p, b, q, d, end_intersection: bool = False) -> ndarray:
+    p, b, q, d = asarray(p, dtype=float), asarray(b, dtype=float), asarray(q, dtype=float), asarray(d, dtype=float)
+    r, s, pq = b - p, d - q, q - p
+    r_cross_s = r[..., 0] * s[..., 1] - r[..., 1] * s[..., 0]
+    with errstate(divide='ignore', invalid='ignore'):
+        t = (pq[..., 0] * s[..., 1] - pq[..., 1] * s[..., 0]) / r_cross_s
+        u = (pq[..., 0] * r[..., 1] - pq[..., 1] * r[..., 0]) / r_cross_s
+    result = (0 <= t) & (0 <= u) & (u <= 1) if end_intersection else (0 < t) & (0 < u) & (u < 1)
+    return result & (np_abs(r_cross_s) >= 1e-8)
+
+
+def segment_crossings(a, b) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+    """
+    Find pairs of segments crossing each other at a point inside both of them (see check_segment_intersection).
+    Candidate pairs have overlapping x ranges, they are found by sorting segments by the smallest x,
+    so the time is O(n log n) plus the number of candidates.
+
+    :param a: first points of segments, array of shape (n, 2)
+    :param b: second points of segments, array of shape (n, 2)
+    :return: numbers of the first and the second segment of each pair and positions of crossing point on them
+        (from 0 at the first point to 1 at the second point)
+    """
+    a, b = asarray(a, dtype=float).reshape(-1, 2), asarray(b, dtype=float).reshape(-1, 2)
+    low, high = minimum(a[:, 0], b[:, 0]), maximum(a[:, 0], b[:, 0])
+    order = argsort(low, kind='stable')
+    # segments after each one in sorted order which start within its x range
+    first = arange(1, len(order) + 1)
+    counts = maximum(searchsorted(low[order], high[order], side='right') - first, 0)
+    i = repeat(order, counts)
+    j = order[repeat(first - cumsum(counts) + counts, counts) + arange(counts.sum())]
+    overlap = (minimum(a[i, 1], b[i, 1]) <= maximum(a[j, 1], b[j, 1])) & \
+              (minimum(a[j, 1], b[j, 1]) <= maximum(a[i, 1], b[i, 1]))
+    i, j = i[overlap], j[overlap]
+    crossing = check_segment_intersections(a[i], b[i], a[j], b[j])
+    i, j = i[crossing], j[crossing]
+    r, s, q = b[i] - a[i], b[j] - a[j], a[j] - a[i]
+    denominator = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+    return (i, j, (q[:, 0] * s[:, 1] - q[:, 1] * s[:, 0]) / denominator,
+            (q[:, 0] * r[:, 1] - q[:, 1] * r[:, 0]) / denominator)
+
+
 def compare_points(p1: TPoint, p2: TPoint) -> bool:
     return fabs(p1[0] - p2[0]) < 1e-8 and fabs(p1[1] - p2[1]) < 1e-8
+
+
+def bounding_box(points: Sequence[TPoint]) -> TBBox:
+    """
+    Bounding box of points in format (min_x, min_y, max_x, max_y).
+    """
+    xs, ys = [point[0] for point in points], [point[1] for point in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def check_bbox_intersection(a: TBBox, b: TBBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
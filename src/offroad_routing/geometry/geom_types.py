@@ -8,6 +8,7 @@ TPoint = NewType('TPoint', Tuple[float, float])
 TPolygon = NewType('TPolygon', Tuple[TPoint, ...])
 TMultiPolygon = NewType('TMultiPolygon', Tuple[TPolygon, ...])
 TSegment = NewType('TSegment', Tuple[TPoint, TPoint])
+TBBox = NewType('TBBox', Tuple[float, float, float, float])
 TAngles = NewType('TAngles', Tuple[float, ...])
 TPath = NewType('TPath', List[TPoint])
 
@@ -0,0 +1,107 @@
+from math import floor
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from offroad_routing.geometry.geom_types import TBBox
+from offroad_routing.geometry.geom_types import TPoint
+
+
+class GridIndex:
+    """
+    Uniform grid over bounding boxes of objects for fast point and window queries.
+    Each object is registered in every cell its bounding box overlaps, cells are stored sparsely.
+    """
+
+    __slots__ = ("__bboxes", "__cells", "__cell_size", "__min_x", "__min_y")
+
+    eps = 1e-8
+
+    def __init__(self, bboxes: Sequence[TBBox], cell_size: Optional[float] = None):
+        """
+        :param bboxes: bounding box of each object in format (min_x, min_y, max_x, max_y)
+        :param cell_size: side of a grid cell, computed from average bounding box size if None
+        """
+
+        self.__bboxes = tuple(bboxes)
+        self.__cells = dict()
+        if cell_size is None:
+            cell_size = GridIndex.__default_cell_size(self.__bboxes)
+        assert cell_size > 0
+        self.__cell_size = cell_size
+        self.__min_x = min((bbox[0] for bbox in self.__bboxes), default=0)
+        self.__min_y = min((bbox[1] for bbox in self.__bboxes), default=0)
+
+        for i, bbox in enumerate(self.__bboxes):
+            for cell in self.__cells_of(bbox):
+                self.__cells.setdefault(cell, list()).append(i)
+
+    @staticmethod
+    def __default_cell_size(bboxes: Sequence[TBBox]) -> float:
+        if len(bboxes) == 0:
+            return 1
+        size = sum(max(bbox[2] - bbox[0], bbox[3] - bbox[1]) for bbox in bboxes) / len(bboxes)
+        if size > 0:
+            return size
+        extent = max(max(bbox[2] for bbox in bboxes) - min(bbox[0] for bbox in bboxes),
+                     max(bbox[3] for bbox in bboxes) - min(bbox[1] for bbox in bboxes))
+        return extent / len(bboxes) ** 0.5 if extent > 0 else 1
+
+    def __cell(self, x: float, y: float) -> Tuple[int, int]:
+        return floor((x - self.__min_x) / self.__cell_size), floor((y - self.__min_y) / self.__cell_size)
+
+    def __cells_of(self, bbox: TBBox) -> Iterator[Tuple[int, int]]:
+        low_x, low_y = self.__cell(bbox[0] - GridIndex.eps, bbox[1] - GridIndex.eps)
+        high_x, high_y = self.__cell(bbox[2] + GridIndex.eps, bbox[3] + GridIndex.eps)
+        for cx in range(low_x, high_x + 1):
+            for cy in range(low_y, high_y + 1):
+                yield cx, cy
+
+    def __len__(self) -> int:
+        return len(self.__bboxes)
+
+    def bbox(self, i: int) -> TBBox:
+        return self.__bboxes[i]
+
+    def query_point(self, point: TPoint) -> List[int]:
+        """
+        Find objects which bounding boxes contain point (boundary included).
+
+        :param point: query point (x, y)
+        :return: sorted list of object numbers
+        """
+
+        x, y = point
+        eps = GridIndex.eps
+        result = list()
+        for i in self.__cells.get(self.__cell(x, y), ()):
+            min_x, min_y, max_x, max_y = self.__bboxes[i]
+            if min_x - eps <= x <= max_x + eps and min_y - eps <= y <= max_y + eps:
+                result.append(i)
+        return result
+
+    def query_bbox(self, bbox: TBBox) -> List[int]:
+        """
+        Find objects which bounding boxes intersect given bounding box (boundary included).
+
+        :param bbox: query window in format (min_x, min_y, max_x, max_y)
+        :return: sorted list of object numbers
+        """
+
+        low_x, low_y = self.__cell(bbox[0] - GridIndex.eps, bbox[1] - GridIndex.eps)
+        high_x, high_y = self.__cell(bbox[2] + GridIndex.eps, bbox[3] + GridIndex.eps)
+
+        # window covers more cells than stored, scan stored cells instead
+        if (high_x - low_x + 1) * (high_y - low_y + 1) > len(self.__cells):
+            candidates = {i for (cx, cy), objects in self.__cells.items()
+                          if low_x <= cx <= high_x and low_y <= cy <= high_y for i in objects}
+        else:
+            candidates = {i for cx in range(low_x, high_x + 1) for cy in range(low_y, high_y + 1)
+                          for i in self.__cells.get((cx, cy), ())}
+
+        eps = GridIndex.eps
+        return sorted(i for i in candidates
+                      if self.__bboxes[i][0] - eps <= bbox[2] and bbox[0] <= self.__bboxes[i][2] + eps and
+                      self.__bboxes[i][1] - eps <= bbox[3] and bbox[1] <= self.__bboxes[i][3] + eps)
@@ -0,0 +1,187 @@
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from offroad_routing.geometry.geom_types import TAngles
+from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.geometry.geom_types import TPolygonData
+from offroad_routing.geometry.geom_types import TPolygonRec
+
+
+class PolygonArrays:
+    """
+    Polygon records stored as contiguous arrays.
+    Rings of all polygons (outer first, then inner, each closed) share one coordinate buffer,
+    ring_offsets[k]:ring_offsets[k + 1] are points of ring k, polygon_offsets[i]:polygon_offsets[i + 1] are rings
+    of polygon i. Convex hull point numbers, polar angles and tags are concatenated with their own offsets,
+    angles of polygon i are empty if its record has None.
+
+    Behaves as a read-only sequence of polygon records, each record is built on every access and is not kept.
+    Visibility queries read convex hulls of nearby polygons with hulls instead, which gathers them at once.
+    """
+
+    __slots__ = ("coordinates", "ring_offsets", "polygon_offsets", "hull_points", "hull_offsets", "angles",
+                 "angle_offsets", "tags", "tag_offsets", "__closed_hulls", "__closed_hull_offsets")
+
+    array_names = ("coordinates", "ring_offsets", "polygon_offsets", "hull_points", "hull_offsets", "angles",
+                   "angle_offsets", "tags", "tag_offsets")
+
+    def __init__(self, coordinates, ring_offsets, polygon_offsets, hull_points, hull_offsets, angles, angle_offsets,
+                 tags, tag_offsets):
+        """
+        :param np.ndarray coordinates: points of all rings, shape (n, 2)
+        :param np.ndarray ring_offsets: start of each ring in coordinates, size is number of rings + 1
+        :param np.ndarray polygon_offsets: first ring of each polygon, size is number of polygons + 1
+        :param np.ndarray hull_points: numbers of convex hull vertices in outer ring
+        :param np.ndarray hull_offsets: start of hull of each polygon in hull_points
+        :param np.ndarray angles: polar angles from the first convex hull point to others
+        :param np.ndarray angle_offsets: start of angles of each polygon
+        :param np.ndarray tags: surface weights, nan for None
+        :param np.ndarray tag_offsets: start of tags of each polygon
+        """
+        if not len(polygon_offsets) == len(hull_offsets) == len(angle_offsets) == len(tag_offsets):
+            raise ValueError("Offset sizes do not match")
+        self.coordinates = coordinates
+        self.ring_offsets = ring_offsets
+        self.polygon_offsets = polygon_offsets
+        self.hull_points = hull_points
+        self.hull_offsets = hull_offsets
+        self.angles = angles
+        self.angle_offsets = angle_offsets
+        self.tags = tags
+        self.tag_offsets = tag_offsets
+        # closed convex hull points of all polygons, derived from the arrays above and not pickled
+        sizes = np.diff(hull_offsets)
+        closed_sizes = sizes + (sizes > 0)
+        closed_offsets = np.concatenate(([0], np.cumsum(closed_sizes))).astype(np.int64)
+        closed_starts = np.repeat(closed_offsets[:-1], closed_sizes)
+        hull_positions = np.repeat(hull_offsets[:-1], closed_sizes) + \
+            (np.arange(len(closed_starts)) - closed_starts) % np.repeat(np.maximum(sizes, 1), closed_sizes)
+        ring_starts = np.repeat(ring_offsets[polygon_offsets[:-1]], closed_sizes)
+        self.__closed_hulls = coordinates[hull_points[hull_positions] + ring_starts]
+        self.__closed_hull_offsets = closed_offsets
+
+    @classmethod
+    def from_records(cls, polygons: TPolygonData) -> "PolygonArrays":
+        """
+        :param polygons: polygon records
+        """
+        rings = [ring for polygon in polygons for ring in polygon["geometry"]]
+        hulls = [polygon["convex_hull_points"] for polygon in polygons]
+        angles = [polygon["angles"] or () for polygon in polygons]
+        tags = [polygon["tag"] for polygon in polygons]
+
+        def offsets(sizes):
+            return np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))).astype(np.int64)
+
+        return cls(np.array([point for ring in rings for point in ring], dtype=np.float64).reshape(-1, 2),
+                   offsets([len(ring) for ring in rings]),
+                   offsets([len(polygon["geometry"]) for polygon in polygons]),
+                   np.array([k for hull in hulls for k in hull], dtype=np.int32), offsets([len(h) for h in hulls]),
+                   np.array([a for angle in angles for a in angle], dtype=np.float64),
+                   offsets([len(a) for a in angles]),
+                   np.array([np.nan if t is None else t for tag in tags for t in tag], dtype=np.float64),
+                   offsets([len(tag) for tag in tags]))
+
+    def to_records(self) -> TPolygonData:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.polygon_offsets) - 1
+
+    def __getitem__(self, polygon_number: int) -> TPolygonRec:
+        return self.__build_record(polygon_number)
+
+    def __iter__(self) -> Iterator[TPolygonRec]:
+        return (self[i] for i in range(len(self)))
+
+    def arrays(self) -> Tuple[np.ndarray, ...]:
+        """
+        :return: all arrays in constructor order, their names are array_names
+        """
+        return (self.coordinates, self.ring_offsets, self.polygon_offsets, self.hull_points, self.hull_offsets,
+                self.angles, self.angle_offsets, self.tags, self.tag_offsets)
+
+    def __getstate__(self):
+        return self.arrays()
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __build_record(self, polygon_number: int) -> TPolygonRec:
+        i = polygon_number
+        rings = self.ring_offsets[self.polygon_offsets[i]:self.polygon_offsets[i + 1] + 1].tolist()
+        geometry = tuple(tuple(map(tuple, self.coordinates[start:end].tolist()))
+                         for start, end in zip(rings, rings[1:]))
+        hull_points = tuple(self.hull_points[self.hull_offsets[i]:self.hull_offsets[i + 1]].tolist())
+        angles = tuple(self.angles[self.angle_offsets[i]:self.angle_offsets[i + 1]].tolist())
+        tag = [None if t != t else t for t in self.tags[self.tag_offsets[i]:self.tag_offsets[i + 1]].tolist()]
+        return {
+            "tag": tag,
+            "geometry": geometry,
+            "convex_hull": tuple(geometry[0][k] for k in hull_points + hull_points[:1]),
+            "convex_hull_points": hull_points,
+            "angles": angles or None,
+        }
+
+    def hulls(self, polygon_numbers: Sequence[int]) -> List[Tuple[List[TPoint], Optional[TAngles], List[int]]]:
+        """
+        Read convex hulls of several polygons at once without building their records.
+
+        :param polygon_numbers: numbers of polygons
+        :return: closed convex hull (points are lists [x, y]), angles and convex hull points as in polygon records
+        """
+        numbers = np.asarray(polygon_numbers, dtype=np.int64)
+        parts = list()
+        for array, offsets in ((self.__closed_hulls, self.__closed_hull_offsets), (self.angles, self.angle_offsets),
+                               (self.hull_points, self.hull_offsets)):
+            sizes = np.diff(offsets)[numbers]
+            values = array[_ranges(offsets, numbers)].tolist()
+            parts.append([values[end - size:end] for end, size in zip(np.cumsum(sizes).tolist(), sizes.tolist())])
+        hulls, angles, hull_points = parts
+        return [(hull, angle or None, points) for hull, angle, points in zip(hulls, angles, hull_points)]
+
+    def outer_size(self, polygon_number: int) -> int:
+        """
+        :return: number of outer ring vertices without closing point
+        """
+        ring = self.polygon_offsets[polygon_number]
+        return int(self.ring_offsets[ring + 1] - self.ring_offsets[ring]) - 1
+
+    def outer_vertices(self) -> np.ndarray:
+        """
+        :return: outer ring vertices of all polygons without closing points, shape (n, 2)
+        """
+        if len(self) == 0:
+            return np.empty((0, 2))
+        starts = self.ring_offsets[self.polygon_offsets[:-1]].tolist()
+        ends = (self.ring_offsets[self.polygon_offsets[:-1] + 1] - 1).tolist()
+        return np.concatenate([self.coordinates[start:end] for start, end in zip(starts, ends)])
+
+    def hull_bboxes(self) -> np.ndarray:
+        """
+        :return: bounding boxes of convex hulls in format (min_x, min_y, max_x, max_y), shape (n, 4)
+        """
+        if len(self) == 0:
+            return np.empty((0, 4))
+        starts = self.ring_offsets[self.polygon_offsets[:-1]]
+        points = self.coordinates[self.hull_points + np.repeat(starts, np.diff(self.hull_offsets))]
+        return np.hstack((np.minimum.reduceat(points, self.hull_offsets[:-1]),
+                          np.maximum.reduceat(points, self.hull_offsets[:-1])))
+
+    def nbytes(self) -> int:
+        """
+        :return: memory used by arrays in bytes
+        """
+        return sum(array.nbytes for array in self.arrays())
+
+
+def _ranges(offsets: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+    """
+    :return: positions offsets[i]:offsets[i + 1] for all i in numbers, concatenated
+    """
+    starts, sizes = offsets[numbers], offsets[numbers + 1] - offsets[numbers]
+    return np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
@@ -11,6 +11,7 @@ from geopandas import clip
 from geopandas import read_file
 from geopandas import sjoin
 from offroad_routing.geometry.algorithms import compare_points
+from offroad_routing.geometry.polygon_arrays import PolygonArrays
 from offroad_routing.osm_data.convex_hull import build_convex_hull
 from offroad_routing.osm_data.osm_parser import parse_pbf
 from offroad_routing.osm_data.osm_parser import parse_xml
@@ -346,13 +347,15 @@ class Geometry:
                     else max(diff.geoms, key=lambda x: x.area)
         polygons.drop(polygons[polygons.is_empty].index, inplace=True)
 
-    def export(self, *, remove_inner=False):
+    def export(self, *, remove_inner=False, arrays=False):
         """
         Export geometry data to polygon and linestring records. Duplicate polygons removed.
 
         :param bool remove_inner: remove polygons which are inner for other polygons
-        :return: polygon and linestring records
-        :rtype: Tuple[TPolygonData, TSegmentData]
+        :param bool arrays: export polygons as contiguous arrays instead of records, which take less memory
+            and are faster to pickle (see offroad_routing.geometry.polygon_arrays.PolygonArrays)
+        :return: polygon records (or arrays) and linestring records
+        :rtype: Tuple[Union[TPolygonData, PolygonArrays], TSegmentData]
         """
 
         polygons = deepcopy(self.polygons[["tag", "geometry"]])
@@ -375,4 +378,7 @@ class Geometry:
         self.tag_value.eval_lines(linestrings, "tag")
         linestrings['geometry'] = self.edges.apply(
             lambda x: (self.nodes[x.u], self.nodes[x.v]), axis=1) if self.edges.shape[0] > 0 else None
-        return polygons.to_dict('records'), linestrings.to_dict('records')
+        polygons = polygons.to_dict('records')
+        if arrays:
+            polygons = PolygonArrays.from_records(polygons)
+        return polygons, linestrings.to_dict('records')
@@ -1,11 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import cpu_count
+
+import numpy as np
 from networkx import astar_path
+from networkx import NetworkXNoPath
+from networkx import path_weight
 from offroad_routing.geometry.algorithms import compare_points
 from offroad_routing.geometry.algorithms import point_distance
-from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.geometry.algorithms import point_distances
+from offroad_routing.pathfinding.bidirectional import bidirectional_astar
+from offroad_routing.pathfinding.csr_search import csr_astar
+from offroad_routing.pathfinding.csr_search import csr_bidirectional_astar
+from offroad_routing.pathfinding.graph_overlay import GraphOverlay
 from offroad_routing.pathfinding.path import Path
 from offroad_routing.pathfinding.priority_queue import PriorityQueue
+from offroad_routing.pathfinding.search import anytime_astar
+from offroad_routing.pathfinding.search import astar
+from offroad_routing.visibility.corridor import Corridor
 from offroad_routing.visibility.visibility_graph import VisibilityGraph
-from osmnx import get_nearest_node
+
+# error policies of AStar.find_many
+_errors = ("raise", "none", "return")
+
+# pathfinder of a worker process, set once per process to avoid sending graph with every task
+_worker_pathfinder = None
+
+
+def _init_worker(pathfinder, vgraph) -> None:
+    global _worker_pathfinder
+    _worker_pathfinder = pathfinder
+    vgraph.reconnect()
+
+
+def _find_item(pathfinder, pair, costs, kwargs):
+    # errors are returned to apply error policy of the batch
+    try:
+        path = pathfinder.find(*pair, **kwargs)
+    except Exception as error:
+        return error
+    return path.cost if costs else path
+
+
+def _find_chunk(pairs, costs, kwargs):
+    return [_find_item(_worker_pathfinder, pair, costs, kwargs) for pair in pairs]
 
 
 class AStar:
@@ -13,86 +51,419 @@ class AStar:
     Find off-road routes using A* algorithm and visibility graph.
     """
 
-    __slots__ = ("__vgraph",)
+    __slots__ = ("__vgraph", "__stats", "__landmarks")
 
-    def __init__(self, vgraph):
+    def __init__(self, vgraph, landmarks=None):
         """
         :param VisibilityGraph vgraph: visibility graph with computed geometry
+        :param Optional[Landmarks] landmarks: landmarks of graph built for the same geometry
+            (see VisibilityGraph.compute_landmarks), used as lower bounds of route cost
+            with or without prebuilt graph if the graph was built with inside_percent=1
+            without max_distance and max_neighbours (see Landmarks.complete), otherwise only with the graph itself;
+            landmarks of vgraph are used if None
         """
         self.__vgraph = vgraph
+        self.__stats = None
+        self.__landmarks = landmarks
 
-    @staticmethod
-    def __heuristic(node: TPoint, goal: TPoint, heuristic_multiplier: int) -> float:
-        return point_distance(node, goal) * heuristic_multiplier
+    @property
+    def stats(self):
+        """
+        Search statistics of the last route found without prebuilt graph, with bidirectional search,
+        with snap=False or with contraction hierarchy, None if there was no such search:
+        number of expanded vertices, queue insertions and outdated queue entries skipped
+        (and number of searches with different heuristic weights if search budget is given).
+
+        :rtype: Optional[Dict[str, int]]
+        """
+        return self.__stats
+
+    def __landmark_bounds(self, node_ids, targets, ends=0, objects=None, built=True):
+        # landmark lower bounds of cost to target for graph nodes (vertex table ids), None without landmarks;
+        # targets are nodes connected to target and costs of edges to it, ends are zeros added for start and goal;
+        # search restricted to objects may find edges crossing other obstacles, landmarks do not bound its costs;
+        # landmarks of a graph built with fewer edges (see Landmarks.complete) may overestimate costs
+        # of on the fly search and other graphs, they bound only the built graph they were computed for
+        landmarks = self.__landmarks if self.__landmarks is not None else self.__vgraph.landmarks
+        if landmarks is None or objects is not None:
+            return None
+        if not landmarks.complete and not (built and (landmarks is self.__vgraph.landmarks or
+                                                      landmarks.graph is self.__vgraph.csr_graph)):
+            return None
+        graph = landmarks.graph
+        vertices = dict()
+        for vertex, cost in zip(graph.vertices(list(targets.keys())).tolist(), targets.values()):
+            if vertex >= 0 and cost < vertices.get(vertex, np.inf):
+                vertices[vertex] = cost
+        if not vertices:
+            return None
+        bounds, positions = landmarks.lower_bounds(vertices), graph.vertices(node_ids)
+        return np.concatenate((np.where(positions >= 0, bounds[positions], 0), np.zeros(ends)))
+
+    def __find_notbuilt(self, start, goal, heuristic_multiplier, objects=None):
+        # start and goal are not object vertices, they are numbered after all vertices of the table
+        if compare_points(start, goal):
+            self.__stats = {'expanded': 0, 'pushed': 0, 'skipped': 0}
+            return Path([start], start, goal, 0)
+        table = self.__vgraph.vertex_table
+        start_id, goal_id = len(table), len(table) + 1
 
-    def __find_notbuilt(self, start, goal, heuristic_multiplier):
         # PointData format
         start_data = (start, None, None, None, None)
         goal_data = (goal, None, None, None, None)
 
         # vgraph nodes incident to goal point (defined by object and position in the object)
-        goal_neighbours = self.__vgraph.incident_vertices(goal_data)
+        goal_neighbours = self.__vgraph.incident_vertices(goal_data, objects=objects)
         if len(goal_neighbours) == 0:
             raise RuntimeError("Goal point has no neighbours on the graph")
-        goal_data = (goal, None, None, None, goal_neighbours[0][4])
-        goal_neighbours = [(i[1], i[2], i[3]) for i in goal_neighbours]
+        # edge weight to goal is the weight of the same edge from goal
+        goal_neighbours = {table.index(i[1], i[2], i[3]): i[4] for i in goal_neighbours}
+        goal_distances = point_distances(goal, [table.point(vertex) for vertex in goal_neighbours]).tolist()
+        goal_costs = {vertex: weight * distance for (vertex, weight), distance
+                      in zip(goal_neighbours.items(), goal_distances)}
+        bounds = self.__landmark_bounds(np.arange(len(table)), goal_costs, 2, objects, built=False)
 
         frontier = PriorityQueue()
-        frontier.put(start_data, 0)
+        frontier.put((start_id, start_data), 0)
         came_from = dict()
-        came_from[start_data[0]] = None
+        came_from[start_id] = None
         cost_so_far = dict()
-        cost_so_far[start_data[0]] = 0
+        cost_so_far[start_id] = 0
+        # expanded vertices, queue may hold outdated entries of them which are skipped
+        closed = set()
+        self.__stats = stats = {'expanded': 0, 'pushed': 1, 'skipped': 0}
 
         while not frontier.empty():
-            current = frontier.get()
+            current_id, current = frontier.get()
             current_point = current[0]
 
-            if compare_points(current_point, goal):
+            if current_id == goal_id:
                 break
+            if current_id in closed:
+                stats['skipped'] += 1
+                continue
+            closed.add(current_id)
+            stats['expanded'] += 1
 
-            neighbours = self.__vgraph.incident_vertices(current)
+            neighbours = self.__vgraph.cached_incident_vertices(current, objects)
+            neighbours = [(table.index(i[1], i[2], i[3]), i) for i in neighbours]
 
             # if current is goal neighbour add it to neighbour list
-            goal_neighbour = (current[1], current[2], current[3]) in goal_neighbours
-            if goal_neighbour:
-                neighbours.insert(0, goal_data)
+            if current_id in goal_neighbours:
+                neighbours.insert(0, (goal_id, (goal, None, None, None, goal_neighbours[current_id])))
 
-            for neighbour in neighbours:
-                neighbour_point, neighbour_weight = neighbour[0], neighbour[4]
-                new_cost = cost_so_far[current_point] + point_distance(current_point,
-                                                                       neighbour_point) * neighbour_weight
+            neighbour_points = [neighbour[0] for _, neighbour in neighbours]
+            distances = point_distances(current_point, neighbour_points).tolist()
+            heuristics = point_distances(goal, neighbour_points)
+            if bounds is not None:
+                heuristics = np.maximum(heuristics, bounds[[neighbour_id for neighbour_id, _ in neighbours]])
+            heuristics = heuristics.tolist()
+            for (neighbour_id, neighbour), distance, heuristic in zip(neighbours, distances, heuristics):
+                if neighbour_id in closed:
+                    continue
+                new_cost = cost_so_far[current_id] + distance * neighbour[4]
 
                 # neighbour not visited or shorter path found
-                if neighbour_point not in cost_so_far or new_cost < cost_so_far[neighbour_point]:
-                    cost_so_far[neighbour_point] = new_cost
-                    priority = new_cost + AStar.__heuristic(goal, neighbour_point, heuristic_multiplier)
-                    frontier.put(neighbour, priority)
-                    came_from[neighbour_point] = current_point
+                if neighbour_id not in cost_so_far or new_cost < cost_so_far[neighbour_id]:
+                    cost_so_far[neighbour_id] = new_cost
+                    priority = new_cost + heuristic * heuristic_multiplier
+                    frontier.put((neighbour_id, neighbour), priority)
+                    stats['pushed'] += 1
+                    came_from[neighbour_id] = current_id
+
+        if goal_id not in came_from:
+            raise RuntimeError("Goal point is not reachable from start point")
+        path, current_id = [goal], came_from[goal_id]
+        while current_id != start_id:
+            path.append(table.point(current_id))
+            current_id = came_from[current_id]
+        path.append(start)
+        path.reverse()
+        return Path(path, start, goal, cost_so_far[goal_id])
+
+    def __find_notbuilt_anytime(self, start, goal, heuristic_multiplier, time_limit, max_expanded,
+                                objects=None):
+        if compare_points(start, goal):
+            self.__stats = {'expanded': 0, 'pushed': 0, 'skipped': 0, 'searches': 0}
+            return Path([start], start, goal, 0, 1)
+        table = self.__vgraph.vertex_table
+        start_id, goal_id = len(table), len(table) + 1
+        goal_neighbours = self.__vgraph.incident_vertices((goal, None, None, None, None), objects=objects)
+        if len(goal_neighbours) == 0:
+            raise RuntimeError("Goal point has no neighbours on the graph")
+        goal_edges = {table.index(*vertex[1:4]): vertex[4] for vertex in goal_neighbours}
+        goal_distances = point_distances(goal, [table.point(vertex) for vertex in goal_edges]).tolist()
+        goal_costs = {vertex: weight * distance for (vertex, weight), distance
+                      in zip(goal_edges.items(), goal_distances)}
+        bounds = self.__landmark_bounds(np.arange(len(table)), goal_costs, 2, objects, built=False)
+
+        def point(vertex):
+            return start if vertex == start_id else goal if vertex == goal_id else table.point(vertex)
+
+        # vertices are expanded again by searches with lower heuristic weight, their edges are kept
+        edges_of = dict()
+
+        def neighbours(vertex):
+            if vertex in edges_of:
+                return edges_of[vertex]
+            if vertex == start_id:
+                vertices = self.__vgraph.incident_vertices((start, None, None, None, None), objects=objects)
+            else:
+                point_data = (point(vertex),) + table.key(vertex) + (None,)
+                vertices = self.__vgraph.cached_incident_vertices(point_data, objects)
+            edges = [(table.index(*neighbour[1:4]), neighbour[0], neighbour[4]) for neighbour in vertices]
+            if vertex in goal_edges:
+                edges.append((goal_id, goal, goal_edges[vertex]))
+            distances = point_distances(point(vertex), [edge[1] for edge in edges]).tolist()
+            edges_of[vertex] = [(edge[0], distance * edge[2]) for edge, distance in zip(edges, distances)]
+            return edges_of[vertex]
 
-        return Path.retrace(came_from, start, goal)
+        def heuristic(vertex):
+            distance = point_distance(point(vertex), goal)
+            if bounds is not None:
+                distance = max(distance, bounds[vertex])
+            return distance
+
+        self.__stats = dict()
+        try:
+            path, cost, bound = anytime_astar(start_id, goal_id, neighbours, heuristic, max(heuristic_multiplier, 1),
+                                              time_limit, max_expanded, self.__stats)
+        except TimeoutError:
+            raise TimeoutError("Goal point is not reached within search budget") from None
+        except RuntimeError:
+            raise RuntimeError("Goal point is not reachable from start point") from None
+        return Path([point(vertex) for vertex in path], start, goal, cost, bound)
+
+    def __find_notbuilt_any(self, start, goal, heuristic_multiplier, time_limit, max_expanded, objects=None):
+        if time_limit is not None or max_expanded is not None:
+            return self.__find_notbuilt_anytime(start, goal, heuristic_multiplier, time_limit, max_expanded, objects)
+        return self.__find_notbuilt(start, goal, heuristic_multiplier, objects)
+
+    def __find_corridor(self, start, goal, corridor, heuristic_multiplier, *args):
+        # corridor widens until route inside it is found or it contains all obstacles
+        width = corridor
+        while True:
+            area = Corridor(start, goal, width)
+            objects = area.objects(self.__vgraph)
+            if objects is None:
+                return self.__find_notbuilt_any(start, goal, heuristic_multiplier, *args)
+            try:
+                path = self.__find_notbuilt_any(start, goal, heuristic_multiplier, *args, objects)
+            except RuntimeError:
+                path = None
+            # route leaving corridor may cross obstacles outside of it
+            if path is not None and all(area.contains(point) for point in path.path):
+                break
+            width *= 2
+
+        # the lowest cost route either stays inside corridor or leaves it and is not shorter than outside_distance
+        bound = path.bound if path.bound is not None else 1 if heuristic_multiplier <= 1 else None
+        if bound is not None:
+            bound = max(bound, path.cost / area.outside_distance())
+        return Path(path.path, start, goal, path.cost, bound)
 
     def __node_coordinates(self, node):
         coords = self.__vgraph.graph.nodes[node]
         return coords['x'], coords['y']
 
-    def __find_prebuilt(self, start, goal):
-        source_node = get_nearest_node(self.__vgraph.graph, (start[1], start[0]))
-        target_node = get_nearest_node(self.__vgraph.graph, (goal[1], goal[0]))
-        path = astar_path(self.__vgraph.graph, source_node, target_node, weight='weight')
-        return Path([self.__node_coordinates(node) for node in path], start, goal)
+    def __find_compact(self, start, goal, bidirectional):
+        graph = self.__vgraph.csr_graph
+        _, positions = self.__vgraph.snapper.nearest_many((start, goal))
+        source, target = positions[:, 0].tolist()
+        ids = graph.ids
+        bounds = (self.__landmark_bounds(ids, {int(ids[target]): 0}),
+                  self.__landmark_bounds(ids, {int(ids[source]): 0}))
+        try:
+            if bidirectional:
+                self.__stats = dict()
+                path = csr_bidirectional_astar(graph, source, target, stats=self.__stats,
+                                               bounds=None if bounds[0] is None else bounds)
+            else:
+                path = csr_astar(graph, source, target, bounds=bounds[0])
+        except RuntimeError:
+            raise RuntimeError("Goal point is not reachable from start point") from None
+        return Path([graph.coordinates(vertex) for vertex in path], start, goal, graph.path_weight(path))
+
+    def __find_hierarchy(self, start, goal, snap):
+        hierarchy = self.__vgraph.hierarchy
+        graph = hierarchy.graph
+        self.__stats = dict()
+        if snap:
+            _, nodes = self.__vgraph.nearest_vertices((start, goal))
+            source, target = graph.vertices(nodes[:, 0]).tolist()
+            try:
+                path, cost = hierarchy.find(source, target, self.__stats)
+            except RuntimeError:
+                raise RuntimeError("Goal point is not reachable from start point") from None
+            return Path([graph.coordinates(vertex) for vertex in path], start, goal, cost)
+
+        if compare_points(start, goal):
+            self.__stats = {'expanded': 0, 'pushed': 0, 'skipped': 0}
+            return Path([start], start, goal, 0)
+        overlay = GraphOverlay(self.__vgraph, start, goal, graph)
+        try:
+            path, cost = hierarchy.find_between(dict(overlay.neighbours(overlay.source)),
+                                                dict(overlay.neighbours(overlay.target)), self.__stats)
+        except RuntimeError:
+            raise RuntimeError("Goal point is not reachable from start point") from None
+        return Path([start] + [graph.coordinates(vertex) for vertex in path] + [goal], start, goal, cost)
+
+    def __find_prebuilt(self, start, goal, bidirectional):
+        if self.__vgraph.csr_graph is not None:
+            return self.__find_compact(start, goal, bidirectional)
+        graph = self.__vgraph.graph
+        _, nodes = self.__vgraph.nearest_vertices((start, goal))
+        source_node, target_node = nodes[:, 0].tolist()
+        ids = np.arange(len(self.__vgraph.vertex_table))
+        bounds = (self.__landmark_bounds(ids, {target_node: 0}), self.__landmark_bounds(ids, {source_node: 0}))
+        ends = (self.__node_coordinates(target_node), self.__node_coordinates(source_node))
+
+        def heuristic(node, side):
+            distance = point_distance(self.__node_coordinates(node), ends[side])
+            return distance if bounds[side] is None else max(distance, bounds[side][node])
+
+        if not bidirectional:
+            # without landmarks the search is Dijkstra algorithm as before
+            try:
+                path = astar_path(graph, source_node, target_node, weight='weight',
+                                  heuristic=None if bounds[0] is None else lambda node, _: heuristic(node, 0))
+            except NetworkXNoPath:
+                raise RuntimeError("Goal point is not reachable from start point") from None
+            return Path([self.__node_coordinates(node) for node in path], start, goal,
+                        path_weight(graph, path, 'weight'))
+
+        def neighbours(node, side):
+            return ((neighbour, min(edge['weight'] for edge in edges.values()))
+                    for neighbour, edges in graph.adj[node].items())
+
+        self.__stats = dict()
+        try:
+            path, cost = bidirectional_astar(source_node, target_node, neighbours, heuristic, self.__stats)
+        except RuntimeError:
+            raise RuntimeError("Goal point is not reachable from start point") from None
+        return Path([self.__node_coordinates(node) for node in path], start, goal, cost)
+
+    def __find_overlay(self, start, goal, bidirectional):
+        if compare_points(start, goal):
+            self.__stats = {'expanded': 0, 'pushed': 0, 'skipped': 0}
+            return Path([start], start, goal, 0)
+        overlay = GraphOverlay(self.__vgraph, start, goal)
+        ends = (goal, start)
+        graph = self.__vgraph.csr_graph
+        # overlay vertices are vertex numbers of compact graph or node ids of networkx graph
+        ids = graph.ids if graph is not None else np.arange(len(self.__vgraph.vertex_table))
+        bounds = tuple(self.__landmark_bounds(ids, {int(ids[vertex]): cost for vertex, cost in overlay.neighbours(end)},
+                                              2) for end in (overlay.target, overlay.source))
+
+        def heuristic(vertex, side=0):
+            distance = point_distance(overlay.coordinates(vertex), ends[side])
+            return distance if bounds[side] is None else max(distance, bounds[side][vertex])
+
+        self.__stats = dict()
+        try:
+            if bidirectional:
+                path, cost = bidirectional_astar(overlay.source, overlay.target, overlay.neighbours, heuristic,
+                                                 self.__stats)
+            else:
+                path, cost = astar(overlay.source, overlay.target, overlay.neighbours, heuristic, self.__stats)
+        except RuntimeError:
+            raise RuntimeError("Goal point is not reachable from start point") from None
+        return Path([overlay.coordinates(vertex) for vertex in path], start, goal, cost)
+
+    def find_many(self, pairs, workers=None, costs=False, errors="raise", chunksize=None, **kwargs):
+        """
+        Find routes between many pairs of points in worker processes.
+        Workers get this pathfinder once at start: forked processes share its graph copy-on-write,
+        memory-mapped graph (see VisibilityGraph.load) is shared by processes anyway.
+        Each worker opens disk cache file of the graph again (see VisibilityGraph.reconnect).
+        Search statistics of workers are not collected (see stats).
+
+        :param Iterable[Tuple[TPoint, TPoint]] pairs: start and goal points
+        :param Optional[int] workers: number of worker processes, number of processors if None,
+            routes are found in this process if 1
+        :param bool costs: return route costs (see Path.cost) instead of paths
+        :param str errors: result for a pair if route is not found: "raise" raises the first error in input order,
+            "none" returns None, "return" returns the exception
+        :param Optional[int] chunksize: number of pairs sent to a worker at once
+        :param kwargs: parameters of find()
+        :return: path, cost, None or exception for each pair in input order
+        :rtype: list
+        """
+        if errors not in _errors:
+            raise ValueError("Unknown error policy")
+        if workers is not None and workers < 1:
+            raise ValueError("workers should be positive")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize should be positive")
+        pairs = list(pairs)
+        workers = workers or cpu_count() or 1
+
+        if workers == 1:
+            results = (_find_item(self, pair, costs, kwargs) for pair in pairs)
+            return [self.__apply_policy(result, errors) for result in results]
+        if chunksize is None:
+            chunksize = max(1, len(pairs) // (workers * 4))
+        chunks = [pairs[i:i + chunksize] for i in range(0, len(pairs), chunksize)]
+        output = list()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(self, self.__vgraph)) as executor:
+            for results in executor.map(partial(_find_chunk, costs=costs, kwargs=kwargs), chunks):
+                output.extend(self.__apply_policy(result, errors) for result in results)
+        return output
+
+    @staticmethod
+    def __apply_policy(result, errors):
+        if not isinstance(result, Exception) or errors == "return":
+            return result
+        if errors == "raise":
+            raise result
+        return None
 
-    def find(self, start, goal, heuristic_multiplier=10):
+    def find(self, start, goal, heuristic_multiplier=10, bidirectional=False, snap=True, time_limit=None,
+             max_expanded=None, corridor=None):
         """
         Find route from point start to point goal.
 
         :param TPoint start: start point
         :param TPoint goal: goal point
         :param int heuristic_multiplier: multiplier to weight heuristic \
-        (http://theory.stanford.edu/~amitp/GameProgramming/Heuristics.html#scale)
+        (http://theory.stanford.edu/~amitp/GameProgramming/Heuristics.html#scale), \
+        not used with prebuilt graph
+        :param bool bidirectional: search prebuilt graph from both start and goal until the searches meet, \
+        usually expands fewer vertices (see offroad_routing.pathfinding.bidirectional), \
+        not used if contraction hierarchy of prebuilt graph is computed (see VisibilityGraph.contract). \
+        Not supported without prebuilt graph: visibility computed on the fly is not symmetric (roads are not \
+        obstacles for road vertices, only supporting vertices of polygons are visible), vertices which see a given \
+        vertex are not known until visibility of all of them is computed, so search from goal cannot follow route edges
+        :param bool snap: start route from the graph vertex nearest to start and end it at the vertex nearest to goal, \
+        otherwise start and goal are connected to vertices visible from them without changing the graph \
+        (see offroad_routing.pathfinding.graph_overlay), used with prebuilt graph only
+        :param Optional[float] time_limit: wall clock budget of search in seconds, \
+        if time_limit or max_expanded is given, search without prebuilt graph starts with heuristic_multiplier \
+        and decreases it while budget remains (see offroad_routing.pathfinding.search.anytime_astar), \
+        the best route found is returned with its bound (see Path.bound)
+        :param Optional[int] max_expanded: budget of vertices expanded by search without prebuilt graph
+        :param Optional[float] corridor: width in km of corridor around the straight line from start to goal \
+        (see offroad_routing.visibility.corridor), search without prebuilt graph uses only obstacles intersecting it; \
+        corridor is doubled until a route inside it is found, budget is applied to each search, \
+        landmarks are not used. \
+        The route is the lowest cost one inside the corridor, it is not optimal if a cheaper route goes around it: \
+        its proven bound (see Path.bound) is set if heuristic_multiplier is not above 1 or budget is given
+        :raises TimeoutError: if budget is exhausted before any route is found
+        :raises ValueError: if bidirectional search is requested without prebuilt graph
         :rtype: offroad_routing.pathfinding.path.Path
         """
 
+        # hierarchy is computed for prebuilt graph only, counting networkx graph edges is not cheap
+        if self.__vgraph.hierarchy is not None:
+            return self.__find_hierarchy(start, goal, snap)
         prebuilt = self.__vgraph.stats['number_of_edges'] > 0
-        return self.__find_notbuilt(start, goal, heuristic_multiplier) \
-            if not prebuilt else self.__find_prebuilt(start, goal)
+        if prebuilt and not snap:
+            return self.__find_overlay(start, goal, bidirectional)
+        if prebuilt:
+            return self.__find_prebuilt(start, goal, bidirectional)
+        if bidirectional:
+            raise ValueError("Bidirectional search needs prebuilt graph")
+        if corridor is not None:
+            return self.__find_corridor(start, goal, corridor, heuristic_multiplier, time_limit, max_expanded)
+        return self.__find_notbuilt_any(start, goal, heuristic_multiplier, time_limit, max_expanded)
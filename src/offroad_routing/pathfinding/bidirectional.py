@@ -0,0 +1,89 @@
+from heapq import heappop
+from heapq import heappush
+from math import inf
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+TNode = Hashable
+
+
+def bidirectional_astar(source: TNode, target: TNode,
+                        neighbours: Callable[[TNode, int], Iterable[Tuple[TNode, float]]],
+                        heuristic: Callable[[TNode, int], float],
+                        stats: Optional[Dict[str, int]] = None) -> Tuple[List[TNode], float]:
+    """
+    Find the lowest cost path in undirected graph with two A* searches, from source and from target.
+    Both searches use average potential p(v) = (h_target(v) - h_source(v)) / 2 (and -p(v) from target),
+    so that they see the same reduced edge costs and behave as bidirectional Dijkstra algorithm on them.
+    Search stops when the sum of the lowest priorities of the queues is not lower than the cost of the best path
+    found, any shorter path would have to pass through queued vertices with lower priorities.
+    Each side expands its vertices at most once, the smaller queue is expanded first.
+    The path is optimal for consistent heuristics (edge cost is not lower than the heuristic difference).
+
+    :param source: start vertex
+    :param target: goal vertex
+    :param neighbours: (vertex, side) -> pairs of neighbour and edge cost, side is 0 for source and 1 for target search
+    :param heuristic: (vertex, side) -> estimate of cost to target for side 0 and to source for side 1
+    :param stats: dict to count expanded vertices, queue insertions and outdated queue entries skipped
+    :return: path vertices from source to target and its cost
+    """
+    if stats is None:
+        stats = dict()
+    stats.update({'expanded': 0, 'pushed': 2, 'skipped': 0})
+    if source == target:
+        return [source], 0
+
+    def potential(vertex, side):
+        return (heuristic(vertex, side) - heuristic(vertex, 1 - side)) / 2
+
+    cost_so_far = ({source: 0}, {target: 0})
+    came_from = ({source: None}, {target: None})
+    closed = (set(), set())
+    frontier = ([(potential(source, 0), 0, source)], [(potential(target, 1), 0, target)])
+    # entries of equal priority are popped in insertion order, vertices are not compared
+    counter = 1
+    best, meeting = inf, None
+
+    while frontier[0] and frontier[1]:
+        if frontier[0][0][0] + frontier[1][0][0] >= best:
+            break
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        current = heappop(frontier[side])[2]
+        if current in closed[side]:
+            stats['skipped'] += 1
+            continue
+        closed[side].add(current)
+        stats['expanded'] += 1
+
+        own, other = cost_so_far[side], cost_so_far[1 - side]
+        current_cost = own[current]
+        for neighbour, cost in neighbours(current, side):
+            if neighbour in closed[side]:
+                continue
+            new_cost = current_cost + cost
+            if neighbour not in own or new_cost < own[neighbour]:
+                own[neighbour] = new_cost
+                came_from[side][neighbour] = current
+                heappush(frontier[side], (new_cost + potential(neighbour, side), counter, neighbour))
+                counter += 1
+                stats['pushed'] += 1
+                if neighbour in other and new_cost + other[neighbour] < best:
+                    best, meeting = new_cost + other[neighbour], neighbour
+
+    if meeting is None:
+        raise RuntimeError("Goal vertex is not reachable from start vertex")
+    path, current = list(), meeting
+    while current is not None:
+        path.append(current)
+        current = came_from[0][current]
+    path.reverse()
+    current = came_from[1][meeting]
+    while current is not None:
+        path.append(current)
+        current = came_from[1][current]
+    return path, best
@@ -0,0 +1,278 @@
+"""
+Contraction hierarchy of compact graph.
+
+Graph edges which are not the lowest cost paths between their ends are removed first.
+Then vertices are contracted one by one, least important first: a contracted vertex is removed from the graph
+and a shortcut edge is added between each pair of its remaining neighbours unless a path not longer
+than the two edges through it exists (witness). Importance of a vertex is its edge difference
+(shortcuts added minus edges removed) plus the number of its contracted neighbours, which spreads
+contraction over the graph. Priorities are updated lazily when a vertex is taken from the queue.
+
+Each vertex keeps only edges to vertices contracted after it (upward graph), so that the lowest cost path
+between any two vertices goes up from both of them to its highest vertex. A query runs Dijkstra algorithm
+upwards from both ends and unpacks shortcuts of the path found.
+"""
+from heapq import heappop
+from heapq import heappush
+from math import inf
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from offroad_routing.visibility.csr_graph import CsrGraph
+from scipy.sparse.csgraph import dijkstra
+
+
+# number of sources of one Dijkstra call when redundant edges are removed
+_prune_chunk_size = 256
+
+
+def _necessary_edges(graph: CsrGraph) -> List[Dict[int, float]]:
+    # edges with a cheaper path between their ends are not on any shortest path and are removed,
+    # most visibility graph edges are such (path through a vertex in between is not longer)
+    size = graph.number_of_nodes()
+    matrix = graph.to_scipy()
+    adjacency = [dict() for _ in range(size)]
+    for chunk_start in range(0, size, _prune_chunk_size):
+        chunk = np.arange(chunk_start, min(chunk_start + _prune_chunk_size, size))
+        start, end = graph.indptr[chunk_start], graph.indptr[chunk[-1] + 1]
+        if start == end:
+            continue
+        costs = dijkstra(matrix, directed=True, indices=chunk, limit=float(graph.weights[start:end].max()))
+        for row, vertex in enumerate(chunk.tolist()):
+            neighbours, weights = graph.neighbours(vertex)
+            keep = costs[row, neighbours] >= weights * (1 - 1e-9)
+            adjacency[vertex].update(zip(neighbours[keep].tolist(), weights[keep].tolist()))
+    return adjacency
+
+
+def _witness_costs(adjacency, source, excluded, targets, max_cost, settle_limit) -> Dict[int, float]:
+    # Dijkstra from source without excluded vertex, stops when targets are settled or limits are reached
+    costs, settled, remaining = {source: 0}, set(), len(targets)
+    frontier = [(0, source)]
+    while frontier and remaining > 0 and len(settled) < settle_limit:
+        cost, current = heappop(frontier)
+        if current in settled:
+            continue
+        if cost > max_cost:
+            break
+        settled.add(current)
+        if current in targets:
+            remaining -= 1
+        for neighbour, weight in adjacency[current].items():
+            new_cost = cost + weight
+            if neighbour != excluded and new_cost < costs.get(neighbour, inf):
+                costs[neighbour] = new_cost
+                heappush(frontier, (new_cost, neighbour))
+    return costs
+
+
+def _shortcuts(adjacency, vertex, settle_limit) -> List[Tuple[int, int, float]]:
+    neighbours = list(adjacency[vertex].items())
+    shortcuts = list()
+    for i, (source, source_weight) in enumerate(neighbours):
+        targets = {target: source_weight + target_weight for target, target_weight in neighbours[i + 1:]}
+        if not targets:
+            continue
+        costs = _witness_costs(adjacency, source, vertex, targets, max(targets.values()), settle_limit)
+        shortcuts.extend((source, target, cost) for target, cost in targets.items()
+                         if costs.get(target, inf) > cost)
+    return shortcuts
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy of CsrGraph (see module description).
+    Upward graph is stored in compressed sparse row format: edges from vertex v to higher ranked vertices
+    are indices[indptr[v]:indptr[v + 1]], middle is the contracted vertex of a shortcut and -1 for graph edges.
+    """
+
+    __slots__ = ("graph", "rank", "indptr", "indices", "weights", "middle")
+
+    def __init__(self, graph, rank, indptr, indices, weights, middle):
+        """
+        :param CsrGraph graph: contracted graph
+        :param np.ndarray rank: contraction order of each vertex
+        :param np.ndarray indptr: start of each vertex upward edges in indices, size is number of vertices + 1
+        :param np.ndarray indices: higher ranked neighbours
+        :param np.ndarray weights: weight of each edge in indices
+        :param np.ndarray middle: contracted vertex of each edge in indices, -1 for graph edges
+        """
+        if not len(rank) == len(indptr) - 1 == graph.number_of_nodes():
+            raise ValueError("Rank and indptr sizes do not match graph")
+        if not len(indices) == len(weights) == len(middle) == indptr[-1]:
+            raise ValueError("Adjacency sizes do not match")
+        self.graph = graph
+        self.rank = rank
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.middle = middle
+
+    @classmethod
+    def build(cls, graph: CsrGraph, settle_limit: int = 500) -> "ContractionHierarchy":
+        """
+        :param graph: graph to be contracted
+        :param settle_limit: maximum number of vertices settled by a witness search, lower limit makes
+            preprocessing faster but may add unnecessary shortcuts
+        """
+        if settle_limit < 1:
+            raise ValueError("settle_limit should be positive")
+        size = graph.number_of_nodes()
+        adjacency = _necessary_edges(graph)
+        middles = dict()
+        contracted_neighbours = [0] * size
+
+        def priority(vertex):
+            shortcuts = _shortcuts(adjacency, vertex, settle_limit)
+            return len(shortcuts) - len(adjacency[vertex]) + contracted_neighbours[vertex], shortcuts
+
+        queue = [(priority(vertex)[0], vertex) for vertex in range(size)]
+        queue.sort()
+        rank = np.zeros(size, dtype=np.int64)
+        upward = [None] * size
+        for order in range(size):
+            # lazy update: vertex is contracted if its current priority is still the lowest one
+            while True:
+                _, vertex = heappop(queue)
+                current, shortcuts = priority(vertex)
+                if not queue or current <= queue[0][0]:
+                    break
+                heappush(queue, (current, vertex))
+
+            rank[vertex] = order
+            for source, target, cost in shortcuts:
+                if cost < adjacency[source].get(target, inf):
+                    adjacency[source][target] = adjacency[target][source] = cost
+                    middles[(min(source, target), max(source, target))] = vertex
+            upward[vertex] = adjacency[vertex]
+            for neighbour in adjacency[vertex]:
+                del adjacency[neighbour][vertex]
+                contracted_neighbours[neighbour] += 1
+            adjacency[vertex] = dict()
+
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum([len(edges) for edges in upward], out=indptr[1:])
+        indices = np.fromiter((neighbour for edges in upward for neighbour in edges), dtype=np.int64,
+                              count=indptr[-1])
+        weights = np.fromiter((weight for edges in upward for weight in edges.values()), dtype=np.float64,
+                              count=indptr[-1])
+        middle = np.fromiter((middles.get((min(vertex, neighbour), max(vertex, neighbour)), -1)
+                              for vertex, edges in enumerate(upward) for neighbour in edges), dtype=np.int64,
+                             count=indptr[-1])
+        return cls(graph, rank, indptr, indices.astype(graph.indices.dtype), weights, middle)
+
+    def number_of_shortcuts(self) -> int:
+        return int(np.count_nonzero(self.middle >= 0))
+
+    def nbytes(self) -> int:
+        """
+        :return: memory used by hierarchy arrays in bytes (without graph)
+        """
+        return sum(a.nbytes for a in (self.rank, self.indptr, self.indices, self.weights, self.middle))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        :return: named arrays of hierarchy to be stored with graph
+        """
+        return {"rank": self.rank, "indptr": self.indptr, "indices": self.indices, "weights": self.weights,
+                "middle": self.middle}
+
+    def __edge_middle(self, a: int, b: int) -> int:
+        # edge is stored at its lower ranked end
+        if self.rank[a] > self.rank[b]:
+            a, b = b, a
+        start, end = self.indptr[a], self.indptr[a + 1]
+        position = start + int(np.flatnonzero(self.indices[start:end] == b)[0])
+        return int(self.middle[position])
+
+    def __unpack(self, path: List[int]) -> List[int]:
+        unpacked, stack = [path[0]], [(a, b) for a, b in zip(reversed(path[:-1]), reversed(path[1:]))]
+        while stack:
+            a, b = stack.pop()
+            middle = self.__edge_middle(a, b)
+            if middle < 0:
+                unpacked.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return unpacked
+
+    def find_between(self, sources: Dict[int, float], targets: Dict[int, float],
+                     stats: Optional[Dict[str, int]] = None) -> Tuple[List[int], float]:
+        """
+        Find the lowest cost path from any of sources to any of targets, including their initial costs.
+
+        :param sources: start vertices and costs to reach them
+        :param targets: goal vertices and costs to leave them
+        :param stats: dict to count vertices expanded by both searches
+        :return: unpacked path vertices from a source to a target and its cost with initial costs
+        """
+        if stats is None:
+            stats = dict()
+        stats.update({'expanded': 0, 'pushed': len(sources) + len(targets), 'skipped': 0})
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        cost_so_far = (dict(sources), dict(targets))
+        came_from = ({vertex: None for vertex in sources}, {vertex: None for vertex in targets})
+        closed = (set(), set())
+        frontier = ([(cost, vertex) for vertex, cost in sources.items()],
+                    [(cost, vertex) for vertex, cost in targets.items()])
+        for queue in frontier:
+            queue.sort()
+        best, meeting = inf, None
+
+        while True:
+            # each search stops when its queue has no vertices cheaper than the best path
+            sides = [side for side in (0, 1) if frontier[side] and frontier[side][0][0] < best]
+            if not sides:
+                break
+            side = min(sides, key=lambda s: frontier[s][0][0])
+            cost, current = heappop(frontier[side])
+            if current in closed[side]:
+                stats['skipped'] += 1
+                continue
+            closed[side].add(current)
+            stats['expanded'] += 1
+            other = cost_so_far[1 - side]
+            if current in other and cost + other[current] < best:
+                best, meeting = cost + other[current], current
+
+            start, end = indptr[current], indptr[current + 1]
+            neighbours, edge_weights = indices[start:end].tolist(), weights[start:end].tolist()
+            own = cost_so_far[side]
+            # stall on demand: vertex reached cheaper from a higher one is not on an upward shortest path
+            if any(own.get(neighbour, inf) + weight < cost for neighbour, weight in zip(neighbours, edge_weights)):
+                continue
+            for neighbour, weight in zip(neighbours, edge_weights):
+                new_cost = cost + weight
+                if new_cost < own.get(neighbour, inf):
+                    own[neighbour] = new_cost
+                    came_from[side][neighbour] = current
+                    heappush(frontier[side], (new_cost, neighbour))
+                    stats['pushed'] += 1
+
+        if meeting is None:
+            raise RuntimeError("Goal vertex is not reachable from start vertex")
+        path, current = list(), meeting
+        while current is not None:
+            path.append(current)
+            current = came_from[0][current]
+        path.reverse()
+        current = came_from[1][meeting]
+        while current is not None:
+            path.append(current)
+            current = came_from[1][current]
+        return self.__unpack(path), best
+
+    def find(self, source: int, target: int, stats: Optional[Dict[str, int]] = None) -> Tuple[List[int], float]:
+        """
+        Find the lowest cost path between two vertices.
+
+        :param source: start vertex
+        :param target: goal vertex
+        :param stats: dict to count vertices expanded by both searches
+        :return: unpacked path vertices from source to target and its cost
+        """
+        return self.find_between({source: 0}, {target: 0}, stats)
@@ -0,0 +1,112 @@
+from heapq import heappop
+from heapq import heappush
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from offroad_routing.pathfinding.bidirectional import bidirectional_astar
+from offroad_routing.visibility.csr_graph import CsrGraph
+from scipy.sparse.csgraph import dijkstra
+
+
+def _heuristic(graph: CsrGraph, target: int, heuristic_multiplier: float, bounds: Optional[np.ndarray]) -> list:
+    distances = graph.distances(graph.coordinates(target))
+    if bounds is not None:
+        distances = np.maximum(distances, bounds)
+    return (distances * heuristic_multiplier).tolist()
+
+
+def csr_astar(graph: CsrGraph, source: int, target: int, heuristic_multiplier: float = 1,
+              bounds: Optional[np.ndarray] = None) -> List[int]:
+    """
+    Find the lowest cost path between two vertices of compact graph using A* algorithm.
+    Straight line distance is a lower bound of edge weight (surface weights are at least 1),
+    so the path is optimal for heuristic_multiplier <= 1.
+
+    :param CsrGraph graph: compact graph
+    :param int source: start vertex
+    :param int target: goal vertex
+    :param float heuristic_multiplier: multiplier to weight heuristic
+    :param Optional[np.ndarray] bounds: lower bound of cost to target for each vertex used with straight line
+        distance (see offroad_routing.pathfinding.landmarks)
+    :return: path vertices from source to target
+    """
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    # distances to goal for all vertices at once are cheaper than separate calls for visited ones
+    heuristic = _heuristic(graph, target, heuristic_multiplier, bounds)
+
+    came_from = {source: -1}
+    cost_so_far = {source: 0.0}
+    closed = set()
+    frontier = [(heuristic[source], source)]
+
+    while frontier:
+        current = heappop(frontier)[1]
+        if current == target:
+            break
+        if current in closed:
+            continue
+        closed.add(current)
+
+        start, end = indptr[current], indptr[current + 1]
+        current_cost = cost_so_far[current]
+        for neighbour, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+            new_cost = current_cost + weight
+            if neighbour not in cost_so_far or new_cost < cost_so_far[neighbour]:
+                cost_so_far[neighbour] = new_cost
+                came_from[neighbour] = current
+                heappush(frontier, (new_cost + heuristic[neighbour], neighbour))
+    else:
+        raise RuntimeError("Goal vertex is not reachable from start vertex")
+
+    path, current = list(), target
+    while current != -1:
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return path
+
+
+def csr_bidirectional_astar(graph: CsrGraph, source: int, target: int, heuristic_multiplier: float = 1,
+                            stats: Optional[dict] = None,
+                            bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> List[int]:
+    """
+    Find the lowest cost path between two vertices of compact graph using bidirectional A* algorithm
+    (see offroad_routing.pathfinding.bidirectional), optimal for heuristic_multiplier <= 1.
+
+    :param CsrGraph graph: compact graph
+    :param int source: start vertex
+    :param int target: goal vertex
+    :param float heuristic_multiplier: multiplier to weight heuristic
+    :param Optional[dict] stats: dict to count expanded vertices, queue insertions and outdated queue entries skipped
+    :param Optional[Tuple[np.ndarray, np.ndarray]] bounds: lower bounds of cost to target and to source
+        for each vertex used with straight line distance (see offroad_routing.pathfinding.landmarks)
+    :return: path vertices from source to target
+    """
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    if bounds is None:
+        bounds = (None, None)
+    heuristics = (_heuristic(graph, target, heuristic_multiplier, bounds[0]),
+                  _heuristic(graph, source, heuristic_multiplier, bounds[1]))
+
+    def neighbours(vertex, side):
+        start, end = indptr[vertex], indptr[vertex + 1]
+        return zip(indices[start:end].tolist(), weights[start:end].tolist())
+
+    path, _ = bidirectional_astar(source, target, neighbours, lambda vertex, side: heuristics[side][vertex], stats)
+    return path
+
+
+def csr_dijkstra(graph: CsrGraph, source: int, max_cost: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the lowest costs from a vertex to all vertices of compact graph.
+
+    :param CsrGraph graph: compact graph
+    :param int source: start vertex
+    :param Optional[float] max_cost: vertices with higher cost are not processed
+    :return: cost of each vertex (inf if not reached) and its predecessor on the path (-9999 if none)
+    """
+    costs, predecessors = dijkstra(graph.to_scipy(), directed=True, indices=source, return_predecessors=True,
+                                   limit=np.inf if max_cost is None else max_cost)
+    return costs, predecessors
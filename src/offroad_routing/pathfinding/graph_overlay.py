@@ -0,0 +1,101 @@
+from typing import List
+from typing import Tuple
+
+from offroad_routing.geometry.algorithms import point_distances
+from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.visibility.csr_graph import CsrGraph
+
+
+def point_edges(vgraph, point: TPoint) -> Tuple[List[int], List[float]]:
+    """
+    Edges from a point which is not a graph vertex to vertices visible from it.
+
+    :param VisibilityGraph vgraph: visibility graph
+    :param point: point (lon, lat)
+    :return: vertex table ids of visible vertices and edge weights
+    """
+    vertices = vgraph.incident_vertices((point, None, None, None, None))
+    table = vgraph.vertex_table
+    distances = point_distances(point, [vertex[0] for vertex in vertices]).tolist()
+    return ([table.index(*vertex[1:4]) for vertex in vertices],
+            [vertex[4] * distance for vertex, distance in zip(vertices, distances)])
+
+
+class GraphOverlay:
+    """
+    Start and goal points attached to built graph of VisibilityGraph by edges to vertices visible from them.
+    Built graph is shared and not changed: edges of the points are kept in the overlay and added to
+    neighbours of graph vertices on lookup. Vertices are graph nodes (vertex numbers if the graph is compact),
+    start and goal are numbered after them (see source and target).
+    """
+
+    __slots__ = ("start", "goal", "source", "target", "__graph", "__csr_graph", "__edges")
+
+    def __init__(self, vgraph, start: TPoint, goal: TPoint, graph=None):
+        """
+        :param VisibilityGraph vgraph: visibility graph with built graph
+        :param start: start point
+        :param goal: goal point
+        :param Optional[Union[CsrGraph, networkx.MultiGraph]] graph: graph of the same vertices to attach points to,
+            built graph of vgraph if None
+        """
+        self.start, self.goal = start, goal
+        if graph is None:
+            graph = vgraph.csr_graph if vgraph.csr_graph is not None else vgraph.graph
+        self.__csr_graph = graph if isinstance(graph, CsrGraph) else None
+        self.__graph = graph if self.__csr_graph is None else None
+        size = len(vgraph.vertex_table) if self.__csr_graph is None else self.__csr_graph.number_of_nodes()
+        self.source, self.target = size, size + 1
+
+        self.__edges = {self.source: list(), self.target: list()}
+        for end, point, name in ((self.source, start, "Start"), (self.target, goal, "Goal")):
+            ids, weights = point_edges(vgraph, point)
+            if len(ids) == 0:
+                raise RuntimeError(name + " point has no neighbours on the graph")
+            for node, weight in zip(self.__graph_vertices(ids), weights):
+                # vertices not connected to built graph are skipped
+                if node < 0:
+                    continue
+                self.__edges[end].append((node, weight))
+                self.__edges.setdefault(node, list()).append((end, weight))
+
+    def __graph_vertices(self, ids: List[int]) -> List[int]:
+        # vertex table ids to graph vertices, -1 for vertices missing in graph
+        if self.__csr_graph is None:
+            return [vertex if vertex in self.__graph else -1 for vertex in ids]
+        return self.__csr_graph.vertices(ids).tolist()
+
+    def neighbours(self, vertex: int, side: int = 0) -> List[Tuple[int, float]]:
+        """
+        :param vertex: graph vertex, source or target
+        :param side: not used, edges are undirected (see offroad_routing.pathfinding.bidirectional)
+        :return: pairs of neighbour and edge weight, the lowest weight of parallel edges
+        """
+        edges = self.__edges.get(vertex)
+        if vertex == self.source or vertex == self.target:
+            return edges
+        if self.__csr_graph is None:
+            neighbours = [(neighbour, min(edge['weight'] for edge in parallel.values()))
+                          for neighbour, parallel in self.__graph.adj[vertex].items()]
+        else:
+            indptr = self.__csr_graph.indptr
+            start, end = indptr[vertex], indptr[vertex + 1]
+            neighbours = list(zip(self.__csr_graph.indices[start:end].tolist(),
+                                  self.__csr_graph.weights[start:end].tolist()))
+        if edges is not None:
+            neighbours.extend(edges)
+        return neighbours
+
+    def coordinates(self, vertex: int) -> TPoint:
+        """
+        :param vertex: graph vertex, source or target
+        :return: point (lon, lat)
+        """
+        if vertex == self.source:
+            return self.start
+        if vertex == self.target:
+            return self.goal
+        if self.__csr_graph is None:
+            node = self.__graph.nodes[vertex]
+            return node['x'], node['y']
+        return self.__csr_graph.coordinates(vertex)
@@ -0,0 +1,116 @@
+"""
+Landmark (ALT) lower bounds of path cost in compact graph.
+
+Costs from a few landmark vertices to all vertices are precomputed. By triangle inequality
+|d(L, v) - d(L, t)| <= d(v, t) for every landmark L, the largest of these values is an admissible
+and consistent A* heuristic, usually much tighter than straight line distance.
+
+A point which is not a graph vertex (route start or goal) is a target connected to several vertices n
+with edge costs w(n). Its cost from a landmark is not known exactly, but
+min(d(L, n) + w(n)) - d(L, v) and d(L, v) - max(d(L, n) - w(n)) are still lower bounds of d(v, t).
+
+Bounds hold for any graph whose paths are not cheaper than paths of the graph landmarks were computed for:
+the graph itself or on the fly search of VisibilityGraph the graph was built from with inside_percent=1
+(without max_distance and max_neighbours). Build parameters are kept with landmarks to check it (see complete).
+"""
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import numpy as np
+from offroad_routing.visibility.csr_graph import CsrGraph
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.csgraph import dijkstra
+
+
+class Landmarks:
+    """
+    Costs from landmark vertices to every vertex of compact graph, inf for vertices not reachable from a landmark.
+    """
+
+    __slots__ = ("graph", "vertices", "distances", "parameters")
+
+    def __init__(self, graph, vertices, distances, parameters=None):
+        """
+        :param CsrGraph graph: graph of landmarks
+        :param np.ndarray vertices: landmark vertices
+        :param np.ndarray distances: cost from each landmark to each vertex of shape (len(vertices), number of vertices)
+        :param Optional[Dict[str, Any]] parameters: inside_percent, max_distance and max_neighbours graph was built
+            with (see VisibilityGraph.build), None if not known
+        """
+        if distances.shape != (len(vertices), graph.number_of_nodes()):
+            raise ValueError("Distance array shape does not match landmarks and graph")
+        self.graph = graph
+        self.vertices = vertices
+        self.distances = distances
+        self.parameters = parameters
+
+    @classmethod
+    def build(cls, graph: CsrGraph, count: int = 16, seed: int = 0,
+              parameters: Optional[Dict[str, Any]] = None) -> "Landmarks":
+        """
+        Choose landmarks by farthest selection in the largest connected component of graph:
+        each next landmark is the vertex with the highest cost from the chosen ones.
+
+        :param graph: graph to be preprocessed
+        :param count: number of landmarks, fewer if the component is smaller
+        :param seed: random seed for the vertex selection starts from
+        :param parameters: build parameters of graph (see parameters)
+        """
+        if count < 1:
+            raise ValueError("count should be positive")
+        matrix = graph.to_scipy()
+        size = graph.number_of_nodes()
+        if size == 0:
+            raise ValueError("Graph has no vertices")
+        _, labels = connected_components(matrix, directed=False)
+        component = np.flatnonzero(labels == np.argmax(np.bincount(labels)))
+        count = min(count, len(component))
+
+        current = int(np.random.default_rng(seed).choice(component))
+        nearest = dijkstra(matrix, directed=True, indices=current)
+        vertices, distances = list(), list()
+        for _ in range(count):
+            current = int(component[np.argmax(nearest[component])])
+            vertices.append(current)
+            distances.append(dijkstra(matrix, directed=True, indices=current))
+            nearest = distances[-1] if len(vertices) == 1 else np.minimum(nearest, distances[-1])
+        return cls(graph, np.array(vertices, dtype=np.int64), np.array(distances, dtype=np.float64), parameters)
+
+    @property
+    def complete(self) -> bool:
+        """
+        True if graph was built with inside_percent=1 without max_distance and max_neighbours:
+        bounds then hold for on the fly search and for any graph built for the same geometry,
+        otherwise only for the graph itself.
+        """
+        parameters = self.parameters
+        return parameters is not None and parameters["inside_percent"] == 1 and \
+            parameters["max_distance"] is None and parameters["max_neighbours"] is None
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        :return: named arrays of landmarks to be stored with graph
+        """
+        return {"vertices": self.vertices, "distances": self.distances}
+
+    def lower_bounds(self, targets: Dict[int, float]) -> np.ndarray:
+        """
+        :param targets: vertices connected to target and costs of their edges to it, {t: 0} for vertex t
+        :return: lower bound of cost from each vertex to target, inf if target is not reachable
+        """
+        if not targets:
+            raise ValueError("No target vertices")
+        vertices = np.fromiter(targets.keys(), dtype=np.int64, count=len(targets))
+        costs = np.fromiter(targets.values(), dtype=np.float64, count=len(targets))
+        target_distances = self.distances[:, vertices]
+        low = (target_distances + costs).min(axis=1)[:, np.newaxis]
+        high = (target_distances - costs).max(axis=1)[:, np.newaxis]
+        with np.errstate(invalid='ignore'):
+            bounds = np.fmax(low - self.distances, self.distances - high)
+        # both costs are inf for vertices and targets not reachable from a landmark, it gives no bound
+        bounds = np.nan_to_num(bounds, nan=0, posinf=np.inf, neginf=0)
+        return np.maximum(bounds.max(axis=0, initial=0), 0)
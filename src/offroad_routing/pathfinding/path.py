@@ -1,4 +1,5 @@
 from typing import List
+from typing import Optional
 
 from geopandas import GeoDataFrame
 from offroad_routing.geometry.algorithms import compare_points
@@ -9,12 +10,15 @@ from shapely.geometry import LineString
 
 class Path:
 
-    __slots__ = ("__start", "__goal", "__path")
+    __slots__ = ("__start", "__goal", "__path", "__cost", "__bound")
 
-    def __init__(self, path: List[TPoint], start: TPoint, goal: TPoint):
+    def __init__(self, path: List[TPoint], start: TPoint, goal: TPoint, cost: Optional[float] = None,
+                 bound: Optional[float] = None):
         self.__path = path
         self.__start = start
         self.__goal = goal
+        self.__cost = cost
+        self.__bound = bound
 
     @classmethod
     def retrace(cls, came_from: dict, start: TPoint, goal: TPoint) -> "Path":
@@ -33,6 +37,21 @@ class Path:
     def path(self) -> TPath:
         return self.__path.copy()
 
+    @property
+    def cost(self) -> Optional[float]:
+        """
+        Route cost (sum of edge weights: distance in km multiplied by surface weight), None if unknown.
+        """
+        return self.__cost
+
+    @property
+    def bound(self) -> Optional[float]:
+        """
+        Suboptimality bound proven by search with limited budget: cost is at most bound times the lowest cost,
+        1 for optimal route, None if unknown.
+        """
+        return self.__bound
+
     @property
     def start(self) -> TPoint:
         return self.__start
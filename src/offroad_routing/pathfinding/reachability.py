@@ -0,0 +1,191 @@
+"""
+Route costs from a point to many points: cost matrices and isochrones.
+
+Points which are not graph vertices are connected to vertices visible from them, as with AStar.find(snap=False).
+Prebuilt graph is searched by one scipy Dijkstra call: sources and targets are added to a copy of compact graph
+as vertices with edges from sources and to targets only, so that routes do not pass through them.
+Without prebuilt graph visible vertices are computed on the fly (memoized by VisibilityGraph.cached_incident_vertices)
+and Dijkstra expansion is bounded: it stops when all targets are reached or route cost exceeds max_cost.
+
+Isochrone polygon is the union of disks around the start point and reached vertices, each with radius
+of the distance over default surface which can be covered with the remaining cost.
+Obstacles and other surfaces inside the disks are not taken into account.
+"""
+from heapq import heappop
+from heapq import heappush
+from math import cos
+from math import inf
+from math import radians
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from geopandas import GeoDataFrame
+from offroad_routing.geometry.algorithms import compare_points
+from offroad_routing.geometry.algorithms import point_distances
+from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.pathfinding.graph_overlay import point_edges
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from shapely.affinity import scale
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
+
+# km in one degree of latitude
+_degree_length = 6371 * np.pi / 180
+
+
+class Reachability:
+    """
+    One-to-many route costs over visibility graph (see module description).
+    """
+
+    __slots__ = ("__vgraph",)
+
+    def __init__(self, vgraph):
+        """
+        :param VisibilityGraph vgraph: visibility graph with computed geometry
+        """
+        self.__vgraph = vgraph
+
+    def __prebuilt(self) -> bool:
+        # hierarchy is computed for prebuilt graph only, counting networkx graph edges is not cheap
+        return self.__vgraph.hierarchy is not None or self.__vgraph.stats['number_of_edges'] > 0
+
+    def __costs_prebuilt(self, sources: List[TPoint], targets: List[TPoint], max_cost: float) -> np.ndarray:
+        # costs from each source to each vertex of compact graph and then to each target
+        graph = self.__vgraph.compact_graph()
+        size = graph.number_of_nodes()
+        matrix = graph.to_scipy().tocoo()
+        rows, columns, weights = [matrix.row], [matrix.col], [matrix.data]
+        for number, point in enumerate(sources + targets):
+            ids, edge_weights = point_edges(self.__vgraph, point)
+            vertices = graph.vertices(ids)
+            # vertices not connected to built graph are skipped
+            connected = vertices >= 0
+            end = np.full(np.count_nonzero(connected), size + number)
+            vertices = vertices[connected]
+            rows.append(end if number < len(sources) else vertices)
+            columns.append(vertices if number < len(sources) else end)
+            weights.append(np.asarray(edge_weights, dtype=np.float64)[connected])
+        shape = (size + len(sources) + len(targets),) * 2
+        matrix = csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(columns))), shape=shape)
+        return dijkstra(matrix, directed=True, indices=np.arange(size, size + len(sources)), limit=max_cost)
+
+    def __sweep_notbuilt(self, start: TPoint, targets: List[TPoint],
+                         max_cost: float) -> Tuple[Dict[int, float], List[float]]:
+        # Dijkstra from start over on the fly visibility, stops when all targets are settled or max_cost is exceeded;
+        # returns costs of settled vertices (vertex table ids) and of each target, inf for targets not reached
+        table = self.__vgraph.vertex_table
+        start_id = len(table)
+        target_edges = dict()
+        for number, point in enumerate(targets):
+            ids, weights = point_edges(self.__vgraph, point)
+            for vertex, weight in zip(ids, weights):
+                target_edges.setdefault(vertex, list()).append((start_id + 1 + number, weight))
+        start_ids, start_weights = point_edges(self.__vgraph, start)
+
+        costs, target_costs = dict(), [inf] * len(targets)
+        remaining = len(targets)
+        cost_so_far = {start_id: 0}
+        frontier = [(0, start_id)]
+        while frontier and (remaining > 0 or not targets):
+            cost, current = heappop(frontier)
+            if cost > max_cost:
+                break
+            if current in costs or current > start_id and target_costs[current - start_id - 1] < inf:
+                continue
+            if current > start_id:
+                target_costs[current - start_id - 1] = cost
+                remaining -= 1
+                continue
+            costs[current] = cost
+
+            if current == start_id:
+                edges = list(zip(start_ids, start_weights))
+            else:
+                point = table.point(current)
+                vertices = self.__vgraph.cached_incident_vertices((point,) + table.key(current) + (None,))
+                distances = point_distances(point, [vertex[0] for vertex in vertices]).tolist()
+                edges = [(table.index(*vertex[1:4]), vertex[4] * distance)
+                         for vertex, distance in zip(vertices, distances)]
+                edges.extend(target_edges.get(current, ()))
+            for neighbour, weight in edges:
+                new_cost = cost + weight
+                if new_cost < cost_so_far.get(neighbour, inf):
+                    cost_so_far[neighbour] = new_cost
+                    heappush(frontier, (new_cost, neighbour))
+        costs.pop(start_id, None)
+        return costs, target_costs
+
+    def distance_matrix(self, sources: List[TPoint], targets: List[TPoint],
+                        max_cost: Optional[float] = None) -> np.ndarray:
+        """
+        Find the lowest route cost from each of sources to each of targets.
+
+        :param sources: start points
+        :param targets: goal points
+        :param max_cost: costs above it are not computed (inf), bounds expansion without prebuilt graph
+        :return: route costs of shape (len(sources), len(targets)), inf if goal is not reachable
+        """
+        if max_cost is not None and max_cost < 0:
+            raise ValueError("max_cost should not be negative")
+        sources, targets = list(sources), list(targets)
+        max_cost = inf if max_cost is None else max_cost
+        if not sources or not targets:
+            return np.zeros((len(sources), len(targets)))
+        if self.__prebuilt():
+            costs = self.__costs_prebuilt(sources, targets, max_cost)
+            matrix = costs[:, costs.shape[1] - len(targets):]
+        else:
+            matrix = np.array([self.__sweep_notbuilt(source, targets, max_cost)[1] for source in sources])
+        for i, source in enumerate(sources):
+            for j, target in enumerate(targets):
+                if compare_points(source, target):
+                    matrix[i, j] = 0
+        return matrix
+
+    def reached_vertices(self, point: TPoint, max_cost: float) -> Tuple[List[TPoint], np.ndarray]:
+        """
+        Find graph vertices reachable from point with route cost not above max_cost.
+
+        :param point: start point
+        :param max_cost: maximum route cost
+        :return: vertex points and route costs to them
+        """
+        if max_cost < 0:
+            raise ValueError("max_cost should not be negative")
+        if self.__prebuilt():
+            graph = self.__vgraph.compact_graph()
+            costs = self.__costs_prebuilt([point], [], max_cost)[0, :graph.number_of_nodes()]
+            vertices = np.flatnonzero(np.isfinite(costs))
+            return [graph.coordinates(vertex) for vertex in vertices.tolist()], costs[vertices]
+        costs, _ = self.__sweep_notbuilt(point, [], max_cost)
+        table = self.__vgraph.vertex_table
+        return [table.point(vertex) for vertex in costs], np.fromiter(costs.values(), dtype=np.float64,
+                                                                      count=len(costs))
+
+    def isochrone(self, point: TPoint, max_cost: float, resolution: int = 16) -> GeoDataFrame:
+        """
+        Find area reachable from point with route cost not above max_cost (see module description).
+
+        :param point: start point
+        :param max_cost: maximum route cost
+        :param resolution: number of segments in a quarter of each disk
+        :return: one polygon with max_cost in column cost
+        """
+        points, costs = self.reached_vertices(point, max_cost)
+        disks = list()
+        for (lon, lat), cost in zip([point] + points, [0] + costs.tolist()):
+            radius = (max_cost - cost) / self.__vgraph.default_weight / _degree_length
+            if radius <= 0:
+                continue
+            # degree of longitude is shorter than degree of latitude
+            disk = Point(lon, lat).buffer(radius, resolution)
+            disks.append(scale(disk, xfact=1 / cos(radians(lat)), yfact=1, origin=(lon, lat)))
+        return GeoDataFrame({'cost': [max_cost], 'geometry': [unary_union(disks) if disks else Polygon()]},
+                            crs='epsg:4326')
@@ -0,0 +1,183 @@
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from math import inf
+from time import monotonic
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from offroad_routing.pathfinding.bidirectional import TNode
+
+
+def astar(source: TNode, target: TNode, neighbours: Callable[[TNode], Iterable[Tuple[TNode, float]]],
+          heuristic: Callable[[TNode], float], stats: Optional[Dict[str, int]] = None) -> Tuple[List[TNode], float]:
+    """
+    Find the lowest cost path in graph given by neighbours function using A* algorithm.
+    Each vertex is expanded at most once, the path is optimal for consistent heuristics.
+
+    :param source: start vertex
+    :param target: goal vertex
+    :param neighbours: vertex -> pairs of neighbour and edge cost
+    :param heuristic: vertex -> estimate of cost to target
+    :param stats: dict to count expanded vertices, queue insertions and outdated queue entries skipped
+    :return: path vertices from source to target and its cost
+    """
+    if stats is None:
+        stats = dict()
+    stats.update({'expanded': 0, 'pushed': 1, 'skipped': 0})
+
+    cost_so_far = {source: 0}
+    came_from = {source: None}
+    closed = set()
+    # entries of equal priority are popped in insertion order, vertices are not compared
+    frontier = [(heuristic(source), 0, source)]
+    counter = 1
+
+    while frontier:
+        current = heappop(frontier)[2]
+        if current == target:
+            break
+        if current in closed:
+            stats['skipped'] += 1
+            continue
+        closed.add(current)
+        stats['expanded'] += 1
+
+        current_cost = cost_so_far[current]
+        for neighbour, cost in neighbours(current):
+            if neighbour in closed:
+                continue
+            new_cost = current_cost + cost
+            if neighbour not in cost_so_far or new_cost < cost_so_far[neighbour]:
+                cost_so_far[neighbour] = new_cost
+                came_from[neighbour] = current
+                heappush(frontier, (new_cost + heuristic(neighbour), counter, neighbour))
+                counter += 1
+                stats['pushed'] += 1
+    else:
+        raise RuntimeError("Goal vertex is not reachable from start vertex")
+
+    path, current = list(), target
+    while current is not None:
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return path, cost_so_far[target]
+
+
+def anytime_astar(source: TNode, target: TNode, neighbours: Callable[[TNode], Iterable[Tuple[TNode, float]]],
+                  heuristic: Callable[[TNode], float], weight: float, time_limit: Optional[float] = None,
+                  max_expanded: Optional[int] = None,
+                  stats: Optional[Dict[str, int]] = None) -> Tuple[List[TNode], float, float]:
+    """
+    Find a path in graph given by neighbours function using anytime repairing A* (ARA*):
+    weighted A* searches with decreasing heuristic weight, each reusing vertices expanded by the previous ones.
+    For consistent heuristics path found with weight w costs at most w times the lowest cost,
+    search stops when the path is proven optimal or the budget is exhausted.
+
+    At any moment the lowest path cost is not below min(g(v) + h(v)) over vertices whose cost g decreased
+    after their expansion (or which are not expanded yet), it gives the bound of the best path found.
+
+    :param source: start vertex
+    :param target: goal vertex
+    :param neighbours: vertex -> pairs of neighbour and edge cost
+    :param heuristic: vertex -> estimate of cost to target
+    :param weight: heuristic weight of the first search, not less than 1
+    :param time_limit: wall clock budget in seconds
+    :param max_expanded: budget of vertices expanded by all searches
+    :param stats: dict to count expanded vertices, queue insertions, outdated queue entries skipped and searches
+    :return: path vertices from source to target, its cost and bound: path cost is at most bound times the lowest cost
+    :raises TimeoutError: if budget is exhausted before the first path is found
+    """
+    if weight < 1:
+        raise ValueError("weight should not be less than 1")
+    deadline = None if time_limit is None else monotonic() + time_limit
+    if stats is None:
+        stats = dict()
+    stats.update({'expanded': 0, 'pushed': 1, 'skipped': 0, 'searches': 0})
+
+    estimates = dict()
+
+    def estimate(vertex):
+        # heuristic is computed once for a vertex, queue is rebuilt for each weight
+        if vertex not in estimates:
+            estimates[vertex] = heuristic(vertex)
+        return estimates[vertex]
+
+    def proven_bound(cost, bound):
+        # lowest path cost is not below the lowest cost to target through a vertex not expanded with its cost
+        candidates = (cost_so_far[vertex] + estimate(vertex) for vertex in opened | inconsistent)
+        lowest = min(cost_so_far.get(target, inf), min(candidates, default=inf))
+        if cost <= lowest:
+            return 1
+        return min(bound, cost / lowest) if lowest > 0 else bound
+
+    cost_so_far = {source: 0}
+    came_from = {source: None}
+    # vertices in queue and vertices whose cost decreased after expansion in the current search
+    opened, inconsistent = {source}, set()
+    frontier = [(weight * estimate(source), 0, 0, source)]
+    counter = 1
+    best = None
+
+    while True:
+        stats['searches'] += 1
+        closed = set()
+        exhausted = False
+        while frontier:
+            key, _, cost, current = frontier[0]
+            if current not in opened or cost != cost_so_far[current]:
+                heappop(frontier)
+                stats['skipped'] += 1
+                continue
+            if cost_so_far.get(target, inf) <= key:
+                break
+            if (max_expanded is not None and stats['expanded'] >= max_expanded or
+                    deadline is not None and monotonic() > deadline):
+                exhausted = True
+                break
+            heappop(frontier)
+            opened.remove(current)
+            closed.add(current)
+            stats['expanded'] += 1
+
+            for neighbour, edge_cost in neighbours(current):
+                new_cost = cost + edge_cost
+                if new_cost < cost_so_far.get(neighbour, inf):
+                    cost_so_far[neighbour] = new_cost
+                    came_from[neighbour] = current
+                    if neighbour in closed:
+                        inconsistent.add(neighbour)
+                        continue
+                    opened.add(neighbour)
+                    heappush(frontier, (new_cost + weight * estimate(neighbour), counter, new_cost, neighbour))
+                    counter += 1
+                    stats['pushed'] += 1
+
+        if exhausted:
+            if best is None:
+                raise TimeoutError("Goal vertex is not reached within search budget")
+            return best[0], best[1], proven_bound(best[1], best[2])
+        if target not in cost_so_far:
+            raise RuntimeError("Goal vertex is not reachable from start vertex")
+
+        path, current = list(), target
+        while current is not None:
+            path.append(current)
+            current = came_from[current]
+        path.reverse()
+        best = path, cost_so_far[target], proven_bound(cost_so_far[target], weight)
+        if best[2] <= 1:
+            return best
+
+        weight = max(1, best[2] / 2)
+        opened |= inconsistent
+        inconsistent = set()
+        frontier = [(cost_so_far[vertex] + weight * estimate(vertex), counter + i, cost_so_far[vertex], vertex)
+                    for i, vertex in enumerate(opened)]
+        counter += len(frontier)
+        heapify(frontier)
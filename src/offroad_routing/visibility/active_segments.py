@@ -0,0 +1,118 @@
+from random import Random
+from typing import Callable
+
+
+class ActiveSegments:
+    """
+    Segments intersected by sweep ray ordered by distance from sweep center (see SegmentVisibility).
+    Segments are stored in a treap: binary search tree balanced by random node priorities,
+    insertion, removal and finding the next segment take O(log n) expected time.
+    Order is defined by comparisons of an inserted segment with stored ones, it is kept while the ray rotates
+    if segments do not cross each other.
+    """
+
+    __slots__ = ("__left", "__right", "__parent", "__priority", "__root", "__random")
+
+    # parent of a segment which is not stored
+    absent = -2
+
+    def __init__(self, size: int):
+        """
+        :param size: number of segments, they are numbered from 0 to size - 1
+        """
+        self.__left = [-1] * size
+        self.__right = [-1] * size
+        self.__parent = [ActiveSegments.absent] * size
+        self.__priority = [0.0] * size
+        self.__root = -1
+        # priorities only affect tree shape, fixed seed makes it reproducible
+        self.__random = Random(0)
+
+    def __contains__(self, k: int) -> bool:
+        return self.__parent[k] != ActiveSegments.absent
+
+    def __rotate_up(self, k: int) -> None:
+        left, right, parent = self.__left, self.__right, self.__parent
+        p = parent[k]
+        if left[p] == k:
+            left[p] = right[k]
+            if right[k] >= 0:
+                parent[right[k]] = p
+            right[k] = p
+        else:
+            right[p] = left[k]
+            if left[k] >= 0:
+                parent[left[k]] = p
+            left[k] = p
+        g = parent[p]
+        parent[k], parent[p] = g, k
+        if g < 0:
+            self.__root = k
+        elif left[g] == p:
+            left[g] = k
+        else:
+            right[g] = k
+
+    def insert(self, k: int, before: Callable[[int], bool]) -> None:
+        """
+        :param k: number of segment to insert
+        :param before: stored segment number -> True if it goes before segment k
+        """
+        left, right, parent, priority = self.__left, self.__right, self.__parent, self.__priority
+        node, p, go_right = self.__root, -1, False
+        while node >= 0:
+            p = node
+            go_right = before(node)
+            node = right[node] if go_right else left[node]
+        left[k], right[k], parent[k] = -1, -1, p
+        priority[k] = self.__random.random()
+        if p < 0:
+            self.__root = k
+        elif go_right:
+            right[p] = k
+        else:
+            left[p] = k
+        while parent[k] >= 0 and priority[parent[k]] < priority[k]:
+            self.__rotate_up(k)
+
+    def remove(self, k: int) -> None:
+        left, right, parent, priority = self.__left, self.__right, self.__parent, self.__priority
+        # rotate segment down until it has at most one child
+        while left[k] >= 0 and right[k] >= 0:
+            self.__rotate_up(left[k] if priority[left[k]] > priority[right[k]] else right[k])
+        child = left[k] if left[k] >= 0 else right[k]
+        p = parent[k]
+        if child >= 0:
+            parent[child] = p
+        if p < 0:
+            self.__root = child
+        elif left[p] == k:
+            left[p] = child
+        else:
+            right[p] = child
+        parent[k] = ActiveSegments.absent
+
+    def first(self) -> int:
+        """
+        :return: number of the nearest segment, -1 if there are no segments
+        """
+        node, left = self.__root, self.__left
+        if node < 0:
+            return -1
+        while left[node] >= 0:
+            node = left[node]
+        return node
+
+    def next(self, k: int) -> int:
+        """
+        :return: number of the segment after segment k, -1 if k is the last one
+        """
+        left, right, parent = self.__left, self.__right, self.__parent
+        if right[k] >= 0:
+            node = right[k]
+            while left[node] >= 0:
+                node = left[node]
+            return node
+        while parent[k] >= 0 and right[parent[k]] == k:
+            k = parent[k]
+        return parent[k] if parent[k] >= 0 else -1
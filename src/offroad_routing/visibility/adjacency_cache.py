@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from offroad_routing.geometry.geom_types import PointData
+
+
+class AdjacencyCache:
+    """
+    Least recently used memo of visible vertices by vertex id.
+    Size is limited by the total number of stored edges, least recently used vertices are evicted first.
+    Stored lists are not pickled, unpickled cache is empty.
+    """
+
+    __slots__ = ("max_edges", "__entries", "__edges", "hits", "misses", "evictions")
+
+    def __init__(self, max_edges: int):
+        """
+        :param max_edges: maximum total size of stored adjacency lists
+        """
+        if max_edges < 1:
+            raise ValueError("max_edges should be positive")
+        self.max_edges = max_edges
+        self.__entries = OrderedDict()
+        self.__edges = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, vertex: int) -> bool:
+        return vertex in self.__entries
+
+    def get(self, vertex: int) -> Optional[List[PointData]]:
+        """
+        :return: stored visible vertices or None, hit makes vertex the most recently used
+        """
+        vertices = self.__entries.get(vertex)
+        if vertices is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(vertex)
+        return vertices
+
+    def put(self, vertex: int, vertices: List[PointData]) -> None:
+        """
+        Store visible vertices of vertex, lists larger than max_edges are not stored.
+        """
+        if len(vertices) > self.max_edges:
+            return
+        previous = self.__entries.pop(vertex, None)
+        if previous is not None:
+            self.__edges -= len(previous)
+        self.__entries[vertex] = vertices
+        self.__edges += len(vertices)
+        while self.__edges > self.max_edges:
+            _, evicted = self.__entries.popitem(last=False)
+            self.__edges -= len(evicted)
+            self.evictions += 1
+
+    def __getstate__(self):
+        return self.max_edges,
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__edges = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'number_of_vertices': len(self.__entries),
+            'number_of_edges': self.__edges
+        }
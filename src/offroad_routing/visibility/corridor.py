@@ -0,0 +1,90 @@
+from math import cos
+from math import pi
+from math import radians
+from math import sqrt
+from typing import FrozenSet
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from offroad_routing.geometry.algorithms import bounding_box
+from offroad_routing.geometry.algorithms import check_bbox_intersection
+from offroad_routing.geometry.algorithms import point_distance
+from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.geometry.polygon_arrays import PolygonArrays
+from shapely.geometry import LineString
+from shapely.geometry import MultiPoint
+from shapely.geometry import Point
+
+# km in one degree of latitude
+_degree_length = 6371 * pi / 180
+
+
+class Corridor:
+    """
+    Area within given distance of the straight line between start and goal, used to restrict on the fly search
+    to obstacles near the line (see AStar.find). Distances are measured in equirectangular projection
+    centered at the line, which is accurate for corridors of tens of kilometres.
+
+    Corridor is convex: a segment between two points inside it does not leave it, so visibility between such points
+    is the same for all obstacles and for obstacles intersecting the corridor. Search over these obstacles
+    finds the lowest cost route inside the corridor if its result does not leave it.
+    """
+
+    __slots__ = ("start", "goal", "width", "__x_scale", "__area", "__bbox")
+
+    def __init__(self, start: TPoint, goal: TPoint, width: float):
+        """
+        :param start: start point
+        :param goal: goal point
+        :param width: distance from the line in km
+        """
+        if width <= 0:
+            raise ValueError("Corridor width should be positive")
+        self.start, self.goal, self.width = start, goal, width
+        self.__x_scale = cos(radians((start[1] + goal[1]) / 2))
+        self.__area = LineString(self.__project((start, goal))).buffer(width)
+        # bounding box in degrees
+        min_x, min_y, max_x, max_y = self.__area.bounds
+        self.__bbox = (min_x / self.__x_scale / _degree_length, min_y / _degree_length,
+                       max_x / self.__x_scale / _degree_length, max_y / _degree_length)
+
+    def __project(self, points: Sequence[TPoint]):
+        return [(x * self.__x_scale * _degree_length, y * _degree_length) for x, y in points]
+
+    def contains(self, point: TPoint) -> bool:
+        # boundary points are inside
+        return self.__area.distance(Point(self.__project((point,))[0])) <= 1e-9
+
+    def intersects(self, points: Sequence[TPoint]) -> bool:
+        """
+        :param points: points of convex hull or segment
+        :return: True if convex hull of points intersects corridor
+        """
+        if not check_bbox_intersection(bounding_box(points), self.__bbox):
+            return False
+        return self.__area.intersects(MultiPoint(self.__project(points)).convex_hull)
+
+    def outside_distance(self) -> float:
+        """
+        :return: length in km of the shortest route from start to goal which leaves corridor,
+            lower bound of its cost as surface weights are not below 1
+        """
+        return 2 * sqrt((point_distance(self.start, self.goal) / 2) ** 2 + self.width ** 2)
+
+    def objects(self, vgraph) -> Optional[Tuple[FrozenSet[int], FrozenSet[int]]]:
+        """
+        :param VisibilityGraph vgraph: visibility graph with computed geometry
+        :return: numbers of polygons and road segments of vgraph intersecting corridor
+            (see VisibilityGraph.incident_vertices), None if all of them do
+        """
+        if isinstance(vgraph.polygons, PolygonArrays):
+            hulls = (convex_hull for convex_hull, _, _ in vgraph.polygons.hulls(range(len(vgraph.polygons))))
+        else:
+            hulls = (polygon["convex_hull"] for polygon in vgraph.polygons)
+        polygons = frozenset(i for i, hull in enumerate(hulls) if self.intersects(hull))
+        linestrings = frozenset(i for i, linestring in enumerate(vgraph.linestrings)
+                                if self.intersects(linestring["geometry"]))
+        if len(polygons) == len(vgraph.polygons) and len(linestrings) == len(vgraph.linestrings):
+            return None
+        return polygons, linestrings
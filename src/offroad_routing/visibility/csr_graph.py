@@ -0,0 +1,217 @@
+from array import array
+from typing import Tuple
+
+import numpy as np
+from networkx import MultiGraph
+from scipy.sparse import csr_matrix
+
+
+class CsrGraph:
+    """
+    Compact undirected weighted graph in compressed sparse row format.
+    Vertices are numbered from 0, neighbours of vertex v are indices[indptr[v]:indptr[v + 1]].
+    Every edge is stored in both directions, parallel edges are merged keeping the lowest weight.
+    """
+
+    __slots__ = ("x", "y", "indptr", "indices", "weights", "node_ids")
+
+    def __init__(self, x, y, indptr, indices, weights, node_ids=None):
+        """
+        :param np.ndarray x: longitude of each vertex
+        :param np.ndarray y: latitude of each vertex
+        :param np.ndarray indptr: start of each vertex adjacency in indices, size is number of vertices + 1
+        :param np.ndarray indices: neighbour vertices
+        :param np.ndarray weights: weight of each edge in indices
+        :param Optional[np.ndarray] node_ids: external id of each vertex (networkx node), vertex number if None
+        """
+        if not len(x) == len(y) == len(indptr) - 1:
+            raise ValueError("Coordinate and indptr sizes do not match")
+        if len(indices) != len(weights) or indptr[-1] != len(indices):
+            raise ValueError("Adjacency sizes do not match")
+        self.x = x
+        self.y = y
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.node_ids = node_ids
+
+    @classmethod
+    def from_edges(cls, node_ids, x, y, sources, targets, weights) -> "CsrGraph":
+        """
+        Build graph from vertex and edge lists, edges may be repeated and given in any direction.
+
+        :param Sequence[int] node_ids: external id of each vertex, may be repeated
+        :param Sequence[float] x: longitude of each vertex in node_ids
+        :param Sequence[float] y: latitude of each vertex in node_ids
+        :param Sequence[int] sources: external id of first vertex of each edge
+        :param Sequence[int] targets: external id of second vertex of each edge
+        :param Sequence[float] weights: weight of each edge
+        """
+        node_ids, first = np.unique(np.asarray(node_ids, dtype=np.int64), return_index=True)
+        x = np.asarray(x, dtype=np.float64)[first]
+        y = np.asarray(y, dtype=np.float64)[first]
+        size = len(node_ids)
+
+        sources = np.searchsorted(node_ids, np.asarray(sources, dtype=np.int64))
+        targets = np.searchsorted(node_ids, np.asarray(targets, dtype=np.int64))
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(sources) and (sources.max(initial=0) >= size or targets.max(initial=0) >= size):
+            raise ValueError("Edge vertex is not in node list")
+
+        # both directions without loops, the lowest weight of parallel edges comes first after sorting
+        loops = sources == targets
+        rows = np.concatenate((sources[~loops], targets[~loops]))
+        cols = np.concatenate((targets[~loops], sources[~loops]))
+        weights = np.concatenate((weights[~loops], weights[~loops]))
+        order = np.lexsort((weights, cols, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+        index_type = np.int32 if size < 2 ** 31 else np.int64
+        # vertex numbers are the ids themselves for dense ids (see VertexTable)
+        if size == 0 or node_ids[0] == 0 and node_ids[-1] == size - 1:
+            node_ids = None
+        return cls(x, y, indptr, cols.astype(index_type), weights, node_ids)
+
+    @classmethod
+    def from_networkx(cls, graph) -> "CsrGraph":
+        """
+        :param networkx.Graph graph: graph with x and y node attributes and weight edge attribute
+        """
+        nodes = list(graph.nodes(data=True))
+        edges = list(graph.edges(data='weight', default=1))
+        return cls.from_edges([node for node, _ in nodes], [data['x'] for _, data in nodes],
+                              [data['y'] for _, data in nodes], [edge[0] for edge in edges],
+                              [edge[1] for edge in edges], [edge[2] for edge in edges])
+
+    def to_networkx(self) -> MultiGraph:
+        """
+        Convert to networkx graph with the same node ids as the graph built by VisibilityGraph.
+
+        :return: graph with x and y node attributes and weight edge attribute
+        """
+        graph = MultiGraph(crs='EPSG:4326')
+        ids = self.ids.tolist()
+        graph.add_nodes_from((ids[v], {'x': x, 'y': y})
+                             for v, (x, y) in enumerate(zip(self.x.tolist(), self.y.tolist())))
+        rows = np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))
+        upper = rows < self.indices
+        graph.add_edges_from((ids[u], ids[v], {'weight': w}) for u, v, w in
+                             zip(rows[upper].tolist(), self.indices[upper].tolist(), self.weights[upper].tolist()))
+        return graph
+
+    def to_scipy(self) -> csr_matrix:
+        """
+        :return: adjacency matrix for scipy.sparse.csgraph routines
+        """
+        size = self.number_of_nodes()
+        # csgraph routines do not accept read-only buffers of memory-mapped graph
+        arrays = [a if a.flags.writeable else np.array(a) for a in (self.weights, self.indices, self.indptr)]
+        return csr_matrix(tuple(arrays), shape=(size, size))
+
+    @property
+    def ids(self) -> np.ndarray:
+        return np.arange(self.number_of_nodes()) if self.node_ids is None else self.node_ids
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def neighbours(self, vertex: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: neighbour vertices and weights of edges to them
+        """
+        start, end = self.indptr[vertex], self.indptr[vertex + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def vertices(self, node_ids) -> np.ndarray:
+        """
+        :param Sequence[int] node_ids: external ids of vertices
+        :return: vertex number of each id, -1 for ids missing in graph
+        """
+        node_ids, ids = np.asarray(node_ids, dtype=np.int64), self.ids
+        if len(ids) == 0:
+            return np.full(len(node_ids), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(ids, node_ids), len(ids) - 1)
+        return np.where(ids[positions] == node_ids, positions, -1)
+
+    def path_weight(self, path) -> float:
+        """
+        :param Sequence[int] path: vertices of path, consecutive vertices should be adjacent
+        :return: sum of weights of path edges
+        """
+        weight = 0.0
+        for a, b in zip(path, path[1:]):
+            neighbours, weights = self.neighbours(a)
+            weight += float(weights[neighbours == b].min())
+        return weight
+
+    def coordinates(self, vertex: int) -> Tuple[float, float]:
+        return float(self.x[vertex]), float(self.y[vertex])
+
+    def distances(self, point) -> np.ndarray:
+        """
+        Geodesic distance from point to every vertex, same formula as point_distance without rounding.
+
+        :param TPoint point: point (lon, lat)
+        :return: distance in km for each vertex
+        """
+        lon, lat = np.radians(point[0]), np.radians(point[1])
+        x, y = np.radians(self.x), np.radians(self.y)
+        a = np.sin((y - lat) / 2) ** 2 + np.cos(lat) * np.cos(y) * np.sin((x - lon) / 2) ** 2
+        return 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def nearest_vertex(self, point) -> int:
+        """
+        :param TPoint point: point (lon, lat)
+        :return: vertex with the lowest geodesic distance to point
+        """
+        if self.number_of_nodes() == 0:
+            raise ValueError("Graph has no vertices")
+        return int(np.argmin(self.distances(point)))
+
+    def nbytes(self) -> int:
+        """
+        :return: memory used by graph arrays in bytes
+        """
+        arrays = (self.x, self.y, self.indptr, self.indices, self.weights, self.node_ids)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+
+class CsrGraphBuilder:
+    """
+    Accumulates vertices and edges in flat arrays with networkx-like add_node and add_edge
+    and converts them to CsrGraph once.
+    """
+
+    __slots__ = ("__node_ids", "__x", "__y", "__sources", "__targets", "__weights")
+
+    def __init__(self):
+        self.__node_ids, self.__x, self.__y = array('q'), array('d'), array('d')
+        self.__sources, self.__targets, self.__weights = array('q'), array('q'), array('d')
+
+    def add_node(self, node: int, x: float, y: float) -> None:
+        self.__node_ids.append(node)
+        self.__x.append(x)
+        self.__y.append(y)
+
+    def add_edge(self, u: int, v: int, weight: float) -> None:
+        self.__sources.append(u)
+        self.__targets.append(v)
+        self.__weights.append(weight)
+
+    def number_of_edges(self) -> int:
+        """
+        :return: number of added edges, repeated edges are counted
+        """
+        return len(self.__weights)
+
+    def build(self) -> CsrGraph:
+        return CsrGraph.from_edges(self.__node_ids, self.__x, self.__y, self.__sources, self.__targets,
+                                   self.__weights)
@@ -0,0 +1,154 @@
+import sqlite3
+from os import getpid
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from offroad_routing.geometry.geom_types import PointData
+from offroad_routing.visibility.vertex_table import VertexTable
+
+# SQLite limits the number of query parameters, bulk reads are split into batches
+_batch_size = 500
+
+
+class DiskAdjacencyCache:
+    """
+    Persistent memo of visible vertices in SQLite file, keyed by geometry fingerprint and vertex id.
+    File is opened in write-ahead log mode: any number of processes can read and write it concurrently,
+    writers wait for each other up to timeout. Each visible vertex is stored as its id and edge weight.
+    File is opened on first use in each process: SQLite connection can not be used after fork,
+    so a process which inherited the cache opens the file again. Connection is not pickled.
+    """
+
+    __slots__ = ("filename", "fingerprint", "timeout", "__table", "__connection", "__pid", "hits", "misses")
+
+    def __init__(self, filename: str, fingerprint: str, vertex_table: VertexTable, timeout: float = 30):
+        """
+        :param filename: cache file, created on first use if it does not exist
+        :param fingerprint: fingerprint of geometry (see VisibilityGraph.fingerprint)
+        :param vertex_table: vertex ids of the same geometry
+        :param timeout: time in seconds to wait for other writers
+        """
+        self.filename = filename
+        self.fingerprint = fingerprint
+        self.timeout = timeout
+        self.__table = vertex_table
+        self.hits = self.misses = 0
+        self.__connection = self.__pid = None
+
+    def __database(self) -> sqlite3.Connection:
+        # connection of the current process, opened again if the cache was inherited by fork
+        if self.__connection is not None and self.__pid == getpid():
+            return self.__connection
+        connection = sqlite3.connect(self.filename, timeout=self.timeout, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS adjacency (fingerprint TEXT NOT NULL, "
+                           "vertex INTEGER NOT NULL, vertices BLOB NOT NULL, weights BLOB NOT NULL, "
+                           "PRIMARY KEY (fingerprint, vertex)) WITHOUT ROWID")
+        self.__connection, self.__pid = connection, getpid()
+        return connection
+
+    def reconnect(self) -> None:
+        """
+        Open the file again in the current process on next use, connection inherited by fork is dropped unused.
+        """
+        self.__connection = self.__pid = None
+
+    def __getstate__(self):
+        return self.filename, self.fingerprint, self.__table, self.timeout
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        # connection of another process is not closed, it is not safe to use it after fork
+        if self.__connection is not None and self.__pid == getpid():
+            self.__connection.close()
+        self.__connection = self.__pid = None
+
+    def __encode(self, vertices: List[PointData]) -> Tuple[bytes, bytes]:
+        ids = np.fromiter((self.__table.index(*vertex[1:4]) for vertex in vertices), dtype='<i8', count=len(vertices))
+        weights = np.fromiter((vertex[4] for vertex in vertices), dtype='<f8', count=len(vertices))
+        return ids.tobytes(), weights.tobytes()
+
+    def __decode(self, ids: bytes, weights: bytes) -> List[PointData]:
+        table = self.__table
+        return [(table.point(vertex),) + table.key(vertex) + (weight,) for vertex, weight in
+                zip(np.frombuffer(ids, dtype='<i8').tolist(), np.frombuffer(weights, dtype='<f8').tolist())]
+
+    def get(self, vertex: int) -> Optional[List[PointData]]:
+        """
+        :return: stored visible vertices or None
+        """
+        row = self.__database().execute("SELECT vertices, weights FROM adjacency WHERE fingerprint = ? AND vertex = ?",
+                                        (self.fingerprint, int(vertex))).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.__decode(*row)
+
+    def get_many(self, vertices: Iterable[int]) -> Dict[int, List[PointData]]:
+        """
+        Read stored visible vertices of several vertices at once.
+
+        :return: visible vertices of each stored vertex, missing vertices are skipped
+        """
+        vertices, result = [int(vertex) for vertex in vertices], dict()
+        for start in range(0, len(vertices), _batch_size):
+            batch = vertices[start:start + _batch_size]
+            rows = self.__database().execute(
+                "SELECT vertex, vertices, weights FROM adjacency WHERE fingerprint = ? AND vertex IN (%s)"
+                % ", ".join("?" * len(batch)), [self.fingerprint] + batch)
+            for vertex, ids, weights in rows:
+                result[vertex] = self.__decode(ids, weights)
+        self.hits += len(result)
+        self.misses += len(vertices) - len(result)
+        return result
+
+    def items(self) -> Iterator[Tuple[int, List[PointData]]]:
+        """
+        :return: all stored vertices with their visible vertices
+        """
+        rows = self.__database().execute("SELECT vertex, vertices, weights FROM adjacency WHERE fingerprint = ?",
+                                         (self.fingerprint,))
+        for vertex, ids, weights in rows:
+            yield vertex, self.__decode(ids, weights)
+
+    def put(self, vertex: int, vertices: List[PointData]) -> None:
+        self.put_many(((vertex, vertices),))
+
+    def put_many(self, items: Iterable[Tuple[int, List[PointData]]]) -> None:
+        """
+        Store visible vertices of several vertices in one transaction, stored ones are replaced.
+
+        :param items: pairs of vertex and its visible vertices
+        """
+        rows = [(self.fingerprint, int(vertex)) + self.__encode(vertices) for vertex, vertices in items]
+        connection = self.__database()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany("INSERT OR REPLACE INTO adjacency VALUES (?, ?, ?, ?)", rows)
+
+    def __len__(self) -> int:
+        return self.__database().execute("SELECT COUNT(*) FROM adjacency WHERE fingerprint = ?",
+                                         (self.fingerprint,)).fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'number_of_vertices': len(self)
+        }
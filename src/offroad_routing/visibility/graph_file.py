@@ -0,0 +1,77 @@
+"""
+Binary file of named arrays with JSON metadata, arrays can be memory-mapped.
+
+Layout: magic, format version and header size (little-endian uint32), JSON header,
+then data section aligned to 64 bytes with little-endian arrays, each aligned to 64 bytes.
+Header stores metadata and dtype, shape and offset (relative to data section) of every array.
+"""
+import json
+from struct import calcsize
+from struct import pack
+from struct import unpack
+from typing import Dict
+from typing import Tuple
+
+import numpy as np
+
+MAGIC = b"ORVGRAPH"
+VERSION = 1
+ALIGNMENT = 64
+_prefix = "<8sII"
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_arrays(filename: str, arrays: Dict[str, np.ndarray], meta: dict) -> None:
+    """
+    :param filename: file to be written
+    :param arrays: named arrays of fixed size types
+    :param meta: JSON serializable metadata
+    """
+    descriptions, offset = dict(), 0
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder('<'))
+              for name, array in arrays.items()}
+    for name, array in arrays.items():
+        descriptions[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"meta": meta, "arrays": descriptions}).encode()
+    data_start = _align(calcsize(_prefix) + len(header))
+
+    with open(filename, "wb") as f:
+        f.write(pack(_prefix, MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + descriptions[name]["offset"])
+            f.write(array.tobytes())
+
+
+def load_arrays(filename: str, mmap: bool = True) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    :param filename: file written by save_arrays
+    :param mmap: map arrays to memory read-only instead of reading them
+    :return: named arrays and metadata
+    """
+    with open(filename, "rb") as f:
+        prefix = f.read(calcsize(_prefix))
+        if len(prefix) != calcsize(_prefix):
+            raise ValueError("Not a graph file")
+        magic, version, header_size = unpack(_prefix, prefix)
+        if magic != MAGIC:
+            raise ValueError("Not a graph file")
+        if version != VERSION:
+            raise ValueError("Unsupported graph file version %d" % version)
+        header = json.loads(f.read(header_size).decode())
+        data_start = _align(calcsize(_prefix) + header_size)
+
+        arrays = dict()
+        for name, description in header["arrays"].items():
+            dtype, shape = np.dtype(description["dtype"]), tuple(description["shape"])
+            offset = data_start + description["offset"]
+            if mmap and np.prod(shape) > 0:
+                arrays[name] = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+            else:
+                f.seek(offset)
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    return arrays, header["meta"]
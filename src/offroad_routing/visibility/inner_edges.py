@@ -1,20 +1,51 @@
 from math import fabs
+from random import Random
 from typing import List
 from typing import Optional
 from typing import Sequence
 
-from numpy import arange
-from numpy.random import choice
 from offroad_routing.geometry.algorithms import compare_points
 from offroad_routing.geometry.geom_types import PointData
 from offroad_routing.geometry.geom_types import TPoint
 from offroad_routing.geometry.geom_types import TPolygon
 from shapely.geometry import LineString
 from shapely.geometry import Polygon
+from shapely.prepared import prep
+from shapely.prepared import PreparedGeometry
+
+
+class PreparedPolygons:
+    """
+    Prepared shapely outer polygons of polygon records for fast repeated containment tests.
+    Each one is built on first use, prepared geometries are not pickled and are built again after unpickling.
+    """
+
+    __slots__ = ("__polygons", "__prepared")
+
+    def __init__(self, polygons):
+        """
+        :param TPolygonData polygons: polygon records
+        """
+        self.__polygons = polygons
+        self.__prepared = dict()
+
+    def __getitem__(self, polygon_number: int) -> PreparedGeometry:
+        prepared = self.__prepared.get(polygon_number)
+        if prepared is None:
+            prepared = prep(Polygon(self.__polygons[polygon_number]["geometry"][0]))
+            self.__prepared[polygon_number] = prepared
+        return prepared
+
+    def __getstate__(self):
+        return self.__polygons,
+
+    def __setstate__(self, state):
+        self.__init__(*state)
 
 
 def find_inner_edges(point: TPoint, point_number: Optional[int], polygon: Sequence[TPolygon],
-                     polygon_number: int, inside_percent: float, weight: int) -> List[PointData]:
+                     polygon_number: int, inside_percent: float, weight: int,
+                     prepared: Optional[PreparedGeometry] = None, seed: int = 0) -> List[PointData]:
     """
     Finds segments from point to polygon vertices which are strictly inside polygon.
     If point is not a polygon vertex, finds all segments.
@@ -27,6 +58,8 @@ def find_inner_edges(point: TPoint, point_number: Optional[int], polygon: Sequen
     :param polygon_number: sequence number of polygon for PointData
     :param inside_percent: (from 0 to 1) - controls the number of inner polygon edges
     :param weight: surface weight for PointData
+    :param prepared: prepared outer polygon (see PreparedPolygons), built if None
+    :param seed: seed of edge sampling, sample depends only on seed, polygon and point
     :return: list of PointData tuples of each point forming an inner edge with point
     """
 
@@ -35,13 +68,18 @@ def find_inner_edges(point: TPoint, point_number: Optional[int], polygon: Sequen
     assert polygon_size >= 2
     assert compare_points(polygon[0][0], polygon[0][-1])
 
+    if prepared is None:
+        prepared = prep(Polygon(polygon[0]))
+    # hash of a tuple of numbers does not change between runs and processes
+    sample = Random(hash((seed, polygon_number, point if point_number is None else point_number))).random
+
     edges_inside = list()
 
     # point is strictly in polygon
     if point_number is None:
         for i in range(polygon_size):
-            if Polygon(polygon[0]).contains(LineString([point, polygon[0][i]])):
-                if inside_percent == 1 or choice(arange(0, 2), p=[1 - inside_percent, inside_percent]) == 1:
+            if prepared.contains(LineString([point, polygon[0][i]])):
+                if inside_percent == 1 or sample() < inside_percent:
                     edges_inside.append((polygon[0][i], polygon_number, i, True, weight))
         return edges_inside
 
@@ -51,8 +89,8 @@ def find_inner_edges(point: TPoint, point_number: Optional[int], polygon: Sequen
         if fabs(i - point_number) in [1, polygon_size - 1]:
             edges_inside.append((polygon[0][i], polygon_number, i, True, weight))
             continue
-        if Polygon(polygon[0]).contains(LineString([point, polygon[0][i]])):
-            if inside_percent == 1 or choice(arange(0, 2), p=[1 - inside_percent, inside_percent]) == 1:
+        if prepared.contains(LineString([point, polygon[0][i]])):
+            if inside_percent == 1 or sample() < inside_percent:
                 edges_inside.append((polygon[0][i], polygon_number, i, True, weight))
 
     return edges_inside
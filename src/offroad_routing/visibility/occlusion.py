@@ -0,0 +1,109 @@
+from math import ceil
+from math import fabs
+from math import floor
+from math import hypot
+from math import inf
+from math import pi
+
+import numpy as np
+from offroad_routing.geometry.algorithms import polar_angle
+from offroad_routing.geometry.algorithms import turn
+from offroad_routing.geometry.geom_types import TBBox
+from offroad_routing.geometry.geom_types import TPoint
+
+
+class OcclusionMap:
+    """
+    Conservative map of areas hidden from a point, used to skip obstacles before computing their supporting pairs
+    (see VisibilityGraph.incident_vertices). Directions from the point are divided into equal sectors,
+    each sector stores a distance beyond which everything inside it is hidden by a segment already found.
+
+    An object hidden in all its sectors has no visible vertices and hides only what the nearer segments hide,
+    so it can be skipped. Objects are processed from the nearest, so that their segments hide farther ones.
+    """
+
+    __slots__ = ("point", "__depth", "__sector_angle")
+
+    def __init__(self, point: TPoint, sectors: int = 1024):
+        """
+        :param point: visibility point (x, y)
+        :param sectors: number of sectors
+        """
+        self.point = point
+        self.__depth = np.full(sectors, inf)
+        self.__sector_angle = 2 * pi / sectors
+
+    def __span(self, a: TPoint, b: TPoint):
+        """
+        :return: start and end angle in sectors of the sector with sides through a and b smaller than pi
+        """
+        start, end = polar_angle(self.point, a), polar_angle(self.point, b)
+        if (end - start) % (2 * pi) > pi:
+            start, end = end, start
+        start /= self.__sector_angle
+        return start, start + (end / self.__sector_angle - start) % len(self.__depth)
+
+    def __hide_span(self, start: float, end: float, distance: float) -> None:
+        # only sectors strictly inside the span are hidden
+        first, last = floor(start) + 1, ceil(end) - 1
+        sectors = len(self.__depth)
+        # the part after full turn wraps to the first sectors
+        for low, high in ((first, min(last, sectors)), (max(first - sectors, 0), last - sectors)):
+            if low < high:
+                self.__depth[low:high] = np.minimum(self.__depth[low:high], distance)
+
+    def hide_segment(self, a: TPoint, b: TPoint) -> None:
+        """
+        Hide the area behind segment ab, segments passing near the point are skipped:
+        crossings of rays from the point with them depend on rounding.
+        """
+        distance = max(hypot(a[0] - self.point[0], a[1] - self.point[1]),
+                       hypot(b[0] - self.point[0], b[1] - self.point[1]))
+        if fabs(turn(a, b, self.point)) <= 1e-6 * distance * hypot(b[0] - a[0], b[1] - a[1]):
+            return
+        self.__hide_span(*self.__span(a, b), distance)
+
+    def hide_angle(self, lt: TPoint, rt: TPoint, inside: bool) -> None:
+        """
+        Hide all directions inside (or outside) the sector smaller than pi with sides through lt and rt,
+        used for directions where vertices are not returned (see SegmentVisibility.set_restriction_angle).
+        """
+        start, end = self.__span(lt, rt)
+        # sides are collinear, the sector is not defined
+        if end - start == 0 or end - start > len(self.__depth) / 2 * (1 - 1e-9):
+            return
+        if inside:
+            self.__hide_span(start, end, 0)
+        else:
+            self.__hide_span(end, start + len(self.__depth), 0)
+
+    def distance(self, bbox: TBBox) -> float:
+        """
+        :param bbox: bounding box of object in format (min_x, min_y, max_x, max_y)
+        :return: distance from the point to bounding box
+        """
+        x, y = self.point
+        return hypot(max(bbox[0] - x, 0, x - bbox[2]), max(bbox[1] - y, 0, y - bbox[3]))
+
+    def hidden(self, bbox: TBBox) -> bool:
+        """
+        :param bbox: bounding box of object in format (min_x, min_y, max_x, max_y)
+        :return: True if the whole bounding box is hidden
+        """
+        distance = self.distance(bbox)
+        if distance == 0:
+            return False
+        min_x, min_y, max_x, max_y = bbox
+
+        # bounding box is seen at angle smaller than pi, its corners bound it
+        center = polar_angle(self.point, ((min_x + max_x) / 2, (min_y + max_y) / 2))
+        shifts = [(polar_angle(self.point, corner) - center + pi) % (2 * pi) - pi
+                  for corner in ((min_x, min_y), (min_x, max_y), (max_x, min_y), (max_x, max_y))]
+        sectors = len(self.__depth)
+        first = floor((center + min(shifts)) / self.__sector_angle) % sectors
+        last = floor((center + max(shifts)) / self.__sector_angle) % sectors
+        if first <= last:
+            depth = self.__depth[first:last + 1].max()
+        else:
+            depth = max(self.__depth[first:].max(), self.__depth[:last + 1].max())
+        return depth * (1 + 1e-9) < distance
@@ -1,24 +1,42 @@
-from collections import OrderedDict
+from functools import partial
+from math import fabs
+from math import inf
+from math import sqrt
 from typing import List
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
 
-from offroad_routing.geometry.algorithms import check_ray_segment_intersection
+from numpy import abs as np_abs
+from numpy import argsort
+from numpy import array
+from numpy import flatnonzero
+from numpy import maximum
+from numpy.linalg import norm
+from offroad_routing.geometry.algorithms import check_ray_segment_intersections
 from offroad_routing.geometry.algorithms import check_segment_intersection
+from offroad_routing.geometry.algorithms import compare_points
 from offroad_routing.geometry.algorithms import point_in_angle
-from offroad_routing.geometry.algorithms import polar_angle
+from offroad_routing.geometry.algorithms import points_in_angle
+from offroad_routing.geometry.algorithms import polar_angles
+from offroad_routing.geometry.algorithms import segment_crossings
 from offroad_routing.geometry.algorithms import turn
+from offroad_routing.geometry.algorithms import turns
 from offroad_routing.geometry.geom_types import PointData
 from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.visibility.active_segments import ActiveSegments
 
 
 class SegmentVisibility:
 
     __slots__ = ("__segments", "__restriction_pair",
-                 "__restriction_point", "__reverse_angle")
+                 "__restriction_point", "__reverse_angle", "__vertex_table")
 
-    def __init__(self):
+    def __init__(self, vertex_table=None):
+        """
+        :param Optional[VertexTable] vertex_table: ids of object vertices, used to identify visible vertices
+        """
+        self.__vertex_table = vertex_table
         self.__segments = list()
         self.__restriction_pair = None
         self.__restriction_point = None
@@ -79,49 +97,162 @@ class SegmentVisibility:
         self.__segments.clear()
         return visible_edges
 
+    @staticmethod
+    def __ray_distance(point: TPoint, direction: TPoint, segment: Sequence[float]) -> float:
+        """
+        Distance from point to segment (ax, ay, bx, by) along the ray in units of direction vector length,
+        infinite if direction is point itself: nothing hides it.
+        """
+        ax, ay, bx, by = segment
+        px, py = point
+        dx, dy = direction[0] - px, direction[1] - py
+        sx, sy = bx - ax, by - ay
+        denominator = dx * sy - dy * sx
+        length = dx * dx + dy * dy
+        if length == 0:
+            return inf
+        # ray and segment are parallel relative to their lengths
+        if fabs(denominator) <= 1e-12 * sqrt(length * (sx * sx + sy * sy)):
+            return min((ax - px) * dx + (ay - py) * dy, (bx - px) * dx + (by - py) * dy) / length
+        return ((ax - px) * sy - (ay - py) * sx) / denominator
+
+    @staticmethod
+    def __split_crossings(point: TPoint, segments: List[Tuple[PointData, PointData]]) \
+            -> Tuple[List[Tuple[PointData, PointData]], List[bool]]:
+        """
+        Split segments (roads and polygons) at points inside both of them where they cross each other.
+        Crossing points are not vertices, object number of their PointData is None.
+        Segments on lines through point are not split: the nearest point of such a segment along the ray is point
+        itself, they are returned with True flags.
+        """
+        ends = array([(a[0], b[0]) for a, b in segments], dtype=float)
+        # distance from point to segment line is small relative to the distance to the segment
+        distances = maximum(norm(ends[:, 0] - point, axis=1), norm(ends[:, 1] - point, axis=1))
+        lengths = norm(ends[:, 1] - ends[:, 0], axis=1)
+        through = np_abs(turns(point, ends[:, 0], ends[:, 1])) <= 1e-9 * distances * lengths
+        first, second, first_positions, second_positions = segment_crossings(ends[:, 0], ends[:, 1])
+        # segments touching at their ends keep the order
+        split = ~(through[first] | through[second]) & (first_positions > 1e-9) & (first_positions < 1 - 1e-9) & \
+            (second_positions > 1e-9) & (second_positions < 1 - 1e-9)
+        first, second = first[split], second[split]
+        first_positions, second_positions = first_positions[split], second_positions[split]
+        through = through.tolist()
+        if len(first) == 0:
+            return segments, through
+        cuts = dict()
+        for k, position in zip(first.tolist() + second.tolist(), first_positions.tolist() + second_positions.tolist()):
+            cuts.setdefault(k, list()).append(position)
+        pieces, pieces_through = list(), list()
+        for k, (a, b) in enumerate(segments):
+            previous = a
+            (ax, ay), (bx, by) = a[0], b[0]
+            for position in sorted(cuts.get(k, ())):
+                crossing = ((ax + (bx - ax) * position, ay + (by - ay) * position), None, None, None, None)
+                pieces.append((previous, crossing))
+                pieces_through.append(False)
+                previous = crossing
+            pieces.append((previous, b))
+            pieces_through.append(through[k])
+        return pieces, pieces_through
+
     def get_edges_sweepline(self, point: TPoint) -> List[PointData]:
-        # list of points sorted by angle
-        points = list()
-        for edge in self.__segments:
-            # keep info about pair and PointData
-            points.append((edge[0], edge[1]))
-            # keep info about pair and PointData
-            points.append((edge[1], edge[0]))
-        points.sort(key=lambda x: polar_angle(point, x[0][0]))
-
-        # list of segments intersected by 0-angle ray
-        intersected = OrderedDict()
-        for edge in self.__segments:
-            if check_ray_segment_intersection(point, (point[0] + 1, point[1]), edge[0][0], edge[1][0], True):
-                index1 = str((edge[0][1], edge[0][2], edge[0][3] | 0))
-                index2 = str((edge[1][1], edge[1][2], edge[1][3] | 0))
-                intersected[index1 + index2] = (edge[0][0], edge[1][0])
-        self.__segments.clear()
+        """
+        Rotate ray around point and keep segments intersected by it ordered by distance (see ActiveSegments),
+        each vertex is compared only with segments before it, usually with the nearest one.
+        Segments are split at crossings first, so that their order does not change while they are intersected.
+        Takes O((n + k) log n) time for n segments with k crossings.
+        """
+        segments = self.__segments
+        self.__segments = list()
+        if len(segments) == 0:
+            return list()
+        segments, through = SegmentVisibility.__split_crossings(point, segments)
+
+        # event 2k is point a of segment k = (a, b) with other point b, event 2k + 1 is point b with other point a
+        ends = array([(a[0], b[0]) for a, b in segments], dtype=float)
+        starts, others = ends.reshape(-1, 2), ends[:, ::-1].reshape(-1, 2)
+        order = argsort(polar_angles(point, starts), kind='stable').tolist()
+        coordinates = ends.reshape(-1, 4).tolist()
+        increasing = (turns(point, starts, others) > 0).tolist()
+        if self.__restriction_pair is None:
+            allowed = None
+        else:
+            l_point, r_point = self.__restriction_pair
+            allowed = (points_in_angle(starts, l_point, self.__restriction_point, r_point)
+                       != self.__reverse_angle).tolist()
+
+        # segments intersected by current ray
+        ray = (point[0] + 1, point[1])
+        initial = flatnonzero(check_ray_segment_intersections(point, ray, ends[:, 0], ends[:, 1], True)).tolist()
+        initial.sort(key=lambda k: (not through[k], SegmentVisibility.__ray_distance(point, ray, coordinates[k])))
+        active = ActiveSegments(len(segments))
+        for k in initial:
+            active.insert(k, lambda j: True)
+
+        if self.__vertex_table is None:
+            def key(vertex):
+                return vertex[1], vertex[2], vertex[3]
+        else:
+            def key(vertex, index=self.__vertex_table.index):
+                return index(vertex[1], vertex[2], vertex[3])
 
         visible_edges = dict()
-        for p in points:
-            # check if any of the segments in intersected list crosses current segment
-            for segment in reversed(intersected.values()):
-                if check_segment_intersection(point, p[0][0], segment[0], segment[1]):
-                    break
-            else:
-                if self.__restriction_pair is None:
-                    visible_edges[str(p[0][1]) + str(p[0][2]) + str(p[0][3] | 0)] = p[0]
-                else:
-                    l_point, r_point = self.__restriction_pair
-                    if point_in_angle(p[0][0], l_point, self.__restriction_point, r_point) != self.__reverse_angle:
-                        visible_edges[str(p[0][1]) + str(p[0][2]) + str(p[0][3] | 0)] = p[0]
-
-            # update intersected list
-            index1 = str((p[0][1], p[0][2], p[0][3] | 0))
-            index2 = str((p[1][1], p[1][2], p[1][3] | 0))
-            if turn(point, p[0][0], p[1][0]) > 0:
-                intersected[index1 + index2] = (p[0][0], p[1][0])
-            else:
-                intersected.pop(index1 + index2, None)
+        for event in order:
+            k = event >> 1
+            p = segments[k][event & 1]
+            p_point = p[0]
+
+            if p[1] is not None and (allowed is None or allowed[event]):
+                # segments do not cross, so a segment further than p cannot be followed by a nearer one;
+                # nearer segments touching the ray at their ends do not hide p,
+                # segments on lines through point go first out of the order and are only checked for intersection
+                j = active.first()
+                while j >= 0:
+                    if not through[j] and SegmentVisibility.__ray_distance(point, p_point, coordinates[j]) >= 1:
+                        j = -1
+                    elif check_segment_intersection(point, p_point, segments[j][0][0], segments[j][1][0]):
+                        break
+                    else:
+                        j = active.next(j)
+                if j < 0:
+                    visible_edges[key(p)] = p
+
+            # update active segments
+            if increasing[event]:
+                if k not in active:
+                    other = segments[k][~event & 1][0]
+                    # segment through point is the nearest one
+                    active.insert(k, SegmentVisibility.__first if through[k] else partial(
+                        SegmentVisibility.__before, point, p_point, other, turn(p_point, other, point), coordinates,
+                        increasing, through))
+            elif k in active:
+                active.remove(k)
 
         return list(visible_edges.values())
 
+    @staticmethod
+    def __first(j: int) -> bool:
+        return False
+
+    @staticmethod
+    def __before(point: TPoint, start: TPoint, other: TPoint, side: float, coordinates: List[List[float]],
+                 increasing: List[bool], through: List[bool], j: int) -> bool:
+        """
+        Check if active segment j is nearer to point than segment (start, other) which starts at ray direction start,
+        side is turn(start, other, point). Segments on lines through point are always nearer.
+        """
+        if through[j]:
+            return True
+        segment = coordinates[j]
+        distance = SegmentVisibility.__ray_distance(point, start, segment)
+        if fabs(distance - 1) > 1e-9:
+            return distance < 1
+        # segments meet at start: segment j ends there or the one nearer after start goes first
+        end = segment[2:] if increasing[2 * j] else segment[:2]
+        if compare_points(start, end):
+            return True
+        return side * turn(start, other, end) > 0
+
     """
     Angle approximation O(n) algorithm
     - only parameter is view_angle=1, it shows the calculation error
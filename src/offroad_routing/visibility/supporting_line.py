@@ -1,17 +1,26 @@
+from bisect import bisect_right
+from math import tau
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 
+from numpy import array
+from numpy import asarray
+from numpy import isin
 from offroad_routing.geometry.algorithms import check_ray_segment_intersection
+from offroad_routing.geometry.algorithms import check_ray_segment_intersections
 from offroad_routing.geometry.algorithms import compare_points
+from offroad_routing.geometry.algorithms import polar_angle
 from offroad_routing.geometry.algorithms import turn
+from offroad_routing.geometry.algorithms import turns
 from offroad_routing.geometry.geom_types import TPoint
 from offroad_routing.geometry.geom_types import TPolygon
 
 
-def find_supporting_pair_brute(point, polygon, polygon_size, point_number):
+def _find_supporting_pair_loop(point, polygon, polygon_size, point_number, vertices, sides):
     result = list()
-    for i in range(polygon_size):
+    for i in vertices:
         pi = polygon[i]
         if point_number is not None and i == point_number:
             continue
@@ -19,27 +28,154 @@ def find_supporting_pair_brute(point, polygon, polygon_size, point_number):
             continue
 
         # check intersection with all other points
-        for j in range(polygon_size):
-            if j in (i - 1, i) or (point_number is not None and j in (point_number - 1, point_number)):
+        for j in sides:
+            if j in ((i - 1) % polygon_size, i) or \
+                    (point_number is not None and j in ((point_number - 1) % polygon_size, point_number)):
                 continue
             if check_ray_segment_intersection(point, pi, polygon[j], polygon[j + 1]):
                 break
         else:
             result.append(i)
 
+    return result
+
+
+def _find_supporting_pair_vectorized(point, polygon, polygon_size, point_number, vertices, sides):
+    points = array(polygon, dtype=float)
+    vertices, sides = asarray(vertices), asarray(sides)
+    starts, ends = points[sides], points[sides + 1]
+    candidate_points = points[vertices]
+    previous, following = points[(vertices - 1) % polygon_size], points[vertices + 1]
+
+    # vertices with both neighbours on one side of the ray from point, each checked against all sides at once
+    candidates = vertices[turns(point, candidate_points, previous) * turns(point, candidate_points, following) >= 0]
+    skipped = ((point_number - 1) % polygon_size, point_number) if point_number is not None else ()
+    result = list()
+    for i in candidates.tolist():
+        if i == point_number:
+            continue
+        intersections = check_ray_segment_intersections(point, points[i], starts, ends)
+        intersections[isin(sides, ((i - 1) % polygon_size, i) + skipped)] = False
+        if not intersections.any():
+            result.append(i)
+
+    return result
+
+
+# number of sides from which numpy calls are cheaper than python loops
+VECTORIZED_SIZE = 100
+
+
+def find_supporting_pair_brute(point, polygon, polygon_size, point_number, vertices=None, sides=None):
+    """
+    Find supporting points checking each vertex against each side.
+
+    :param vertices: numbers of vertices which may be supporting, all if None
+    :param sides: numbers of sides (polygon[j], polygon[j + 1]) which may block rays from point, all if None
+    :return: pair of supporting point numbers in increasing order or None if unable to find
+    """
+    if vertices is None:
+        vertices = range(polygon_size)
+    if sides is None:
+        sides = range(polygon_size)
+    if len(sides) >= VECTORIZED_SIZE:
+        result = _find_supporting_pair_vectorized(point, polygon, polygon_size, point_number, vertices, sides)
+    else:
+        result = _find_supporting_pair_loop(point, polygon, polygon_size, point_number, vertices, sides)
     if len(result) != 2:
         return None
-    point1, point2 = result
+    point1, point2 = sorted(result)
     return point1, point2
 
 
-def find_restriction_pair(point: TPoint, polygon: TPolygon, point_number: int) -> Optional[Tuple[TPoint, TPoint]]:
+# Pockets. Vertices of convex hull appear on polygon in the same cyclic order as on the hull, so polygon vertices
+# between two consecutive hull vertices (by number) form a chain, and the chain with the hull side joining
+# its ends bounds a pocket (if the chain has inner vertices). A ray from a point of a pocket which does not cross
+# the chain leaves the pocket through the hull side and does not cross polygon afterwards. So supporting points
+# of a point in a pocket are on its chain and only sides of the chain have to be checked.
+
+
+# polygon size from which searching in a pocket is faster than checking the whole polygon
+POCKET_SIZE = 16
+
+
+def _chain(polygon_size: int, first: int, last: int) -> List[int]:
+    return [i % polygon_size for i in range(first, first + (last - first) % polygon_size + 1)]
+
+
+def _hull_neighbours(polygon_size: int, convex_hull_points: Sequence[int], point_number: int) -> Tuple[int, int]:
+    """
+    Hull vertices (by number) preceding and following point_number on polygon.
     """
-        Find pair of supporting points from point (part of polygon) to polygon in squared time.
+    hull = sorted(convex_hull_points)
+    position = bisect_right(hull, point_number)
+    return hull[position - 1], hull[position % len(hull)]
+
+
+def _point_in_chain(point: TPoint, polygon: TPolygon, chain: List[int]) -> bool:
+    """
+    Even-odd test of point against polygon formed by chain and the side joining its ends.
+    """
+    x, y = point
+    inside = False
+    for k in range(len(chain)):
+        (ax, ay), (bx, by) = polygon[chain[k - 1]], polygon[chain[k]]
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside
+
+
+def _is_counterclockwise(convex_hull_points: Sequence[int]) -> bool:
+    # hull is counter-clockwise, so is polygon if its vertex numbers increase along the hull
+    size = len(convex_hull_points)
+    return sum(convex_hull_points[(k + 1) % size] > convex_hull_points[k] for k in range(size)) > 1
+
+
+def _faces_outside(polygon: TPolygon, polygon_size: int, vertex: int, angle: float, counterclockwise: bool) -> bool:
+    """
+    Check if direction with given polar angle from polygon vertex goes outside polygon (or along its side).
+    """
+    point = polygon[vertex]
+    a = polar_angle(point, polygon[(vertex - 1) % polygon_size])
+    b = polar_angle(point, polygon[vertex + 1])
+    if not counterclockwise:
+        a, b = b, a
+    # outside is the angle from previous to next vertex counter-clockwise for counter-clockwise polygon
+    return (angle - a) % tau <= (b - a) % tau
+
+
+def _pocket_candidates(point: TPoint, polygon: TPolygon, polygon_size: int, point_number: Optional[int],
+                       chain: List[int], counterclockwise: bool) -> List[int]:
+    """
+    Vertices of chain such that ray from point through them leaves point (if it is a vertex)
+    and continues after them outside polygon. Ray going inside polygon crosses its sides later,
+    and these sides may not belong to chain.
+    """
+    candidates = list()
+    for i in chain:
+        if i == point_number:
+            continue
+        angle = polar_angle(point, polygon[i])
+        if point_number is not None and not _faces_outside(polygon, polygon_size, point_number, angle,
+                                                           counterclockwise):
+            continue
+        if _faces_outside(polygon, polygon_size, i, angle, counterclockwise):
+            candidates.append(i)
+    return candidates
+
+
+def find_restriction_pair(point: TPoint, polygon: TPolygon, point_number: int,
+                          convex_hull_points: Optional[Sequence[int]] = None) -> Optional[Tuple[TPoint, TPoint]]:
+    """
+        Find pair of supporting points from point (part of polygon) to polygon.
+        If convex hull is given, only the chain of the pocket containing point is processed,
+        which takes squared time of chain size, otherwise squared time of polygon size.
 
         :param point: visibility point (x, y)
         :param polygon: convex, given counter-clockwise, first and last points must be equal
         :param point_number: sequence number of point in polygon
+        :param convex_hull_points: numbers of convex hull vertices in polygon (counter-clockwise),
+            point should not be one of them
         :return: pair of supporting points or None if unable to find
     """
 
@@ -47,19 +183,31 @@ def find_restriction_pair(point: TPoint, polygon: TPolygon, point_number: int) -
     assert polygon_size >= 2
     assert compare_points(polygon[0], polygon[-1])
 
-    supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, point_number)
+    if convex_hull_points is None or len(convex_hull_points) < 3 or polygon_size < POCKET_SIZE:
+        supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, point_number)
+    else:
+        assert point_number not in convex_hull_points
+        chain = _chain(polygon_size, *_hull_neighbours(polygon_size, convex_hull_points, point_number))
+        vertices = _pocket_candidates(point, polygon, polygon_size, point_number, chain,
+                                      _is_counterclockwise(convex_hull_points))
+        supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, point_number, vertices, chain[:-1])
     if supporting_pair is None:
         return None
     point1, point2 = supporting_pair
     return polygon[point1], polygon[point2]
 
 
-def find_supporting_line(point: TPoint, polygon: TPolygon) -> Optional[List[int]]:
+def find_supporting_line(point: TPoint, polygon: TPolygon,
+                         convex_hull_points: Optional[Sequence[int]] = None) -> Optional[List[int]]:
     """
-        Find pair of supporting points from point (not a part of polygon) to polygon in squared time.
+        Find pair of supporting points from point (not a part of polygon) to polygon.
+        If convex hull is given, point should be inside it, then only the chain of the pocket containing point
+        is processed, which takes linear time of polygon size and squared time of chain size.
+        Otherwise takes squared time of polygon size.
 
         :param point: visibility point (x, y)
         :param polygon: convex, given counter-clockwise, first and last points must be equal
+        :param convex_hull_points: numbers of convex hull vertices in polygon (counter-clockwise)
         :return: list of indices of supporting points or None if unable to find
     """
 
@@ -71,11 +219,31 @@ def find_supporting_line(point: TPoint, polygon: TPolygon) -> Optional[List[int]
         if compare_points(point, pi):
             return [i]
 
-    supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, None)
-    if supporting_pair is None:
-        return None
-    point1, point2 = supporting_pair
+    if convex_hull_points is None or len(convex_hull_points) < 3 or polygon_size < POCKET_SIZE:
+        supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, None)
+        if supporting_pair is None:
+            return None
+        return _shorter_line(polygon_size, *supporting_pair)
+
+    hull = sorted(convex_hull_points)
+    for first, last in zip(hull, hull[1:] + hull[:1]):
+        chain = _chain(polygon_size, first, last)
+        if len(chain) < 3 or not _point_in_chain(point, polygon, chain):
+            continue
+        vertices = _pocket_candidates(point, polygon, polygon_size, None, chain,
+                                      _is_counterclockwise(convex_hull_points))
+        supporting_pair = find_supporting_pair_brute(point, polygon, polygon_size, None, vertices, chain[:-1])
+        if supporting_pair is None:
+            return None
+        # part of chain between supporting points
+        point1, point2 = sorted(supporting_pair, key=lambda i: (i - first) % polygon_size)
+        return _chain(polygon_size, point1, point2)
+
+    # point is inside polygon
+    return None
+
 
+def _shorter_line(polygon_size: int, point1: int, point2: int) -> List[int]:
     line = list()
     if point2 - point1 > (polygon_size - 1) / 2:
         for i in range(point2, polygon_size):
@@ -0,0 +1,76 @@
+from typing import Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS = 6371
+
+
+def _unit_vectors(x, y) -> np.ndarray:
+    lon, lat = np.radians(np.asarray(x, dtype=np.float64)), np.radians(np.asarray(y, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+class VertexSnapper:
+    """
+    KD-tree over graph vertices for nearest vertex queries.
+    Vertices are indexed as unit vectors on the sphere: straight line distance between them grows
+    with geodesic distance, so the nearest vertices are the same as by point_distance.
+    """
+
+    __slots__ = ("ids", "__tree")
+
+    def __init__(self, ids, x, y):
+        """
+        :param np.ndarray ids: graph node id of each vertex
+        :param np.ndarray x: longitude of each vertex
+        :param np.ndarray y: latitude of each vertex
+        """
+        if not len(ids) == len(x) == len(y):
+            raise ValueError("Vertex array sizes do not match")
+        self.ids = np.asarray(ids)
+        self.__tree = cKDTree(_unit_vectors(x, y).reshape(-1, 3))
+
+    @classmethod
+    def from_csr(cls, graph) -> "VertexSnapper":
+        """
+        :param CsrGraph graph: compact graph, vertex numbers are positions in ids
+        """
+        return cls(graph.ids, graph.x, graph.y)
+
+    @classmethod
+    def from_networkx(cls, graph) -> "VertexSnapper":
+        """
+        :param networkx.Graph graph: graph with x and y node attributes
+        """
+        nodes = list(graph.nodes(data=True))
+        return cls(np.array([node for node, _ in nodes], dtype=np.int64), [data['x'] for _, data in nodes],
+                   [data['y'] for _, data in nodes])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nearest_many(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param Sequence[TPoint] points: points (lon, lat)
+        :param k: number of nearest vertices for each point
+        :return: distances in km and positions of vertices (in ids) of shape (len(points), k),
+            sorted by distance, missing vertices (if k is larger than graph) have inf distance and position len(ids)
+        """
+        if len(self) == 0:
+            raise ValueError("Graph has no vertices")
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        chords, positions = self.__tree.query(_unit_vectors(points[:, 0], points[:, 1]), k=k)
+        chords, positions = np.asarray(chords).reshape(len(points), k), np.asarray(positions).reshape(len(points), k)
+        distances = 2 * EARTH_RADIUS * np.arcsin(np.minimum(chords / 2, 1))
+        return distances, positions
+
+    def nearest(self, point, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param TPoint point: point (lon, lat)
+        :param k: number of nearest vertices
+        :return: distances in km and positions of k nearest vertices (in ids) sorted by distance
+        """
+        distances, positions = self.nearest_many((point,), k)
+        return distances[0], positions[0]
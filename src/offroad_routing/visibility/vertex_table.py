@@ -0,0 +1,92 @@
+from bisect import bisect_right
+from typing import Iterator
+from typing import Tuple
+
+import numpy as np
+from offroad_routing.geometry.geom_types import PointData
+from offroad_routing.geometry.geom_types import TPoint
+from offroad_routing.geometry.polygon_arrays import PolygonArrays
+
+
+class VertexTable:
+    """
+    Dense numbering of all vertices of polygon and road segment records.
+    Vertices of polygon i (without closing point) get contiguous ids starting from polygon_offsets[i],
+    polygons are followed by road segments, two vertices each.
+    A road point shared by several segments (road junction) has one id, the id of its first occurrence:
+    ids of its other occurrences are not used.
+    """
+
+    __slots__ = ("x", "y", "polygon_offsets", "road_offset", "road_ids")
+
+    def __init__(self, polygons, linestrings):
+        """
+        :param Union[TPolygonData, PolygonArrays] polygons: polygon records
+        :param TSegmentData linestrings: road segment records
+        """
+        offsets = [0]
+        if isinstance(polygons, PolygonArrays):
+            for i in range(len(polygons)):
+                offsets.append(offsets[-1] + polygons.outer_size(i))
+        else:
+            for polygon in polygons:
+                offsets.append(offsets[-1] + len(polygon["geometry"][0]) - 1)
+        self.polygon_offsets = offsets
+        self.road_offset = offsets[-1]
+
+        size = self.road_offset + 2 * len(linestrings)
+        self.x, self.y = np.empty(size), np.empty(size)
+        if isinstance(polygons, PolygonArrays):
+            self.x[:self.road_offset], self.y[:self.road_offset] = polygons.outer_vertices().T
+        else:
+            for i, polygon in enumerate(polygons):
+                points = polygon["geometry"][0][:-1]
+                if len(points) > 0:
+                    self.x[offsets[i]:offsets[i + 1]], self.y[offsets[i]:offsets[i + 1]] = zip(*points)
+        for i, linestring in enumerate(linestrings):
+            (self.x[self.road_offset + 2 * i], self.y[self.road_offset + 2 * i]), \
+                (self.x[self.road_offset + 2 * i + 1], self.y[self.road_offset + 2 * i + 1]) = linestring["geometry"]
+
+        # id of each road segment vertex, equal for equal points
+        first = dict()
+        self.road_ids = [first.setdefault(point, vertex) for vertex, point in
+                         enumerate(zip(self.x[self.road_offset:].tolist(), self.y[self.road_offset:].tolist()),
+                                   self.road_offset)]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def index(self, obj_number: int, point_number: int, is_polygon: bool) -> int:
+        """
+        :return: id of point_number-th vertex of polygon or road segment obj_number
+        """
+        if is_polygon:
+            return self.polygon_offsets[obj_number] + point_number
+        return self.road_ids[2 * obj_number + point_number]
+
+    def key(self, vertex: int) -> Tuple[int, int, bool]:
+        """
+        :return: (obj_number, point_number, is_polygon) of vertex with given id
+        """
+        if vertex >= self.road_offset:
+            return (vertex - self.road_offset) // 2, (vertex - self.road_offset) % 2, False
+        obj_number = bisect_right(self.polygon_offsets, vertex) - 1
+        return obj_number, vertex - self.polygon_offsets[obj_number], True
+
+    def polygon_size(self, obj_number: int) -> int:
+        """
+        :return: number of vertices of polygon obj_number
+        """
+        return self.polygon_offsets[obj_number + 1] - self.polygon_offsets[obj_number]
+
+    def point(self, vertex: int) -> TPoint:
+        return float(self.x[vertex]), float(self.y[vertex])
+
+    def points(self) -> Iterator[PointData]:
+        """
+        :return: PointData of all vertices in id order with unknown weight, road points shared by segments once
+        """
+        road_ids = self.road_ids
+        for vertex, (x, y) in enumerate(zip(self.x.tolist(), self.y.tolist())):
+            if vertex < self.road_offset or road_ids[vertex - self.road_offset] == vertex:
+                yield ((x, y),) + self.key(vertex) + (None,)
@@ -1,19 +1,79 @@
+from concurrent.futures import FIRST_COMPLETED
 from concurrent.futures import ProcessPoolExecutor
-
+from concurrent.futures import wait
+from functools import partial
+from hashlib import sha256
+from heapq import nsmallest
+from operator import itemgetter
+from os import cpu_count
+from time import monotonic
+
+import numpy as np
 from networkx import MultiGraph
+from offroad_routing.geometry.algorithms import bounding_box
+from offroad_routing.geometry.algorithms import check_bbox_intersection
 from offroad_routing.geometry.algorithms import compare_points
-from offroad_routing.geometry.algorithms import point_distance
+from offroad_routing.geometry.algorithms import distance_bbox
+from offroad_routing.geometry.algorithms import point_distances
 from offroad_routing.geometry.ch_localization import localize_convex
 from offroad_routing.geometry.geom_types import TPolygonData
 from offroad_routing.geometry.geom_types import TSegmentData
+from offroad_routing.geometry.grid_index import GridIndex
+from offroad_routing.geometry.polygon_arrays import PolygonArrays
+from offroad_routing.pathfinding.contraction import ContractionHierarchy
+from offroad_routing.pathfinding.landmarks import Landmarks
 from offroad_routing.surface.tag_value import polygon_values
+from offroad_routing.visibility.adjacency_cache import AdjacencyCache
+from offroad_routing.visibility.csr_graph import CsrGraph
+from offroad_routing.visibility.csr_graph import CsrGraphBuilder
+from offroad_routing.visibility.disk_cache import DiskAdjacencyCache
+from offroad_routing.visibility.graph_file import load_arrays
+from offroad_routing.visibility.graph_file import save_arrays
 from offroad_routing.visibility.inner_edges import find_inner_edges
+from offroad_routing.visibility.inner_edges import PreparedPolygons
+from offroad_routing.visibility.occlusion import OcclusionMap
 from offroad_routing.visibility.segment_visibility import SegmentVisibility
 from offroad_routing.visibility.supporting_line import find_restriction_pair
 from offroad_routing.visibility.supporting_line import find_supporting_line
 from offroad_routing.visibility.supporting_pair import find_supporting_pair
+from offroad_routing.visibility.vertex_snapper import VertexSnapper
+from offroad_routing.visibility.vertex_table import VertexTable
 from osmnx.folium import plot_graph_folium
 
+# visibility graph of a worker process, set once per process to avoid sending geometry with every task
+_worker_vgraph = None
+
+
+def _init_worker(vgraph) -> None:
+    global _worker_vgraph
+    _worker_vgraph = vgraph
+    vgraph.reconnect()
+
+
+def _linestring_arrays(linestrings):
+    """
+    :param TSegmentData linestrings: road segment records
+    :return: segment points of shape (n, 2, 2), surface weights (nan for None) and inside flags
+    """
+    coordinates = np.array([linestring["geometry"] for linestring in linestrings], dtype=np.float64).reshape(-1, 2, 2)
+    tags = np.array([np.nan if linestring["tag"] is None else linestring["tag"] for linestring in linestrings],
+                    dtype=np.float64)
+    inside = np.array([linestring["inside"] for linestring in linestrings], dtype=bool)
+    return coordinates, tags, inside
+
+
+def _linestring_records(coordinates, tags, inside):
+    """
+    :return: road segment records built from _linestring_arrays
+    """
+    return [{"tag": None if tag != tag else tag, "inside": is_inside, "geometry": ((ax, ay), (bx, by))}
+            for ((ax, ay), (bx, by)), tag, is_inside in zip(coordinates.tolist(), tags.tolist(), inside.tolist())]
+
+
+def _incident_vertices_chunk(points, inside_percent, max_distance, max_neighbours, seed):
+    return [_worker_vgraph.incident_vertices(point_data, inside_percent, max_distance, max_neighbours, seed)
+            for point_data in points]
+
 
 class VisibilityGraph:
     """
@@ -21,13 +81,21 @@ class VisibilityGraph:
     Polygons and polylines are used as obstacles on the plane.
     """
 
-    __slots__ = ("polygons", "linestrings", "__graph", "default_weight")
+    __slots__ = ("polygons", "linestrings", "__graph", "__csr_graph", "default_weight", "__polygon_index",
+                 "__linestring_index", "__vertex_table", "__prepared_polygons", "__adjacency_cache",
+                 "__disk_cache", "__snapper", "__hierarchy", "__landmarks", "__build_parameters")
 
-    def __init__(self, polygons, linestrings, default_surface="grass"):
+    def __init__(self, polygons, linestrings, default_surface="grass", spatial_index=True, cache_size=None,
+                 cache_file=None):
         """
         :param TSegmentData linestrings: road segment records
-        :param TPolygonData polygons: polygon records
+        :param Union[TPolygonData, PolygonArrays] polygons: polygon records or arrays (see Geometry.export)
         :param str default_surface: default surface for unfilled areas (choose prevailing surface)
+        :param bool spatial_index: index convex hulls and road segments on a grid to speed up visibility queries
+        :param Optional[int] cache_size: maximum number of edges memoized by cached_incident_vertices,
+            visible vertices are not memoized if None
+        :param Optional[str] cache_file: SQLite file where cached_incident_vertices stores visible vertices,
+            can be shared by processes using the same geometry
         """
 
         self.polygons = polygons
@@ -36,35 +104,268 @@ class VisibilityGraph:
             raise ValueError("Unknown default surface value")
         self.default_weight = polygon_values[default_surface]
         self.__graph = MultiGraph(crs='EPSG:4326')
+        self.__csr_graph = None
+        self.__snapper = None
+        self.__hierarchy = None
+        self.__landmarks = None
+        self.__build_parameters = None
+        self.__vertex_table = VertexTable(polygons, linestrings)
+        self.__prepared_polygons = PreparedPolygons(polygons)
+        self.__adjacency_cache = None if cache_size is None else AdjacencyCache(cache_size)
+        self.__disk_cache = None if cache_file is None else \
+            DiskAdjacencyCache(cache_file, self.fingerprint, self.__vertex_table)
+        self.__polygon_index = self.__linestring_index = None
+        if spatial_index:
+            if isinstance(polygons, PolygonArrays):
+                self.__polygon_index = GridIndex(polygons.hull_bboxes().tolist())
+            else:
+                self.__polygon_index = GridIndex([bounding_box(polygon["convex_hull"]) for polygon in polygons])
+            self.__linestring_index = GridIndex([bounding_box(linestring["geometry"]) for linestring in linestrings])
 
     @property
     def graph(self):
+        """
+        Built graph as networkx MultiGraph, converted from compact graph on each access if built with compact=True.
+        """
+        if self.__csr_graph is not None:
+            return self.__csr_graph.to_networkx()
         return self.__graph
 
-    def incident_vertices(self, point_data, inside_percent=1):
+    @property
+    def vertex_table(self):
+        """
+        Dense ids of polygon and road segment vertices, used as graph node ids.
+
+        :rtype: offroad_routing.visibility.vertex_table.VertexTable
+        """
+        return self.__vertex_table
+
+    @property
+    def csr_graph(self):
+        """
+        Built graph in compact format, None unless built with compact=True.
+
+        :rtype: Optional[offroad_routing.visibility.csr_graph.CsrGraph]
+        """
+        return self.__csr_graph
+
+    @property
+    def adjacency_cache(self):
+        """
+        Memo of visible vertices filled by cached_incident_vertices, None unless created with cache_size.
+
+        :rtype: Optional[offroad_routing.visibility.adjacency_cache.AdjacencyCache]
+        """
+        return self.__adjacency_cache
+
+    @property
+    def disk_cache(self):
+        """
+        Persistent memo of visible vertices filled by cached_incident_vertices, None unless created with cache_file.
+
+        :rtype: Optional[offroad_routing.visibility.disk_cache.DiskAdjacencyCache]
+        """
+        return self.__disk_cache
+
+    @property
+    def snapper(self):
+        """
+        KD-tree over vertices of built graph, created on first access and dropped when graph is rebuilt.
+        Positions of snapped vertices are vertex numbers of csr_graph if the graph is compact.
+
+        :rtype: offroad_routing.visibility.vertex_snapper.VertexSnapper
+        """
+        if self.__snapper is None:
+            if self.__csr_graph is not None:
+                self.__snapper = VertexSnapper.from_csr(self.__csr_graph)
+            else:
+                self.__snapper = VertexSnapper.from_networkx(self.__graph)
+        return self.__snapper
+
+    @property
+    def hierarchy(self):
+        """
+        Contraction hierarchy of built graph, None unless computed by contract() or loaded with the graph.
+
+        :rtype: Optional[offroad_routing.pathfinding.contraction.ContractionHierarchy]
+        """
+        return self.__hierarchy
+
+    def contract(self, settle_limit=500):
+        """
+        Compute contraction hierarchy of built graph (see offroad_routing.pathfinding.contraction),
+        AStar uses it to find routes on prebuilt graph. Hierarchy is dropped when graph is rebuilt
+        and saved with the graph by save().
+
+        :param int settle_limit: maximum number of vertices settled by a witness search
+        :rtype: offroad_routing.pathfinding.contraction.ContractionHierarchy
+        """
+        self.__hierarchy = ContractionHierarchy.build(self.compact_graph(), settle_limit)
+        return self.__hierarchy
+
+    @property
+    def landmarks(self):
+        """
+        Landmark costs of built graph, None unless computed by compute_landmarks() or loaded with the graph.
+
+        :rtype: Optional[offroad_routing.pathfinding.landmarks.Landmarks]
+        """
+        return self.__landmarks
+
+    def compute_landmarks(self, count=16, seed=0):
+        """
+        Choose landmarks on built graph and compute costs from them (see offroad_routing.pathfinding.landmarks),
+        AStar uses them as lower bounds of route cost. Landmarks are dropped when graph is rebuilt
+        and saved with the graph by save(). Build parameters of the graph are kept with landmarks:
+        search without prebuilt graph uses them only if the graph was built with inside_percent=1
+        without max_distance and max_neighbours (see Landmarks.complete).
+
+        :param int count: number of landmarks
+        :param int seed: random seed for landmark selection
+        :rtype: offroad_routing.pathfinding.landmarks.Landmarks
+        """
+        self.__landmarks = Landmarks.build(self.compact_graph(), count, seed, self.__build_parameters)
+        return self.__landmarks
+
+    def compact_graph(self):
+        """
+        Built graph in compact format: csr_graph if built with compact=True,
+        otherwise networkx graph converted once for contraction hierarchy, landmarks and saved file.
+
+        :rtype: offroad_routing.visibility.csr_graph.CsrGraph
+        """
+        if self.__csr_graph is not None:
+            return self.__csr_graph
+        for preprocessed in (self.__hierarchy, self.__landmarks):
+            if preprocessed is not None:
+                return preprocessed.graph
+        return CsrGraph.from_networkx(self.__graph)
+
+    def reconnect(self) -> None:
+        """
+        Open per-process resources (disk cache file) again on next use,
+        called in worker processes which inherit the graph by fork.
+        """
+        if self.__disk_cache is not None:
+            self.__disk_cache.reconnect()
+
+    def nearest_vertices(self, points, k=1):
+        """
+        Snap points to the nearest vertices of built graph.
+
+        :param Sequence[TPoint] points: points (lon, lat)
+        :param int k: number of nearest vertices for each point
+        :return: geodesic distances in km and graph node ids of shape (len(points), k), sorted by distance
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        if k < 1:
+            raise ValueError("k should be positive")
+        snapper = self.snapper
+        if len(snapper) < k:
+            raise ValueError("Graph has less than k vertices")
+        distances, positions = snapper.nearest_many(points, k)
+        return distances, snapper.ids[positions]
+
+    def __convex_hulls(self, polygon_numbers):
+        """
+        :return: closed convex hull, its angles and numbers of its vertices in outer ring for each polygon,
+            gathered from arrays without building polygon records
+        """
+        if isinstance(self.polygons, PolygonArrays):
+            return self.polygons.hulls(polygon_numbers)
+        return [(polygon["convex_hull"], polygon["angles"], polygon["convex_hull_points"])
+                for polygon in map(self.polygons.__getitem__, polygon_numbers)]
+
+    def __polygon_side(self, polygon_number, point_number, vertex_number):
+        polygon_size = self.__vertex_table.polygon_size(polygon_number)
+        return (vertex_number - point_number) % polygon_size in (1, polygon_size - 1)
+
+    def __closest_vertices(self, point_data, vertices, max_distance, max_neighbours):
+        if max_distance is None and max_neighbours is None:
+            return vertices
+        point, obj_number, point_number, is_polygon = point_data[0:4]
+
+        # sides of own polygon are always kept for the graph to stay connected along polygon borders
+        closest, candidates = list(), list()
+        distances = point_distances(point, [vertex[0] for vertex in vertices]).tolist()
+        for vertex, distance in zip(vertices, distances):
+            if is_polygon and vertex[3] and vertex[1] == obj_number and \
+                    self.__polygon_side(obj_number, point_number, vertex[2]):
+                closest.append(vertex)
+                continue
+            if max_distance is None or distance <= max_distance:
+                candidates.append((distance, vertex))
+
+        if max_neighbours is not None and len(candidates) > max_neighbours:
+            candidates = nsmallest(max_neighbours, candidates, key=itemgetter(0))
+        closest.extend(vertex for _, vertex in candidates)
+        return closest
+
+    def incident_vertices(self, point_data, inside_percent=1, max_distance=None, max_neighbours=None, seed=0,
+                          objects=None):
         """
         Find all incident vertices in visibility graph for given point, computes without building graph.
+        If max_distance or max_neighbours is set, only closest visible vertices are returned,
+        edges along roads and sides of the polygon point belongs to are always kept.
+        If objects are set, other polygons and segments are not obstacles and their vertices are not returned
+        (see offroad_routing.visibility.corridor).
 
         :param PointData point_data: point on the map to find incident vertices from
         :param float inside_percent: (from 0 to 1) - controls the number of inner polygon edges
+        :param Optional[float] max_distance: visibility radius in km, objects beyond it are not processed
+        :param Optional[int] max_neighbours: maximum number of closest visible vertices to return
+        :param int seed: seed of inner polygon edges sampling, the same seed gives the same edges
+        :param Optional[Tuple[Collection[int], Collection[int]]] objects: numbers of polygons and road segments
+            to be processed, all if None
         :return: All visible points from given point on the map.
         :rtype: List[PointData]
         """
         if inside_percent < 0 or inside_percent > 1:
             raise ValueError("inside_percent should be from 1 to 0")
+        if max_distance is not None and max_distance <= 0:
+            raise ValueError("max_distance should be positive")
+        if max_neighbours is not None and max_neighbours < 1:
+            raise ValueError("max_neighbours should be positive")
 
         point, obj_number, point_number, is_polygon = point_data[0:4]
         is_unknown = obj_number is None or point_number is None or is_polygon is None
-        visible_vertices = SegmentVisibility()
-        edges_inside = list()
-
-        for i, polygon in enumerate(self.polygons):
-
+        visible_vertices = SegmentVisibility(self.__vertex_table)
+        edges_inside, edges_along = list(), list()
+
+        # segment from point to any vertex within radius cannot leave radius bbox, objects outside it are skipped
+        window = None if max_distance is None else distance_bbox(point, max_distance)
+        if window is None:
+            nearby = range(len(self.polygons)) if objects is None else sorted(objects[0])
+        elif self.__polygon_index is None:
+            nearby = [i for i, (convex_hull, _, _) in enumerate(self.__convex_hulls(range(len(self.polygons))))
+                      if check_bbox_intersection(window, bounding_box(convex_hull))]
+        else:
+            nearby = self.__polygon_index.query_bbox(window)
+        if objects is not None and window is not None:
+            nearby = [i for i in nearby if i in objects[0]]
+
+        # polygons which convex hulls may contain point go first: they may terminate the search,
+        # the rest are known to lie outside without localization, they go from the nearest
+        # and are skipped if supporting pairs of nearer ones hide them
+        if self.__polygon_index is None:
+            candidates, order, occlusion = None, list(nearby), None
+        else:
+            candidates = set(self.__polygon_index.query_point(point))
+            if objects is not None:
+                candidates.intersection_update(objects[0])
+            if not is_unknown and is_polygon:
+                candidates.add(obj_number)
+            occlusion = OcclusionMap(point)
+            order = sorted(candidates) + sorted((i for i in nearby if i not in candidates),
+                                                key=lambda i: occlusion.distance(self.__polygon_index.bbox(i)))
+
+        for i, (convex_hull, angles, convex_hull_points) in zip(order, self.__convex_hulls(order)):
             # if a point is a part of a current polygon
             if not is_unknown and is_polygon and i == obj_number:
+                polygon = self.polygons[i]
 
                 edges_inside = find_inner_edges(point, point_number, polygon["geometry"], i, inside_percent,
-                                                polygon["tag"][0])
+                                                polygon["tag"][0], self.__prepared_polygons[i], seed)
 
                 convex_hull_point_count = len(polygon["convex_hull"]) - 1
                 if convex_hull_point_count <= 2:
@@ -77,28 +378,41 @@ class VisibilityGraph:
                     right = polygon["convex_hull_points"][(position + 1) % convex_hull_point_count]
                     restriction_pair = (polygon["geometry"][0][left], polygon["geometry"][0][right])
                     visible_vertices.set_restriction_angle(restriction_pair, point, reverse_angle=True)
+                    if occlusion is not None:
+                        occlusion.hide_angle(*restriction_pair, inside=True)
 
                 # if a point is strictly inside a convex hull and a part of polygon
                 else:
-                    restriction_pair = find_restriction_pair(point, polygon["geometry"][0], point_number)
+                    restriction_pair = find_restriction_pair(point, polygon["geometry"][0], point_number,
+                                                             polygon["convex_hull_points"])
                     if restriction_pair is None:
-                        return edges_inside
+                        return self.__closest_vertices(point_data, edges_inside, max_distance, max_neighbours)
                     visible_vertices.set_restriction_angle(restriction_pair, point, reverse_angle=False)
+                    if occlusion is not None:
+                        occlusion.hide_angle(*restriction_pair, inside=False)
+
+                continue
 
             # if a point not inside convex hull
-            elif not localize_convex(point, polygon["convex_hull"], polygon["angles"])[0]:
-                pair = find_supporting_pair(point, polygon["convex_hull"], polygon["angles"])
+            if candidates is not None and i not in candidates or not localize_convex(point, convex_hull, angles)[0]:
+                if occlusion is not None and occlusion.hidden(self.__polygon_index.bbox(i)):
+                    continue
+                pair = find_supporting_pair(point, convex_hull, angles)
                 if pair is not None:
-                    pair = [polygon["convex_hull_points"][k] for k in pair]
-                    pair = [(polygon["geometry"][0][k], i, k, True, self.default_weight) for k in pair]
+                    pair = [(tuple(convex_hull[k]), i, convex_hull_points[k], True, self.default_weight) for k in pair]
+                    if occlusion is not None:
+                        occlusion.hide_segment(pair[0][0], pair[1][0])
                 visible_vertices.add_pair(pair)
 
             # if a point is inside convex hull but not a part of polygon
             else:
-                line = find_supporting_line(point, polygon["geometry"][0])
+                polygon = self.polygons[i]
+                line = find_supporting_line(point, polygon["geometry"][0], polygon["convex_hull_points"])
                 if line is None:
                     if is_unknown:
-                        return find_inner_edges(point, None, polygon["geometry"], i, inside_percent, polygon["tag"][0])
+                        edges_inside = find_inner_edges(point, None, polygon["geometry"], i, inside_percent,
+                                                        polygon["tag"][0], self.__prepared_polygons[i], seed)
+                        return self.__closest_vertices(point_data, edges_inside, max_distance, max_neighbours)
                     return list()
                 # polygons touching
                 if len(line) == 1:
@@ -106,68 +420,284 @@ class VisibilityGraph:
                 line = [(polygon["geometry"][0][k], i, k, True, self.default_weight) for k in line]
                 visible_vertices.add_line(line)
 
-        # loop over all segments
-        for i, linestring in enumerate(self.linestrings):
+        # segments are obstacles only for polygon and unknown points, otherwise only incident ones are needed
+        if self.__linestring_index is not None and not is_polygon and not is_unknown:
+            segments = self.__linestring_index.query_point(point)
+        elif window is None:
+            segments = range(len(self.linestrings))
+        elif self.__linestring_index is None:
+            segments = [i for i, linestring in enumerate(self.linestrings)
+                        if check_bbox_intersection(window, bounding_box(linestring["geometry"]))]
+        else:
+            segments = self.__linestring_index.query_bbox(window)
+        if objects is not None:
+            segments = [i for i in segments if i in objects[1]]
+
+        for i in segments:
+            linestring = self.linestrings[i]
             weight = linestring["tag"]
             geometry = linestring["geometry"]
 
             if is_polygon or is_unknown and not linestring["inside"]:
+                if occlusion is not None:
+                    if occlusion.hidden(self.__linestring_index.bbox(i)):
+                        continue
+                    occlusion.hide_segment(geometry[0], geometry[1])
                 visible_vertices.add_pair(
-                    ((geometry[0], i, 0, False, 0), (geometry[1], i, 1, False, self.default_weight)))
+                    ((geometry[0], i, 0, False, self.default_weight), (geometry[1], i, 1, False, self.default_weight)))
             elif compare_points(point, geometry[0]):
-                edges_inside.append((geometry[1], i, 1, False, weight))
+                edges_along.append((geometry[1], i, 1, False, weight))
             elif compare_points(point, geometry[1]):
-                edges_inside.append((geometry[0], i, 0, False, weight))
+                edges_along.append((geometry[0], i, 0, False, weight))
 
         # building visibility graph of segments
         visible_edges = visible_vertices.get_edges_sweepline(point)
         visible_edges.extend(edges_inside)
+        visible_edges = self.__closest_vertices(point_data, visible_edges, max_distance, max_neighbours)
+        visible_edges.extend(edges_along)
         return visible_edges
 
-    def __process_points_of_objects(self, is_polygon, inside_percent, multiprocessing) -> None:
-        max_poly_len = 10000  # for graph indexing
-        objects = self.polygons if is_polygon else self.linestrings
-        futures = list()
-        with ProcessPoolExecutor() as executor:
-            for i, obj in enumerate(objects):
-                geometry = obj["geometry"]
-                for j, point in enumerate(geometry[0][:-1] if is_polygon else geometry):
-
-                    # adding a vertex in networkx graph
-                    px, py = point
-                    point_index = i * max_poly_len + j if is_polygon else int((i + 0.5) * max_poly_len + j)
-                    self.__graph.add_node(point_index, x=px, y=py)
-
-                    # getting incident vertices
-                    point_data = (point, i, j, is_polygon, None)
-                    future = self.incident_vertices(point_data, inside_percent) if not multiprocessing else \
-                        executor.submit(self.incident_vertices, point_data, inside_percent)
-                    futures.append((future, point, point_index))
-
-        for future_data in futures:
-            future, point, point_index = future_data
-            vertices = future.result() if multiprocessing else future
+    def cached_incident_vertices(self, point_data, objects=None):
+        """
+        Find incident vertices with default parameters of incident_vertices, memoizing results for graph vertices
+        in memory (see cache_size) and on disk (see cache_file).
+        Repeated queries over the same area get faster without building the whole graph.
+        Results restricted to objects are not memoized, memoized results are used with vertices of other objects
+        filtered out.
+
+        :param PointData point_data: point on the map to find incident vertices from
+        :param Optional[Tuple[Collection[int], Collection[int]]] objects: numbers of polygons and road segments
+            to be processed, all if None (see incident_vertices)
+        :rtype: List[PointData]
+        """
+        is_unknown = point_data[1] is None or point_data[2] is None or point_data[3] is None
+        if self.__adjacency_cache is None and self.__disk_cache is None or is_unknown:
+            return self.incident_vertices(point_data, objects=objects)
+        vertex = self.__vertex_table.index(*point_data[1:4])
+        vertices = None if self.__adjacency_cache is None else self.__adjacency_cache.get(vertex)
+        if vertices is None and self.__disk_cache is not None:
+            vertices = self.__disk_cache.get(vertex)
+            if vertices is not None and self.__adjacency_cache is not None:
+                self.__adjacency_cache.put(vertex, vertices)
+        if objects is not None:
             if vertices is None:
-                continue
-            for vertex in vertices:
-                vx, vy = vertex[0]
-                vertex_index = vertex[1] * max_poly_len + vertex[2] if vertex[3] \
-                    else int((vertex[1] + 0.5) * max_poly_len + vertex[2])
-                self.__graph.add_node(vertex_index, x=vx, y=vy)
-                self.__graph.add_edge(point_index, vertex_index, weight=vertex[4] * point_distance(point, vertex[0]))
+                return self.incident_vertices(point_data, objects=objects)
+            return [visible for visible in vertices if visible[1] in objects[0 if visible[3] else 1]]
+        if vertices is not None:
+            return vertices
+        vertices = self.incident_vertices(point_data)
+        if self.__disk_cache is not None:
+            self.__disk_cache.put(vertex, vertices)
+        if self.__adjacency_cache is not None:
+            self.__adjacency_cache.put(vertex, vertices)
+        return vertices
+
+    def warm_cache(self, vertices=None):
+        """
+        Read visible vertices stored in cache file to memory cache at once.
 
-    def build(self, inside_percent=0.4, multiprocessing=True):
+        :param Optional[Iterable[int]] vertices: ids of vertices to read, all stored ones if None
+        :return: number of vertices read
+        :rtype: int
+        """
+        if self.__adjacency_cache is None or self.__disk_cache is None:
+            raise ValueError("Both cache_size and cache_file should be set")
+        items = self.__disk_cache.items() if vertices is None else self.__disk_cache.get_many(vertices).items()
+        count = 0
+        for vertex, visible in items:
+            self.__adjacency_cache.put(vertex, visible)
+            count += 1
+        return count
+
+    def __add_edges(self, graph, point_data, vertices) -> None:
+        point = point_data[0]
+        point_index = self.__vertex_table.index(*point_data[1:4])
+        graph.add_node(point_index, x=point[0], y=point[1])
+        if vertices is None:
+            return
+        distances = point_distances(point, [vertex[0] for vertex in vertices]).tolist()
+        for vertex, distance in zip(vertices, distances):
+            vx, vy = vertex[0]
+            vertex_index = self.__vertex_table.index(*vertex[1:4])
+            graph.add_node(vertex_index, x=vx, y=vy)
+            graph.add_edge(point_index, vertex_index, weight=vertex[4] * distance)
+
+    def __add_chunk_edges(self, graph, pending) -> int:
+        count = 0
+        for future in wait(pending, return_when=FIRST_COMPLETED).done:
+            chunk = pending.pop(future)
+            for point_data, vertices in zip(chunk, future.result()):
+                self.__add_edges(graph, point_data, vertices)
+            count += len(chunk)
+        return count
+
+    def build(self, inside_percent=0.4, multiprocessing=True, max_distance=None, max_neighbours=None,
+              max_workers=None, chunksize=None, progress=None, compact=False, seed=0):
         """
         Compute visibility graph for a set of polygons and polylines and store it in memory.
+        With multiprocessing, geometry is passed to each worker process once and vertices are sent in chunks.
+        At most two chunks per worker are in progress at a time, results are added to the graph as they arrive.
+
+        Limiting visibility with max_distance or max_neighbours only removes edges (objects outside radius
+        cannot block edges inside it), so the result is a subgraph of the full graph and route costs never decrease.
+        With max_distance alone every edge not longer than radius is kept, so routes consisting of such edges
+        stay optimal. Cost degradation on a given map is measured by tests/programs/graph_3.py.
+
+        With compact=True edges are collected in flat arrays and stored as CsrGraph (see csr_graph property),
+        which takes several times less memory than networkx graph and is used by AStar for faster prebuilt search.
+        Either way the new graph replaces the previously built one of the other format.
 
         :param float inside_percent: (from 0 to 1) - controls the number of inner polygon edges
         :param bool multiprocessing: speed up computation for dense areas using multiprocessing
+        :param Optional[float] max_distance: visibility radius in km, longer edges are not built
+        :param Optional[int] max_neighbours: maximum number of closest visible vertices for each vertex
+        :param Optional[int] max_workers: number of worker processes, number of processors if None
+        :param Optional[int] chunksize: number of vertices sent to a worker at once, computed if None
+        :param Optional[Callable[[int, int, int, float], None]] progress: called after each chunk with number of
+            processed vertices, total number of vertices, number of edges built and elapsed time in seconds
+        :param bool compact: store graph in compact CSR format instead of networkx MultiGraph
+        :param int seed: seed of inner polygon edges sampling, builds with the same seed give the same graph
         """
         if inside_percent < 0 or inside_percent > 1:
             raise ValueError("inside_percent should be from 1 to 0")
+        if max_distance is not None and max_distance <= 0:
+            raise ValueError("max_distance should be positive")
+        if max_neighbours is not None and max_neighbours < 1:
+            raise ValueError("max_neighbours should be positive")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers should be positive")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize should be positive")
+
+        start = monotonic()
+        if compact:
+            graph = CsrGraphBuilder()
+            self.__graph = MultiGraph(crs='EPSG:4326')
+        else:
+            graph = self.__graph
+        self.__csr_graph = None
+        self.__snapper = None
+        self.__hierarchy = None
+        self.__landmarks = None
+        self.__build_parameters = {"inside_percent": inside_percent, "max_distance": max_distance,
+                                   "max_neighbours": max_neighbours}
+        points = list(self.__vertex_table.points())
+        total, done = len(points), 0
+        workers = max_workers or cpu_count() or 1
+        if chunksize is None:
+            chunksize = max(1, total // (workers * 4))
+        chunks = (points[i:i + chunksize] for i in range(0, total, chunksize))
+
+        def report():
+            if progress is not None:
+                progress(done, total, graph.number_of_edges(), monotonic() - start)
+
+        if not multiprocessing:
+            for chunk in chunks:
+                for point_data in chunk:
+                    self.__add_edges(graph, point_data,
+                                     self.incident_vertices(point_data, inside_percent, max_distance, max_neighbours,
+                                                            seed))
+                done += len(chunk)
+                report()
+        else:
+            process_chunk = partial(_incident_vertices_chunk, inside_percent=inside_percent,
+                                    max_distance=max_distance, max_neighbours=max_neighbours, seed=seed)
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+                pending = dict()
+                for chunk in chunks:
+                    if len(pending) >= 2 * workers:
+                        done += self.__add_chunk_edges(graph, pending)
+                        report()
+                    pending[executor.submit(process_chunk, chunk)] = chunk
+                while pending:
+                    done += self.__add_chunk_edges(graph, pending)
+                    report()
+
+        if compact:
+            self.__csr_graph = graph.build()
+        self.__snapper = None
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of source geometry and default surface weight, identifies geometry a saved graph
+        was built for and visible vertices stored in disk cache (their edge weights depend on default weight).
+        Geometry is hashed in array form, so records and arrays of the same geometry have the same fingerprint.
+        """
+        polygons = self.polygons
+        if not isinstance(polygons, PolygonArrays):
+            polygons = PolygonArrays.from_records(polygons)
+        digest = sha256()
+        for array in polygons.arrays() + _linestring_arrays(self.linestrings):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(repr(self.default_weight).encode())
+        return digest.hexdigest()
+
+    def save(self, filename):
+        """
+        Save built graph with its source geometry to a binary file.
+        Graph and geometry arrays are stored in compact format (see offroad_routing.visibility.graph_file)
+        and can be memory-mapped on load, so that processes loading the same file share memory.
+        Contraction hierarchy and landmarks are stored with the graph if computed (see contract and compute_landmarks).
 
-        self.__process_points_of_objects(True, inside_percent, multiprocessing)
-        self.__process_points_of_objects(False, inside_percent, multiprocessing)
+        :param str filename: file to be written
+        """
+        graph = self.compact_graph()
+        arrays = {"x": graph.x, "y": graph.y, "indptr": graph.indptr, "indices": graph.indices,
+                  "weights": graph.weights}
+        if graph.node_ids is not None:
+            arrays["node_ids"] = graph.node_ids
+        if self.__hierarchy is not None:
+            arrays.update(("ch_" + name, array) for name, array in self.__hierarchy.arrays().items())
+        if self.__landmarks is not None:
+            arrays.update(("lm_" + name, array) for name, array in self.__landmarks.arrays().items())
+        polygons = self.polygons
+        if not isinstance(polygons, PolygonArrays):
+            polygons = PolygonArrays.from_records(polygons)
+        arrays.update(zip(("pg_" + name for name in PolygonArrays.array_names), polygons.arrays()))
+        arrays.update(zip(("ls_coordinates", "ls_tags", "ls_inside"), _linestring_arrays(self.linestrings)))
+        meta = {"fingerprint": self.fingerprint, "default_weight": self.default_weight,
+                "build_parameters": self.__build_parameters}
+        save_arrays(filename, arrays, meta)
+
+    @classmethod
+    def load(cls, filename, mmap=True, polygons=None, linestrings=None, spatial_index=True):
+        """
+        Load graph saved by save(). Loaded graph is compact (see csr_graph property) and read-only if memory-mapped.
+        Geometry read from file is numeric arrays only, polygons are loaded as PolygonArrays.
+
+        :param str filename: saved graph file
+        :param bool mmap: map graph arrays to memory instead of reading them
+        :param Optional[Union[TPolygonData, PolygonArrays]] polygons: source polygons, read from file if None
+        :param Optional[TSegmentData] linestrings: source road segment records, read from file if None
+        :param bool spatial_index: index convex hulls and road segments on a grid to speed up visibility queries
+        :rtype: VisibilityGraph
+        """
+        if (polygons is None) != (linestrings is None):
+            raise ValueError("Both polygons and linestrings should be given")
+        arrays, meta = load_arrays(filename, mmap)
+        if polygons is None:
+            if "ls_coordinates" not in arrays:
+                raise ValueError("Graph file does not store geometry, polygons and linestrings should be given")
+            polygons = PolygonArrays(*(arrays["pg_" + name] for name in PolygonArrays.array_names))
+            linestrings = _linestring_records(arrays["ls_coordinates"], arrays["ls_tags"], arrays["ls_inside"])
+
+        vgraph = cls(polygons, linestrings, spatial_index=spatial_index)
+        vgraph.default_weight = meta["default_weight"]
+        if vgraph.fingerprint != meta["fingerprint"]:
+            raise ValueError("Graph was built for different geometry")
+        # files saved before build parameters were stored do not have them
+        vgraph.__build_parameters = meta.get("build_parameters")
+        vgraph.__csr_graph = CsrGraph(arrays["x"], arrays["y"], arrays["indptr"], arrays["indices"],
+                                      arrays["weights"], arrays.get("node_ids"))
+        if "ch_rank" in arrays:
+            vgraph.__hierarchy = ContractionHierarchy(vgraph.__csr_graph, arrays["ch_rank"], arrays["ch_indptr"],
+                                                      arrays["ch_indices"], arrays["ch_weights"], arrays["ch_middle"])
+        if "lm_vertices" in arrays:
+            vgraph.__landmarks = Landmarks(vgraph.__csr_graph, arrays["lm_vertices"], arrays["lm_distances"],
+                                           vgraph.__build_parameters)
+        return vgraph
 
     def plot(self, **kwargs):
         """
@@ -183,13 +713,14 @@ class VisibilityGraph:
             kwargs['tiles'] = 'OpenStreetMap'
         if 'weight' not in kwargs.keys():
             kwargs['weight'] = 0.5
-        return plot_graph_folium(self.__graph, **kwargs)
+        return plot_graph_folium(self.graph, **kwargs)
 
     @property
     def stats(self):
+        graph = self.__graph if self.__csr_graph is None else self.__csr_graph
         return {
             'number_of_polygons': len(self.polygons),
             'number_of_road_segments': len(self.linestrings),
-            'number_of_edges': self.graph.number_of_edges(),
-            'number_of_nodes': self.graph.number_of_nodes()
+            'number_of_edges': graph.number_of_edges(),
+            'number_of_nodes': graph.number_of_nodes()
         }
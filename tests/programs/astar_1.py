@@ -17,6 +17,7 @@ def main():
 
     stop = timeit.default_timer()
     print('Time: ', stop - start)
+    print(pathfinder.stats)
 
     track = GpxTrack(path)
     # track.write_file("track.gpx")
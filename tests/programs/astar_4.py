@@ -0,0 +1,41 @@
+import os
+import random
+import tempfile
+import timeit
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+
+
+def main():
+    geom = Geometry.load('kozlovo', '../maps')
+    vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+    vgraph.build(inside_percent=1, compact=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'kozlovo.orvg')
+        vgraph.save(filename)
+        # memory-mapped graph is shared by worker processes
+        pathfinder = AStar(VisibilityGraph.load(filename))
+
+        random.seed(0)
+        graph = vgraph.csr_graph
+        x, y = (float(graph.x.min()), float(graph.x.max())), (float(graph.y.min()), float(graph.y.max()))
+        pairs = [((random.uniform(*x), random.uniform(*y)), (random.uniform(*x), random.uniform(*y)))
+                 for _ in range(400)]
+
+        expected, single = None, None
+        for workers in (1, 2, 4, 8):
+            if workers > (os.cpu_count() or 1):
+                break
+            start = timeit.default_timer()
+            costs = pathfinder.find_many(pairs, workers=workers, costs=True, errors="none", snap=False)
+            stop = timeit.default_timer()
+            expected, single = expected or costs, single or stop - start
+            print('workers:', workers, 'Time: ', stop - start, 'speedup: ', single / (stop - start),
+                  'unreachable: ', costs.count(None), 'same costs: ', costs == expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import timeit
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+
+
+def main():
+    geom = Geometry.load('kozlovo', '../maps')
+    vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+    pathfinder = AStar(vgraph)
+    start, goal = (36.21, 56.62), (36.39, 56.66)
+
+    exact_start = timeit.default_timer()
+    exact = pathfinder.find(start, goal, heuristic_multiplier=1)
+    exact_time = timeit.default_timer() - exact_start
+    print('optimal Time: ', exact_time, 'cost: ', exact.cost, 'expanded: ', pathfinder.stats['expanded'])
+
+    for fraction in (0.05, 0.1, 0.25, 0.5, 1):
+        budget = exact_time * fraction
+        search_start = timeit.default_timer()
+        try:
+            path = pathfinder.find(start, goal, time_limit=budget)
+        except TimeoutError:
+            print('budget: ', budget, 'no route found')
+            continue
+        print('budget: ', budget, 'Time: ', timeit.default_timer() - search_start, 'cost: ', path.cost,
+              'bound: ', path.bound, 'actual: ', path.cost / exact.cost, 'searches: ', pathfinder.stats['searches'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import timeit
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+
+
+def main():
+    geom = Geometry.load('kozlovo', '../maps')
+    vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+    pathfinder = AStar(vgraph)
+    start, goal = (36.21, 56.62), (36.39, 56.66)
+
+    for corridor in (None, 0.5, 1, 2):
+        search_start = timeit.default_timer()
+        path = pathfinder.find(start, goal, heuristic_multiplier=1, corridor=corridor)
+        stop = timeit.default_timer()
+        print('corridor: ', corridor, 'Time: ', stop - search_start, 'cost: ', path.cost, 'bound: ', path.bound,
+              'expanded: ', pathfinder.stats['expanded'])
+
+
+if __name__ == "__main__":
+    main()
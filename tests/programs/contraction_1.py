@@ -0,0 +1,53 @@
+import random
+import timeit
+
+from networkx import NetworkXNoPath
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+
+
+def route_points(vgraph, count, seed):
+    random.seed(seed)
+    nodes = vgraph.graph.nodes
+    x, y = [data['x'] for _, data in nodes(data=True)], [data['y'] for _, data in nodes(data=True)]
+    return [((random.uniform(min(x), max(x)), random.uniform(min(y), max(y))),
+             (random.uniform(min(x), max(x)), random.uniform(min(y), max(y)))) for _ in range(count)]
+
+
+def find_all(pathfinder, pairs):
+    paths = list()
+    start = timeit.default_timer()
+    for source, target in pairs:
+        try:
+            paths.append(pathfinder.find(source, target).path)
+        except (RuntimeError, NetworkXNoPath):
+            paths.append(None)
+    return (timeit.default_timer() - start) / len(pairs), paths
+
+
+def main():
+    for name in ('user_area', 'kozlovo'):
+        geom = Geometry.load(name, '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1)
+        pairs = route_points(vgraph, 50, 0)
+        pathfinder = AStar(vgraph)
+        astar_time, expected = find_all(pathfinder, pairs)
+
+        start = timeit.default_timer()
+        hierarchy = vgraph.contract()
+        stop = timeit.default_timer()
+        print(name, vgraph.stats, 'Contraction time: ', stop - start, 'shortcuts:', hierarchy.number_of_shortcuts(),
+              'upward edges:', len(hierarchy.indices))
+
+        ch_time, paths = find_all(pathfinder, pairs)
+        same = sum(path == other or path is not None and other is not None and
+                   (path[0], path[-1]) == (other[0], other[-1]) for path, other in zip(paths, expected))
+        print('A* query: ', astar_time, 'CH query: ', ch_time, 'speedup: ', astar_time / ch_time,
+              'same ends or unreachable: ', same, '/', len(pairs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import random
+import timeit
+
+from networkx import has_path
+from networkx import shortest_path_length
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+
+
+def build(geom, **kwargs):
+    vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+    start = timeit.default_timer()
+    vgraph.build(inside_percent=1, multiprocessing=False, **kwargs)
+    stop = timeit.default_timer()
+    print(kwargs, 'Time: ', stop - start, vgraph.stats)
+    return vgraph
+
+
+def main():
+    geom = Geometry.load('user_area', '../maps')
+    full = build(geom)
+    random.seed(0)
+    nodes = list(full.graph.nodes)
+    pairs = [random.sample(nodes, 2) for _ in range(200)]
+
+    for max_distance in (0.5, 1, 2, 4):
+        limited = build(geom, max_distance=max_distance)
+        ratios, disconnected = list(), 0
+        for source, target in pairs:
+            if not has_path(full.graph, source, target):
+                continue
+            if not has_path(limited.graph, source, target):
+                disconnected += 1
+                continue
+            cost = shortest_path_length(limited.graph, source, target, weight='weight')
+            full_cost = shortest_path_length(full.graph, source, target, weight='weight')
+            ratios.append(cost / full_cost if full_cost > 0 else 1)
+        print('max_distance:', max_distance, 'disconnected pairs:', disconnected,
+              'mean cost ratio:', sum(ratios) / len(ratios), 'max cost ratio:', max(ratios))
+
+
+if __name__ == "__main__":
+    main()
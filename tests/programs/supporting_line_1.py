@@ -0,0 +1,51 @@
+import random
+import timeit
+
+from offroad_routing import Geometry
+from offroad_routing.geometry.algorithms import bounding_box
+from offroad_routing.geometry.ch_localization import localize_convex
+from offroad_routing.visibility.supporting_line import find_restriction_pair
+from offroad_routing.visibility.supporting_line import find_supporting_line
+
+
+def queries(polygons, points_per_polygon=20):
+    random.seed(0)
+    result = list()
+    for polygon in polygons:
+        if len(polygon["convex_hull_points"]) < 3:
+            continue
+        x_min, y_min, x_max, y_max = bounding_box(polygon["convex_hull"])
+        for _ in range(points_per_polygon):
+            point = (random.uniform(x_min, x_max), random.uniform(y_min, y_max))
+            if localize_convex(point, polygon["convex_hull"], polygon["angles"])[0]:
+                result.append((point, None, polygon))
+        for point_number in range(len(polygon["geometry"][0]) - 1):
+            if point_number not in polygon["convex_hull_points"]:
+                result.append((polygon["geometry"][0][point_number], point_number, polygon))
+    return result
+
+
+def run(queries, use_convex_hull):
+    for point, point_number, polygon in queries:
+        convex_hull_points = polygon["convex_hull_points"] if use_convex_hull else None
+        if point_number is None:
+            find_supporting_line(point, polygon["geometry"][0], convex_hull_points)
+        else:
+            find_restriction_pair(point, polygon["geometry"][0], point_number, convex_hull_points)
+
+
+def main():
+    for filename in ('user_area', 'kozlovo'):
+        geom = Geometry.load(filename, '../maps')
+        polygons, _ = geom.export(remove_inner=True)
+        points = queries(polygons)
+
+        brute = timeit.timeit(lambda: run(points, False), number=5)
+        pocket = timeit.timeit(lambda: run(points, True), number=5)
+        print(filename, 'queries: ', len(points))
+        print('Time (whole polygon): ', brute)
+        print('Time (pocket): ', pocket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from offroad_routing.visibility.active_segments import ActiveSegments
+
+
+class TestActiveSegments(unittest.TestCase):
+    def test_order(self):
+        rng = random.Random(1)
+        keys = [rng.random() for _ in range(200)]
+        active = ActiveSegments(len(keys))
+        expected = list()
+        for _ in range(2000):
+            k = rng.randrange(len(keys))
+            if k in active:
+                active.remove(k)
+                expected.remove(k)
+            else:
+                active.insert(k, lambda j: keys[j] < keys[k])
+                expected.append(k)
+            expected.sort(key=keys.__getitem__)
+            stored, j = list(), active.first()
+            while j >= 0:
+                stored.append(j)
+                j = active.next(j)
+            self.assertEqual(stored, expected)
+        self.assertEqual(sorted(k for k in range(len(keys)) if k in active), sorted(expected))
+
+    def test_empty(self):
+        active = ActiveSegments(3)
+        self.assertEqual(active.first(), -1)
+        active.insert(1, lambda j: True)
+        self.assertEqual((active.first(), active.next(1)), (1, -1))
+        self.assertNotIn(0, active)
+        active.remove(1)
+        self.assertEqual(active.first(), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
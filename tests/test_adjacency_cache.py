@@ -0,0 +1,43 @@
+import pickle
+import unittest
+
+from offroad_routing.visibility.adjacency_cache import AdjacencyCache
+
+
+class TestAdjacencyCache(unittest.TestCase):
+    def test_lru(self):
+        cache = AdjacencyCache(5)
+        cache.put(1, [1, 2])
+        cache.put(2, [3, 4])
+        self.assertEqual(cache.get(1), [1, 2])
+        cache.put(3, [5, 6])
+        self.assertNotIn(2, cache)
+        self.assertIn(1, cache)
+        self.assertIs(cache.get(2), None)
+        cache.put(4, list(range(6)))
+        self.assertNotIn(4, cache)
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'evictions': 1, 'number_of_vertices': 2,
+                                       'number_of_edges': 4})
+
+    def test_replace(self):
+        cache = AdjacencyCache(5)
+        cache.put(1, [1, 2, 3])
+        cache.put(1, [1])
+        self.assertEqual(cache.stats['number_of_edges'], 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_pickle(self):
+        cache = AdjacencyCache(5)
+        cache.put(1, [1, 2])
+        loaded = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(loaded.max_edges, 5)
+        self.assertEqual(len(loaded), 0)
+
+    def test_size(self):
+        with self.assertRaises(ValueError):
+            AdjacencyCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,32 @@ class TestPointDistance(unittest.TestCase):
         self.assertGreater(distance, 584)
         self.assertLess(distance, 586)
 
+    def test_distances(self):
+        origin = (38.68869, 55.388)
+        for size in (0, 3, 100):
+            points = [(38.7 + i * 0.001, 55.3 + i * 0.002) for i in range(size)]
+            self.assertEqual(point_distances(origin, points).tolist(), [point_distance(origin, p) for p in points])
+
+    def test_pairwise_distances(self):
+        a = [(38.7 + i * 0.01, 55.3) for i in range(4)]
+        b = [(-80.7055, 47.085), (38.76534, 55.36447), (38.7, 55.3)]
+        distances = pairwise_point_distances(a, b)
+        self.assertEqual(distances.shape, (4, 3))
+        self.assertEqual(distances.tolist(), [[point_distance(p, q) for q in b] for p in a])
+
+
+class TestDistanceBbox(unittest.TestCase):
+    def test_bbox(self):
+        point = (38.68869, 55.388)
+        bbox = distance_bbox(point, 5.5)
+        self.assertTrue(bbox[0] < 38.76534 < bbox[2] and bbox[1] < 55.36447 < bbox[3])
+        for corner in ((bbox[0], point[1]), (bbox[2], point[1]), (point[0], bbox[1]), (point[0], bbox[3])):
+            self.assertAlmostEqual(point_distance(point, corner), 5.5, 2)
+
+    def test_pole(self):
+        bbox = distance_bbox((0, 89.99), 10)
+        self.assertEqual((bbox[0], bbox[2], bbox[3]), (-180, 180, 90))
+
 
 class TestCrossProduct(unittest.TestCase):
     def test_value(self):
@@ -92,6 +118,49 @@ class TestRaySegmentIntersection(unittest.TestCase):
         self.assertFalse(check_ray_segment_intersection((0, 0), (0, 1), (0, 2), (2, 2), False))
 
 
+class TestVectorized(unittest.TestCase):
+    points = ((0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.5), (2, -1), (-1, 3), (2, 2), (0, 0.5), (1, 0))
+
+    def test_turns(self):
+        result = turns((0, 0), self.points, self.points[::-1]).tolist()
+        self.assertEqual(result, [turn((0, 0), p, q) for p, q in zip(self.points, self.points[::-1])])
+
+    def test_polar_angles(self):
+        self.assertEqual(polar_angles((0.5, 0.5), self.points).tolist(),
+                         [polar_angle((0.5, 0.5), p) for p in self.points])
+
+    def test_points_in_angle(self):
+        for lt, pt, rt in (((1, 0), (0, 0), (0, 1)), ((0, 1), (0, 0), (1, 0))):
+            self.assertEqual(points_in_angle(self.points, lt, pt, rt).tolist(),
+                             [point_in_angle(p, lt, pt, rt) for p in self.points])
+
+    def test_segment_intersections(self):
+        a, b = (0, 0), (1, 1)
+        starts, ends = self.points, self.points[1:] + self.points[:1]
+        self.assertEqual(check_segment_intersections(a, b, starts, ends).tolist(),
+                         [check_segment_intersection(a, b, c, d) for c, d in zip(starts, ends)])
+
+    def test_ray_segment_intersections(self):
+        p, b = (0.5, 0.5), (0.6, 0.7)
+        starts, ends = self.points, self.points[1:] + self.points[:1]
+        for end_intersection in (True, False):
+            self.assertEqual(check_ray_segment_intersections(p, b, starts, ends, end_intersection).tolist(),
+                             [check_ray_segment_intersection(p, b, c, d, end_intersection)
+                              for c, d in zip(starts, ends)])
+
+    def test_segment_crossings(self):
+        starts, ends = self.points, self.points[3:] + self.points[:3]
+        expected = sorted((i, j) for i in range(len(starts)) for j in range(i + 1, len(starts))
+                          if check_segment_intersection(starts[i], ends[i], starts[j], ends[j]))
+        first, second, first_positions, second_positions = segment_crossings(starts, ends)
+        self.assertEqual(sorted(tuple(sorted(pair)) for pair in zip(first.tolist(), second.tolist())), expected)
+        for i, j, s, t in zip(first, second, first_positions, second_positions):
+            self.assertAlmostEqual(starts[i][0] + (ends[i][0] - starts[i][0]) * s,
+                                   starts[j][0] + (ends[j][0] - starts[j][0]) * t)
+            self.assertAlmostEqual(starts[i][1] + (ends[i][1] - starts[i][1]) * s,
+                                   starts[j][1] + (ends[j][1] - starts[j][1]) * t)
+
+
 class TestComparePoints(unittest.TestCase):
     def test_equals(self):
         self.assertTrue(compare_points((0, 0), (0, 0)))
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from offroad_routing import AStar
@@ -15,3 +17,131 @@ class TestAstar(unittest.TestCase):
         track = GpxTrack(path)
         track.visualize()
         track.plot()
+
+    def test_astar_compact(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        path = AStar(vgraph).find((34.02, 59.01), (34.12, 59.09))
+        self.assertEqual(path.path[0], vgraph.csr_graph.coordinates(vgraph.csr_graph.nearest_vertex((34.02, 59.01))))
+        self.assertEqual(path.path[-1], vgraph.csr_graph.coordinates(vgraph.csr_graph.nearest_vertex((34.12, 59.09))))
+
+    def test_astar_cached(self):
+        geom = Geometry.load('user_area', '../maps')
+        expected = AStar(VisibilityGraph(*geom.export(remove_inner=True))).find((34.02, 59.01), (34.12, 59.09))
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_size=100000)
+        pathfinder = AStar(vgraph)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09))
+        self.assertEqual(path.path, expected.path)
+        stats = vgraph.adjacency_cache.stats
+        self.assertEqual(stats['misses'], stats['number_of_vertices'])
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09))
+        self.assertEqual(path.path, expected.path)
+        self.assertEqual(vgraph.adjacency_cache.misses, stats['misses'])
+        self.assertGreater(vgraph.adjacency_cache.hits, stats['hits'])
+
+    def test_astar_expanded_once(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_size=100000)
+        pathfinder = AStar(vgraph)
+        self.assertIs(pathfinder.stats, None)
+        pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1)
+        # start point is not memoized, any other vertex is computed once
+        self.assertEqual(vgraph.adjacency_cache.hits, 0)
+        self.assertEqual(pathfinder.stats['expanded'], vgraph.adjacency_cache.misses + 1)
+        self.assertGreater(pathfinder.stats['skipped'], 0)
+
+    def test_astar_bidirectional(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        pathfinder = AStar(vgraph)
+        # on the fly visibility is not symmetric, search from goal is not supported
+        self.assertRaises(ValueError, pathfinder.find, (34.02, 59.01), (34.12, 59.09), bidirectional=True)
+        self.assertRaises(ValueError, pathfinder.find, (34.02, 59.01), (34.12, 59.09), bidirectional=True,
+                          corridor=1)
+
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        expected = pathfinder.find((34.02, 59.01), (34.12, 59.09))
+        self.assertEqual(pathfinder.find((34.02, 59.01), (34.12, 59.09), bidirectional=True).path, expected.path)
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        self.assertEqual(pathfinder.find((34.02, 59.01), (34.12, 59.09), bidirectional=True).path, expected.path)
+
+    def test_astar_overlay(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        pathfinder = AStar(vgraph)
+        start, goal = (34.02, 59.01), (34.12, 59.09)
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        stats = vgraph.stats
+        path = pathfinder.find(start, goal, snap=False)
+        self.assertEqual((path.path[0], path.path[-1]), (start, goal))
+        self.assertEqual(vgraph.stats, stats)
+        self.assertEqual(pathfinder.find(start, goal, bidirectional=True, snap=False).path, path.path)
+        snapped = pathfinder.find(start, goal)
+        self.assertNotEqual(snapped.path[0], start)
+
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        self.assertEqual(pathfinder.find(start, goal, snap=False).path, path.path)
+        self.assertEqual(pathfinder.find(start, start, snap=False).path, [start])
+
+    def test_find_many(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        pathfinder = AStar(vgraph)
+        # the last goal is snapped to a vertex without edges
+        pairs = [((34.02, 59.01), (34.12, 59.09)), ((34.05, 59.02), (34.1, 59.05)),
+                 ((34.02, 59.01), (34.049865, 59.0135763))]
+        expected = [pathfinder.find(*pair) for pair in pairs[:2]]
+        self.assertAlmostEqual(expected[0].cost, vgraph.csr_graph.path_weight(
+            [vgraph.csr_graph.nearest_vertex(point) for point in expected[0].path]))
+
+        paths = pathfinder.find_many(pairs, workers=2, errors="none")
+        self.assertEqual([path.path for path in paths[:2]], [path.path for path in expected])
+        self.assertIsNone(paths[2])
+        costs = pathfinder.find_many(pairs, workers=1, costs=True, errors="return")
+        self.assertEqual(costs[:2], [path.cost for path in expected])
+        self.assertIsInstance(costs[2], RuntimeError)
+        self.assertRaises(RuntimeError, pathfinder.find_many, pairs, workers=2)
+        self.assertRaises(ValueError, pathfinder.find_many, pairs, errors="ignore")
+        exact = pathfinder.find_many(pairs[:2], workers=2, chunksize=1, snap=False)
+        self.assertEqual(exact[1].path, pathfinder.find(*pairs[1], snap=False).path)
+
+    def test_find_many_disk_cache(self):
+        geom = Geometry.load('user_area', '../maps')
+        pairs = [((34.02, 59.01), (34.12, 59.09)), ((34.05, 59.02), (34.1, 59.05)), ((34.03, 59.06), (34.1, 59.02))]
+        expected = AStar(VisibilityGraph(*geom.export(remove_inner=True))).find_many(pairs, workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_file=filename)
+            pathfinder = AStar(vgraph)
+            # connection of this process is opened before workers are forked
+            self.assertEqual(len(vgraph.disk_cache), 0)
+            paths = pathfinder.find_many(pairs, workers=2, chunksize=1)
+            self.assertEqual([path.path for path in paths], [path.path for path in expected])
+            stored = len(vgraph.disk_cache)
+            self.assertGreater(stored, 0)
+            paths = pathfinder.find_many(pairs, workers=2, chunksize=1)
+            self.assertEqual([path.path for path in paths], [path.path for path in expected])
+            self.assertEqual(len(vgraph.disk_cache), stored)
+            vgraph.disk_cache.close()
+
+    def test_astar_anytime(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        pathfinder = AStar(vgraph)
+        optimal = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), max_expanded=10 ** 6)
+        self.assertEqual(path.bound, 1)
+        self.assertAlmostEqual(path.cost, optimal.cost)
+        self.assertGreater(pathfinder.stats['searches'], 1)
+        self.assertIsNone(optimal.bound)
+
+        budget = pathfinder.stats['expanded'] // 2
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), max_expanded=budget)
+        self.assertEqual((path.path[0], path.path[-1]), ((34.02, 59.01), (34.12, 59.09)))
+        self.assertLessEqual(pathfinder.stats['expanded'], budget)
+        self.assertLessEqual(path.cost, optimal.cost * path.bound + 1e-9)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), time_limit=60)
+        self.assertEqual(path.bound, 1)
+        self.assertRaises(TimeoutError, pathfinder.find, (34.02, 59.01), (34.12, 59.09), max_expanded=1)
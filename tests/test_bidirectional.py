@@ -0,0 +1,43 @@
+import random
+import unittest
+
+import networkx as nx
+from offroad_routing.pathfinding.bidirectional import bidirectional_astar
+
+
+def grid_graph(size, seed):
+    random.seed(seed)
+    graph = nx.grid_2d_graph(size, size)
+    for u, v in graph.edges():
+        graph.edges[u, v]['weight'] = random.uniform(1, 5)
+    return graph
+
+
+class TestBidirectional(unittest.TestCase):
+    def test_optimal(self):
+        graph = grid_graph(12, 0)
+
+        def neighbours(node, side):
+            return ((neighbour, data['weight']) for neighbour, data in graph.adj[node].items())
+
+        for source, target in (((0, 0), (11, 11)), ((3, 7), (9, 1)), ((5, 5), (5, 6))):
+            ends = (target, source)
+
+            def heuristic(node, side):
+                return abs(node[0] - ends[side][0]) + abs(node[1] - ends[side][1])
+
+            stats = dict()
+            path, cost = bidirectional_astar(source, target, neighbours, heuristic, stats)
+            self.assertAlmostEqual(cost, nx.dijkstra_path_length(graph, source, target))
+            self.assertEqual((path[0], path[-1]), (source, target))
+            self.assertAlmostEqual(sum(graph.edges[u, v]['weight'] for u, v in zip(path, path[1:])), cost)
+            self.assertLess(stats['expanded'], graph.number_of_nodes())
+
+    def test_trivial(self):
+        self.assertEqual(bidirectional_astar(1, 1, lambda node, side: (), lambda node, side: 0), ([1], 0))
+        with self.assertRaises(RuntimeError):
+            bidirectional_astar(1, 2, lambda node, side: (), lambda node, side: 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.pathfinding.contraction import ContractionHierarchy
+from offroad_routing.pathfinding.csr_search import csr_dijkstra
+from offroad_routing.visibility.csr_graph import CsrGraph
+
+
+def random_graph(size, edges, seed):
+    random.seed(seed)
+    graph = nx.gnm_random_graph(size, edges, seed=seed)
+    sources, targets = zip(*graph.edges())
+    return CsrGraph.from_edges(range(size), [random.random() for _ in range(size)], [0.0] * size, sources,
+                               targets, [random.uniform(1, 5) for _ in sources])
+
+
+def path_cost(graph, path):
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        neighbours, weights = graph.neighbours(a)
+        cost += weights[neighbours == b].min()
+    return cost
+
+
+class TestContraction(unittest.TestCase):
+    def test_optimal(self):
+        graph = random_graph(200, 600, 0)
+        hierarchy = ContractionHierarchy.build(graph)
+        self.assertEqual(sorted(hierarchy.rank.tolist()), list(range(200)))
+        random.seed(1)
+        for _ in range(50):
+            source, target = random.randrange(200), random.randrange(200)
+            costs, _ = csr_dijkstra(graph, source)
+            if np.isinf(costs[target]):
+                self.assertRaises(RuntimeError, hierarchy.find, source, target)
+                continue
+            path, cost = hierarchy.find(source, target)
+            self.assertAlmostEqual(cost, costs[target])
+            self.assertEqual((path[0], path[-1]), (source, target))
+            self.assertAlmostEqual(path_cost(graph, path), cost)
+        self.assertEqual(hierarchy.find(5, 5), ([5], 0))
+
+    def test_find_between(self):
+        graph = random_graph(100, 400, 2)
+        hierarchy = ContractionHierarchy.build(graph, settle_limit=10)
+        sources, targets = {1: 2.0, 2: 0.5}, {50: 1.0, 60: 0.0}
+        expected = min(sources[s] + csr_dijkstra(graph, s)[0][t] + targets[t] for s in sources for t in targets)
+        path, cost = hierarchy.find_between(sources, targets)
+        self.assertAlmostEqual(cost, expected)
+        self.assertAlmostEqual(sources[path[0]] + path_cost(graph, path) + targets[path[-1]], cost)
+
+    def test_astar(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        pathfinder = AStar(vgraph)
+        start, goal = (34.02, 59.01), (34.12, 59.09)
+        expected, exact = pathfinder.find(start, goal), pathfinder.find(start, goal, snap=False)
+        hierarchy = vgraph.contract()
+        self.assertIs(vgraph.hierarchy, hierarchy)
+        path = pathfinder.find(start, goal)
+        self.assertEqual((path.path[0], path.path[-1]), (expected.path[0], expected.path[-1]))
+        nodes = vgraph.nearest_vertices((start, goal))[1][:, 0]
+        _, cost = hierarchy.find(*hierarchy.graph.vertices(nodes).tolist())
+        self.assertAlmostEqual(cost, nx.shortest_path_length(vgraph.graph, *nodes.tolist(), weight='weight'))
+        self.assertEqual(pathfinder.find(start, goal, snap=False).path, exact.path)
+        self.assertGreater(pathfinder.stats['expanded'], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'graph.orvg')
+            vgraph.save(filename)
+            loaded = VisibilityGraph.load(filename)
+            self.assertEqual(loaded.hierarchy.number_of_shortcuts(), hierarchy.number_of_shortcuts())
+            self.assertEqual(AStar(loaded).find(start, goal, snap=False).path, exact.path)
+
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        self.assertIsNone(vgraph.hierarchy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.geometry.algorithms import point_distance
+from offroad_routing.visibility.corridor import Corridor
+
+
+class TestCorridor(unittest.TestCase):
+    def test_corridor(self):
+        corridor = Corridor((34.0, 59.0), (34.1, 59.0), 1)
+        self.assertTrue(corridor.contains((34.05, 59.008)))
+        self.assertFalse(corridor.contains((34.05, 59.01)))
+        self.assertFalse(corridor.contains((34.12, 59.0)))
+        self.assertTrue(corridor.intersects([(34.05, 59.0), (34.05, 59.1)]))
+        self.assertTrue(corridor.intersects([(34.04, 58.9), (34.06, 58.9), (34.05, 59.1)]))
+        self.assertFalse(corridor.intersects([(34.05, 59.02), (34.06, 59.03), (34.05, 59.03)]))
+        self.assertRaises(ValueError, Corridor, (34.0, 59.0), (34.1, 59.0), 0)
+
+    def test_objects(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        corridor = Corridor((34.02, 59.01), (34.12, 59.09), 0.5)
+        polygons, linestrings = corridor.objects(vgraph)
+        self.assertLess(len(polygons), len(vgraph.polygons))
+        self.assertLess(len(linestrings), len(vgraph.linestrings))
+        self.assertIsNone(Corridor((34.02, 59.01), (34.12, 59.09), 100).objects(vgraph))
+        distance = point_distance(corridor.start, corridor.goal)
+        self.assertAlmostEqual(corridor.outside_distance() ** 2, 4 * 0.5 ** 2 + distance ** 2)
+
+        vertices = vgraph.incident_vertices(((34.06, 59.05), None, None, None, None), objects=(polygons, linestrings))
+        self.assertTrue(all(vertex[1] in (polygons if vertex[3] else linestrings) for vertex in vertices))
+
+    def test_astar_corridor(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_size=100000)
+        pathfinder = AStar(vgraph)
+        optimal = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1)
+        hits = vgraph.adjacency_cache.hits
+        for width in (0.01, 0.5, 2):
+            path = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1, corridor=width)
+            self.assertEqual((path.path[0], path.path[-1]), ((34.02, 59.01), (34.12, 59.09)))
+            self.assertGreaterEqual(path.cost, optimal.cost - 1e-9)
+            self.assertGreaterEqual(path.bound, 1)
+            self.assertLessEqual(path.cost, optimal.cost * path.bound + 1e-9)
+        # visible vertices memoized by full search are used inside corridor
+        self.assertGreater(vgraph.adjacency_cache.hits, hits)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1, corridor=100)
+        self.assertAlmostEqual(path.cost, optimal.cost)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), corridor=0.5, max_expanded=10 ** 6)
+        self.assertLessEqual(path.cost, optimal.cost * path.bound + 1e-9)
+        self.assertIsNone(pathfinder.find((34.02, 59.01), (34.12, 59.09), corridor=0.5).bound)
+
+    def test_default_surface(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True), default_surface="wood")
+        pathfinder = AStar(vgraph)
+        optimal = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1)
+        path = pathfinder.find((34.02, 59.01), (34.12, 59.09), heuristic_multiplier=1, corridor=2)
+        self.assertGreaterEqual(path.cost, optimal.cost - 1e-9)
+        self.assertLessEqual(path.cost, optimal.cost * path.bound + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.pathfinding.csr_search import csr_astar
+from offroad_routing.pathfinding.csr_search import csr_bidirectional_astar
+from offroad_routing.pathfinding.csr_search import csr_dijkstra
+from offroad_routing.visibility.csr_graph import CsrGraph
+
+node_ids = (30, 10, 20, 40, 10)
+xs = (34.02, 34.0, 34.01, 34.03, 34.0)
+ys = (59.0, 59.0, 59.0, 59.0, 59.0)
+edges = ((10, 20, 1.0), (20, 30, 1.0), (30, 20, 0.5), (10, 30, 5.0), (30, 40, 2.0), (40, 40, 1.0))
+
+
+def small_graph():
+    return CsrGraph.from_edges(node_ids, xs, ys, [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges])
+
+
+class TestCsrGraph(unittest.TestCase):
+    def test_from_edges(self):
+        graph = small_graph()
+        self.assertEqual(graph.ids.tolist(), [10, 20, 30, 40])
+        self.assertEqual(graph.x.tolist(), [34.0, 34.01, 34.02, 34.03])
+        self.assertEqual(graph.number_of_nodes(), 4)
+        self.assertEqual(graph.number_of_edges(), 4)
+        neighbours, weights = graph.neighbours(2)
+        self.assertEqual(neighbours.tolist(), [0, 1, 3])
+        self.assertEqual(weights.tolist(), [5.0, 0.5, 2.0])
+
+    def test_networkx(self):
+        graph = small_graph()
+        converted = graph.to_networkx()
+        self.assertEqual(converted.number_of_edges(), 4)
+        self.assertEqual(converted.nodes[30], {'x': 34.02, 'y': 59.0})
+        back = CsrGraph.from_networkx(converted)
+        for name in ("x", "y", "indptr", "indices", "weights", "node_ids"):
+            self.assertTrue(np.array_equal(getattr(back, name), getattr(graph, name)))
+
+    def test_search(self):
+        graph = small_graph()
+        self.assertEqual(csr_astar(graph, 0, 3), [0, 1, 2, 3])
+        self.assertEqual(csr_astar(graph, 3, 3), [3])
+        self.assertEqual(csr_bidirectional_astar(graph, 0, 3), [0, 1, 2, 3])
+        self.assertEqual(csr_bidirectional_astar(graph, 3, 0), [3, 2, 1, 0])
+        costs, predecessors = csr_dijkstra(graph, 0)
+        self.assertEqual(costs.tolist(), [0.0, 1.0, 1.5, 3.5])
+        self.assertEqual(predecessors.tolist()[1:], [0, 1, 2])
+        costs, _ = csr_dijkstra(graph, 0, max_cost=2)
+        self.assertEqual(costs.tolist(), [0.0, 1.0, 1.5, np.inf])
+        self.assertEqual(graph.nearest_vertex((34.011, 59.001)), 1)
+
+    def test_unreachable(self):
+        graph = CsrGraph.from_edges((1, 2, 3), (0, 1, 2), (0, 0, 0), (1,), (2,), (1.0,))
+        with self.assertRaises(RuntimeError):
+            csr_astar(graph, 0, 2)
+
+    def test_build_compact(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        expected = CsrGraph.from_networkx(vgraph.graph)
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        graph = vgraph.csr_graph
+        for name in ("indptr", "indices", "node_ids"):
+            self.assertTrue(np.array_equal(getattr(graph, name), getattr(expected, name)))
+        self.assertTrue(np.allclose(graph.weights, expected.weights))
+        self.assertEqual(vgraph.stats['number_of_edges'], graph.number_of_edges())
+        self.assertEqual(vgraph.graph.number_of_edges(), graph.number_of_edges())
+
+
+if __name__ == '__main__':
+    unittest.main()
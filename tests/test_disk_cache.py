@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.visibility.disk_cache import DiskAdjacencyCache
+from offroad_routing.visibility.vertex_table import VertexTable
+
+polygons = ({"geometry": (((0, 0), (1, 0), (1, 1), (0, 0)),)},)
+linestrings = ({"geometry": ((2, 2), (3, 3))},)
+table = VertexTable(polygons, linestrings)
+
+
+def write(filename, vertex):
+    with DiskAdjacencyCache(filename, "geometry", table) as cache:
+        for _ in range(20):
+            cache.put(vertex, [((2.0, 2.0), 0, 0, False, float(vertex))])
+            cache.get_many(range(len(table)))
+    return vertex
+
+
+# cache inherited by worker processes without pickling
+_inherited_cache = None
+
+
+def init_inherited(cache):
+    global _inherited_cache
+    _inherited_cache = cache
+
+
+def write_inherited(vertex):
+    _inherited_cache.put(vertex, [((2.0, 2.0), 0, 0, False, float(vertex))])
+    return len(_inherited_cache.get_many(range(len(table))))
+
+
+class TestDiskCache(unittest.TestCase):
+    def test_put_get(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            with DiskAdjacencyCache(filename, "geometry", table) as cache:
+                self.assertIs(cache.get(0), None)
+                cache.put(0, [((1.0, 0.0), 0, 1, True, 20), ((3.0, 3.0), 0, 1, False, 3)])
+                cache.put_many([(1, []), (3, [((0.0, 0.0), 0, 0, True, 1)])])
+                self.assertEqual(cache.get(0), [((1.0, 0.0), 0, 1, True, 20), ((3.0, 3.0), 0, 1, False, 3)])
+                self.assertEqual(cache.get_many([1, 2, 3]), {1: [], 3: [((0.0, 0.0), 0, 0, True, 1)]})
+                self.assertEqual(cache.stats, {'hits': 3, 'misses': 2, 'number_of_vertices': 3})
+
+                loaded = pickle.loads(pickle.dumps(cache))
+                self.assertEqual(dict(loaded.items()), cache.get_many(range(5)))
+                loaded.close()
+            with DiskAdjacencyCache(filename, "other geometry", table) as cache:
+                self.assertEqual(len(cache), 0)
+
+    def test_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                self.assertEqual(sorted(executor.map(write, [filename] * 5, range(5))), list(range(5)))
+            with DiskAdjacencyCache(filename, "geometry", table) as cache:
+                self.assertEqual({vertex: vertices[0][4] for vertex, vertices in cache.items()},
+                                 {vertex: vertex for vertex in range(5)})
+
+    def test_fork(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            with DiskAdjacencyCache(filename, "geometry", table) as cache:
+                # connection of this process is opened before workers are forked
+                cache.put(0, [])
+                context = multiprocessing.get_context('fork')
+                with ProcessPoolExecutor(max_workers=2, mp_context=context, initializer=init_inherited,
+                                         initargs=(cache,)) as executor:
+                    self.assertTrue(all(count >= 2 for count in executor.map(write_inherited, range(1, 5))))
+                self.assertEqual(len(cache), 5)
+
+    def test_default_weight(self):
+        geom = Geometry.load('user_area', '../maps')
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_file=filename)
+            AStar(vgraph).find((34.02, 59.01), (34.12, 59.09))
+            self.assertGreater(len(vgraph.disk_cache), 0)
+            other = VisibilityGraph(*geom.export(remove_inner=True), default_surface="wood", cache_file=filename)
+            self.assertNotEqual(other.fingerprint, vgraph.fingerprint)
+            self.assertEqual(len(other.disk_cache), 0)
+            vgraph.disk_cache.close()
+            other.disk_cache.close()
+
+    def test_astar(self):
+        geom = Geometry.load('user_area', '../maps')
+        expected = AStar(VisibilityGraph(*geom.export(remove_inner=True))).find((34.02, 59.01), (34.12, 59.09))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'cache.sqlite')
+            vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_file=filename)
+            self.assertEqual(AStar(vgraph).find((34.02, 59.01), (34.12, 59.09)).path, expected.path)
+            stored = len(vgraph.disk_cache)
+            self.assertGreater(stored, 0)
+            vgraph.disk_cache.close()
+
+            vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_size=100000, cache_file=filename)
+            self.assertEqual(vgraph.warm_cache(), stored)
+            self.assertEqual(AStar(vgraph).find((34.02, 59.01), (34.12, 59.09)).path, expected.path)
+            self.assertEqual(vgraph.adjacency_cache.misses, 0)
+            self.assertEqual(vgraph.disk_cache.stats['number_of_vertices'], stored)
+            vgraph.disk_cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 import unittest
+from os import path
+from tempfile import TemporaryDirectory
 
+import numpy as np
 from offroad_routing import Geometry
 from offroad_routing import VisibilityGraph
+from offroad_routing.visibility.graph_file import load_arrays
+from offroad_routing.visibility.graph_file import save_arrays
 
 
 class TestGraph(unittest.TestCase):
@@ -9,3 +14,58 @@ class TestGraph(unittest.TestCase):
         geom = Geometry.load('user_area', '../maps')
         vgraph = VisibilityGraph(*geom.export(remove_inner=True))
         vgraph.build(inside_percent=1, multiprocessing=False)
+
+    def test_save_load(self):
+        geom = Geometry.load('user_area', '../maps')
+        polygons, linestrings = geom.export(remove_inner=True)
+        vgraph = VisibilityGraph(polygons, linestrings, default_surface="wood")
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        with TemporaryDirectory() as directory:
+            filename = path.join(directory, "user_area.graph")
+            vgraph.save(filename)
+            # geometry is stored as arrays, not as pickled records
+            arrays, meta = load_arrays(filename, mmap=False)
+            self.assertIn("ls_coordinates", arrays)
+            for mmap in (True, False):
+                loaded = VisibilityGraph.load(filename, mmap=mmap)
+                self.assertEqual(loaded.default_weight, vgraph.default_weight)
+                self.assertEqual(loaded.fingerprint, vgraph.fingerprint)
+                self.assertEqual(loaded.polygons.to_records(), polygons)
+                self.assertEqual(loaded.linestrings, linestrings)
+                for name in ("x", "y", "indptr", "indices", "weights", "node_ids"):
+                    self.assertTrue(np.array_equal(getattr(loaded.csr_graph, name),
+                                                   getattr(vgraph.csr_graph, name)))
+                del loaded
+            loaded = VisibilityGraph.load(filename, polygons=polygons, linestrings=linestrings)
+            self.assertEqual(loaded.stats, vgraph.stats)
+            del loaded
+            with self.assertRaises(ValueError):
+                VisibilityGraph.load(filename, polygons=polygons[1:], linestrings=linestrings)
+
+            graph_arrays = {name: array for name, array in arrays.items() if not name.startswith(("pg_", "ls_"))}
+            save_arrays(filename, graph_arrays, meta)
+            with self.assertRaises(ValueError):
+                VisibilityGraph.load(filename)
+            loaded = VisibilityGraph.load(filename, polygons=polygons, linestrings=linestrings)
+            self.assertEqual(loaded.stats, vgraph.stats)
+            del loaded, arrays, graph_arrays
+
+    def test_graph_file(self):
+        arrays = {"a": np.arange(5, dtype=np.int32), "b": np.zeros((2, 3)), "c": np.array([], dtype=np.int64)}
+        with TemporaryDirectory() as directory:
+            filename = path.join(directory, "arrays")
+            save_arrays(filename, arrays, {"key": [1, 2]})
+            loaded, meta = load_arrays(filename)
+            self.assertEqual(meta, {"key": [1, 2]})
+            for name, array in arrays.items():
+                self.assertEqual(loaded[name].dtype, array.dtype)
+                self.assertTrue(np.array_equal(loaded[name], array))
+            del loaded
+            with open(filename, "r+b") as f:
+                f.write(b"NOTGRAPH")
+            with self.assertRaises(ValueError):
+                load_arrays(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from offroad_routing.geometry.grid_index import GridIndex
+
+bboxes = ((0, 0, 2, 2), (1, 1, 5, 3), (4, 4, 6, 6), (10, 10, 10, 10), (-3, -1, 0, 0))
+
+
+class TestGridIndex(unittest.TestCase):
+    def test_query_point(self):
+        index = GridIndex(bboxes)
+        self.assertEqual(index.query_point((1.5, 1.5)), [0, 1])
+        self.assertEqual(index.query_point((5, 5)), [2])
+        self.assertEqual(index.query_point((10, 10)), [3])
+        self.assertEqual(index.query_point((0, 0)), [0, 4])
+        self.assertEqual(index.query_point((8, 8)), [])
+        self.assertEqual(index.query_point((-10, 20)), [])
+
+    def test_query_bbox(self):
+        index = GridIndex(bboxes)
+        self.assertEqual(index.query_bbox((3, 2, 4.5, 4.5)), [1, 2])
+        self.assertEqual(index.query_bbox((-100, -100, 100, 100)), [0, 1, 2, 3, 4])
+        self.assertEqual(index.query_bbox((7, 7, 9, 9)), [])
+
+    def test_cell_size(self):
+        for cell_size in (0.1, 1, 100):
+            index = GridIndex(bboxes, cell_size)
+            self.assertEqual(index.query_point((1.5, 1.5)), [0, 1])
+            self.assertEqual(index.query_bbox((3, 2, 4.5, 4.5)), [1, 2])
+
+    def test_degenerate(self):
+        self.assertEqual(GridIndex(()).query_point((0, 0)), [])
+        index = GridIndex(((1, 1, 1, 1), (2, 2, 2, 2)))
+        self.assertEqual(index.query_point((2, 2)), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
+import pickle
 import unittest
 
 from offroad_routing.visibility.inner_edges import find_inner_edges
+from offroad_routing.visibility.inner_edges import PreparedPolygons
 
 polygon = (((1, 1), (7, 1), (4, 2), (6, 2), (6, 4), (8, 5), (2, 5), (4, 4), (1, 3), (4, 3), (1, 1)),)
 point1 = (1, 1)
@@ -38,6 +40,23 @@ class TestInnerEdges(unittest.TestCase):
         edges = find_inner_edges(point6, None, polygon, 0, 1, 0)
         self.assertEqual({point[0] for point in edges}, {(1, 1), (7, 1), (4, 2), (6, 2), (6, 4), (4, 3)})
 
+    def test_prepared(self):
+        prepared = PreparedPolygons([{"geometry": polygon}])
+        for point, point_number in ((point1, 0), (point3, 5), (point5, None), (point6, None)):
+            self.assertEqual(find_inner_edges(point, point_number, polygon, 0, 1, 0, prepared[0]),
+                             find_inner_edges(point, point_number, polygon, 0, 1, 0))
+        prepared = pickle.loads(pickle.dumps(prepared))
+        self.assertEqual(find_inner_edges(point1, 0, polygon, 0, 1, 0, prepared[0]),
+                         find_inner_edges(point1, 0, polygon, 0, 1, 0))
+
+    def test_sampling(self):
+        full = find_inner_edges(point5, None, polygon, 0, 1, 0)
+        self.assertEqual(find_inner_edges(point5, None, polygon, 0, 0, 0), [])
+        samples = [find_inner_edges(point5, None, polygon, 0, 0.5, 0, seed=seed) for seed in range(20)]
+        self.assertTrue(all(set(sample) <= set(full) for sample in samples))
+        self.assertGreater(len({tuple(sample) for sample in samples}), 1)
+        self.assertEqual(samples[3], find_inner_edges(point5, None, polygon, 0, 0.5, 0, seed=3))
+
     def test_exception(self):
         with self.assertRaises(Exception):
             find_inner_edges((0, 0), None, ((0, 0),), 0, 1, 0)
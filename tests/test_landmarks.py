@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.pathfinding.csr_search import csr_astar
+from offroad_routing.pathfinding.csr_search import csr_dijkstra
+from offroad_routing.pathfinding.landmarks import Landmarks
+from offroad_routing.visibility.csr_graph import CsrGraph
+from test_contraction import random_graph
+
+
+class TestLandmarks(unittest.TestCase):
+    def test_bounds(self):
+        graph = random_graph(150, 300, 3)
+        landmarks = Landmarks.build(graph, count=8)
+        self.assertEqual(len(set(landmarks.vertices.tolist())), 8)
+        for target in (0, 40, 99):
+            costs, _ = csr_dijkstra(graph, target)
+            bounds = landmarks.lower_bounds({target: 0})
+            self.assertEqual(bounds[target], 0)
+            reachable = np.isfinite(costs)
+            self.assertTrue(np.all(bounds[reachable] <= costs[reachable] + 1e-9))
+            self.assertTrue(np.all(np.isinf(bounds[~reachable]) | (bounds[~reachable] == 0)))
+
+        targets = {3: 1.5, 70: 0.5}
+        costs = np.minimum(csr_dijkstra(graph, 3)[0] + 1.5, csr_dijkstra(graph, 70)[0] + 0.5)
+        bounds = landmarks.lower_bounds(targets)
+        reachable = np.isfinite(costs)
+        self.assertTrue(np.all(bounds[reachable] <= costs[reachable] + 1e-9))
+
+    def test_disconnected(self):
+        graph = CsrGraph.from_edges(range(4), [0.0, 0.1, 0.2, 0.3], [0.0] * 4, [0, 2], [1, 3], [1.0, 1.0])
+        landmarks = Landmarks.build(graph, count=4)
+        self.assertEqual(len(landmarks), 2)
+        bounds = landmarks.lower_bounds({landmarks.vertices[0]: 0})
+        self.assertEqual(sorted(bounds.tolist()), [0, 1, np.inf, np.inf])
+
+    def test_astar(self):
+        geom = Geometry.load('user_area', '../maps')
+        start, goal = (34.02, 59.01), (34.12, 59.09)
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        landmarks = vgraph.compute_landmarks()
+        self.assertIs(vgraph.landmarks, landmarks)
+        self.assertTrue(landmarks.complete)
+        graph = vgraph.csr_graph
+        source, target = graph.nearest_vertex(start), graph.nearest_vertex(goal)
+        self.assertEqual(csr_astar(graph, source, target, bounds=landmarks.lower_bounds({target: 0})),
+                         csr_astar(graph, source, target))
+
+        fly = VisibilityGraph(*geom.export(remove_inner=True))
+        plain = AStar(fly)
+        expected = plain.find(start, goal, heuristic_multiplier=1)
+        pathfinder = AStar(fly, landmarks=landmarks)
+        self.assertEqual(pathfinder.find(start, goal, heuristic_multiplier=1).path, expected.path)
+        self.assertLess(pathfinder.stats['expanded'], plain.stats['expanded'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'graph.orvg')
+            vgraph.save(filename)
+            loaded = VisibilityGraph.load(filename)
+            self.assertTrue(np.array_equal(loaded.landmarks.distances, landmarks.distances))
+            self.assertEqual(loaded.landmarks.parameters, landmarks.parameters)
+            self.assertEqual(AStar(loaded).find(start, goal, snap=False).path,
+                             AStar(vgraph).find(start, goal, snap=False).path)
+
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        self.assertIsNone(vgraph.landmarks)
+
+    def test_incomplete(self):
+        geom = Geometry.load('user_area', '../maps')
+        start, goal = (34.02, 59.01), (34.12, 59.09)
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(multiprocessing=False, compact=True)
+        landmarks = vgraph.compute_landmarks()
+        self.assertEqual(landmarks.parameters, {"inside_percent": 0.4, "max_distance": None, "max_neighbours": None})
+        self.assertFalse(landmarks.complete)
+        self.assertFalse(Landmarks.build(random_graph(20, 40, 3)).complete)
+
+        # graph with fewer edges does not bound on the fly search, landmarks are not used
+        fly = VisibilityGraph(*geom.export(remove_inner=True))
+        plain = AStar(fly)
+        expected = plain.find(start, goal, heuristic_multiplier=1)
+        pathfinder = AStar(fly, landmarks=landmarks)
+        self.assertEqual(pathfinder.find(start, goal, heuristic_multiplier=1).path, expected.path)
+        self.assertEqual(pathfinder.stats, plain.stats)
+
+        # the graph itself is bounded
+        graph = vgraph.csr_graph
+        source, target = graph.nearest_vertex(start), graph.nearest_vertex(goal)
+        self.assertAlmostEqual(AStar(vgraph).find(start, goal, bidirectional=True).cost,
+                               graph.path_weight(csr_astar(graph, source, target)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from offroad_routing.visibility.occlusion import OcclusionMap
+
+
+class TestOcclusionMap(unittest.TestCase):
+    def test_hide_segment(self):
+        occlusion = OcclusionMap((0, 0))
+        self.assertFalse(occlusion.hidden((3, -1, 4, 1)))
+        occlusion.hide_segment((2, -2), (2, 2))
+        self.assertTrue(occlusion.hidden((3, -1, 4, 1)))
+        # crosses the segment or lies before it
+        self.assertFalse(occlusion.hidden((1.5, -1, 4, 1)))
+        self.assertFalse(occlusion.hidden((1, -1, 1.5, 1)))
+        # not covered by the segment angle
+        self.assertFalse(occlusion.hidden((3, -1, 4, 3)))
+        self.assertFalse(occlusion.hidden((-4, -1, -3, 1)))
+        self.assertFalse(occlusion.hidden((-1, -1, 1, 1)))
+
+    def test_wrap(self):
+        # segment angle contains zero polar angle
+        occlusion = OcclusionMap((1, 1))
+        occlusion.hide_segment((3, 3), (3, -1))
+        self.assertTrue(occlusion.hidden((5, 0, 6, 2)))
+        self.assertFalse(occlusion.hidden((-6, 0, -5, 2)))
+        self.assertFalse(occlusion.hidden((1, 5, 2, 6)))
+        self.assertFalse(occlusion.hidden((1, -6, 2, -5)))
+
+    def test_segment_through_point(self):
+        occlusion = OcclusionMap((0, 0))
+        occlusion.hide_segment((1, 0), (2, 0))
+        occlusion.hide_segment((-1, 0), (1, 0))
+        self.assertFalse(occlusion.hidden((3, -0.1, 4, 0.1)))
+        self.assertFalse(occlusion.hidden((-1, 3, 1, 4)))
+
+    def test_hide_angle(self):
+        occlusion = OcclusionMap((0, 0))
+        occlusion.hide_angle((1, 1), (1, -1), inside=True)
+        self.assertTrue(occlusion.hidden((0.2, -0.1, 0.3, 0.1)))
+        self.assertFalse(occlusion.hidden((-0.2, -0.1, -0.1, 0.1)))
+        self.assertFalse(occlusion.hidden((0.1, 0.5, 0.2, 1)))
+
+        occlusion = OcclusionMap((0, 0))
+        occlusion.hide_angle((1, 1), (1, -1), inside=False)
+        self.assertFalse(occlusion.hidden((0.2, -0.1, 0.3, 0.1)))
+        self.assertTrue(occlusion.hidden((-0.2, -0.1, -0.1, 0.1)))
+        self.assertTrue(occlusion.hidden((0.1, 0.5, 0.2, 1)))
+
+        # sides are collinear
+        occlusion = OcclusionMap((0, 0))
+        occlusion.hide_angle((1, 0), (-1, 0), inside=False)
+        self.assertFalse(occlusion.hidden((-0.2, -0.1, -0.1, 0.1)))
+
+    def test_distance(self):
+        occlusion = OcclusionMap((0, 0))
+        self.assertEqual(occlusion.distance((-1, -1, 1, 1)), 0)
+        self.assertEqual(occlusion.distance((3, -1, 4, 1)), 3)
+        self.assertEqual(occlusion.distance((3, 4, 5, 5)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.geometry.polygon_arrays import PolygonArrays
+from offroad_routing.osm_data.convex_hull import build_convex_hull
+from offroad_routing.visibility.vertex_table import VertexTable
+
+
+def record(tag, geometry):
+    hull, hull_points, angles = build_convex_hull(geometry[0])
+    return {"tag": tag, "geometry": geometry, "convex_hull": hull, "convex_hull_points": hull_points, "angles": angles}
+
+
+polygons = [
+    record([20], (((0, 0), (1, 0), (0.5, 0.2), (1, 1), (0, 0)),)),
+    record([100, None], (((5, 5), (9, 5), (9, 9), (5, 9), (5, 5)), ((6, 6), (7, 6), (7, 7), (6, 6)))),
+    record([10], (((2, 2), (3, 3), (2, 2)),)),
+]
+
+
+class TestPolygonArrays(unittest.TestCase):
+    def test_records(self):
+        arrays = PolygonArrays.from_records(polygons)
+        self.assertEqual(len(arrays), 3)
+        self.assertEqual(arrays.coordinates.shape, (17, 2))
+        for converted, expected in zip(arrays, polygons):
+            self.assertEqual(converted["geometry"], expected["geometry"])
+            self.assertEqual(converted["convex_hull"], tuple(map(tuple, expected["convex_hull"])))
+            self.assertEqual(converted["convex_hull_points"], tuple(expected["convex_hull_points"]))
+            self.assertEqual(converted["angles"], expected["angles"])
+            self.assertEqual(converted["tag"], expected["tag"])
+        hulls = arrays.hulls([2, 0, 1, 0])
+        for (hull, angles, hull_points), expected in zip(hulls, [polygons[i] for i in (2, 0, 1, 0)]):
+            self.assertEqual(list(map(tuple, hull)), list(map(tuple, expected["convex_hull"])))
+            self.assertEqual(angles, expected["angles"] and list(expected["angles"]))
+            self.assertEqual(hull_points, list(expected["convex_hull_points"]))
+        self.assertEqual(arrays.hulls([]), [])
+        self.assertEqual(arrays.outer_size(1), 4)
+        self.assertEqual(arrays.hull_bboxes().tolist(), [[0, 0, 1, 1], [5, 5, 9, 9], [2, 2, 3, 3]])
+
+    def test_pickle(self):
+        arrays = PolygonArrays.from_records(polygons)
+        loaded = pickle.loads(pickle.dumps(arrays))
+        for name in ("coordinates", "ring_offsets", "polygon_offsets", "hull_points", "tags"):
+            self.assertTrue(np.array_equal(getattr(loaded, name), getattr(arrays, name), equal_nan=True))
+        self.assertEqual(loaded.to_records(), arrays.to_records())
+
+    def test_vertex_table(self):
+        table = VertexTable(PolygonArrays.from_records(polygons), ())
+        expected = VertexTable(polygons, ())
+        self.assertEqual(table.polygon_offsets, expected.polygon_offsets)
+        self.assertEqual(table.x.tolist(), expected.x.tolist())
+        self.assertEqual(table.y.tolist(), expected.y.tolist())
+
+    def test_empty(self):
+        arrays = PolygonArrays.from_records([])
+        self.assertEqual(len(arrays), 0)
+        self.assertEqual(arrays.hull_bboxes().shape, (0, 4))
+        self.assertEqual(len(VertexTable(arrays, ())), 0)
+
+    def test_graph(self):
+        geom = Geometry.load('user_area', '../maps')
+        records, linestrings = geom.export(remove_inner=True)
+        arrays, _ = geom.export(remove_inner=True, arrays=True)
+        self.assertIsInstance(arrays, PolygonArrays)
+        self.assertLess(len(pickle.dumps(arrays)), len(pickle.dumps(records)))
+
+        expected = VisibilityGraph(records, linestrings)
+        expected.build(inside_percent=1, multiprocessing=False)
+        vgraph = VisibilityGraph(arrays, linestrings)
+        vgraph.build(inside_percent=1, multiprocessing=True, max_workers=2)
+        self.assertEqual(sorted(map(sorted, vgraph.graph.edges())), sorted(map(sorted, expected.graph.edges())))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'graph.orvg')
+            vgraph.save(filename)
+            loaded = VisibilityGraph.load(filename)
+            self.assertIsInstance(loaded.polygons, PolygonArrays)
+            self.assertEqual(loaded.fingerprint, vgraph.fingerprint)
+            self.assertEqual(loaded.csr_graph.number_of_nodes(), vgraph.graph.number_of_nodes())
+
+
+if __name__ == '__main__':
+    unittest.main()
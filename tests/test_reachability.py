@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+from offroad_routing import AStar
+from offroad_routing import Geometry
+from offroad_routing import Reachability
+from offroad_routing import VisibilityGraph
+from shapely.geometry import Point
+
+
+sources = [(34.02, 59.01), (34.06, 59.05)]
+targets = [(34.12, 59.09), (34.06, 59.05), (34.04, 59.08)]
+
+
+class TestReachability(unittest.TestCase):
+    def test_distance_matrix_notbuilt(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True), cache_size=100000)
+        pathfinder = AStar(vgraph)
+        matrix = Reachability(vgraph).distance_matrix(sources, targets)
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix[1, 1], 0)
+        for i, source in enumerate(sources):
+            for j, target in enumerate(targets):
+                if i != 1 or j != 1:
+                    cost = pathfinder.find(source, target, heuristic_multiplier=1).cost
+                    self.assertAlmostEqual(matrix[i, j], cost)
+
+        limit = float(np.sort(matrix[0])[1])
+        bounded = Reachability(vgraph).distance_matrix(sources[:1], targets, max_cost=limit)
+        np.testing.assert_array_equal(bounded[0], np.where(matrix[0] <= limit, matrix[0], np.inf))
+        self.assertRaises(ValueError, Reachability(vgraph).distance_matrix, sources, targets, -1)
+
+    def test_distance_matrix_prebuilt(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        pathfinder = AStar(vgraph)
+        matrix = Reachability(vgraph).distance_matrix(sources, targets)
+        for i, source in enumerate(sources):
+            for j, target in enumerate(targets):
+                if i != 1 or j != 1:
+                    self.assertAlmostEqual(matrix[i, j], pathfinder.find(source, target, snap=False).cost)
+
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        np.testing.assert_allclose(Reachability(vgraph).distance_matrix(sources, targets), matrix)
+        self.assertEqual(Reachability(vgraph).distance_matrix(sources, []).shape, (2, 0))
+        self.assertRaises(ValueError, Reachability(vgraph).distance_matrix, sources, targets, -1)
+
+    def test_isochrone(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        reachability = Reachability(vgraph)
+        points, costs = reachability.reached_vertices((34.06, 59.05), 40)
+        self.assertGreater(len(points), 0)
+        self.assertLessEqual(costs.max(), 40)
+        isochrone = reachability.isochrone((34.06, 59.05), 40)
+        self.assertEqual(isochrone.crs, 'epsg:4326')
+        self.assertEqual(isochrone['cost'][0], 40)
+        polygon = isochrone.geometry[0]
+        self.assertTrue(polygon.contains(Point(34.06, 59.05)))
+        self.assertTrue(all(polygon.contains(Point(point)) for point, cost in zip(points, costs) if cost < 40))
+        self.assertTrue(polygon.contains(reachability.isochrone((34.06, 59.05), 20).geometry[0]))
+        self.assertTrue(reachability.isochrone((34.06, 59.05), 0).geometry[0].is_empty)
+
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        self.assertGreaterEqual(len(reachability.reached_vertices((34.06, 59.05), 40)[0]), len(points))
+        self.assertEqual(reachability.isochrone((34.06, 59.05), 40).geometry[0].geom_type, 'Polygon')
@@ -0,0 +1,65 @@
+import unittest
+
+import networkx as nx
+from offroad_routing.pathfinding.search import anytime_astar
+from offroad_routing.pathfinding.search import astar
+from test_bidirectional import grid_graph
+
+
+class TestSearch(unittest.TestCase):
+    def test_optimal(self):
+        graph = grid_graph(12, 1)
+
+        def neighbours(node):
+            return ((neighbour, data['weight']) for neighbour, data in graph.adj[node].items())
+
+        for source, target in (((0, 0), (11, 11)), ((3, 7), (9, 1)), ((5, 5), (5, 5))):
+            stats = dict()
+            path, cost = astar(source, target, neighbours,
+                               lambda node: abs(node[0] - target[0]) + abs(node[1] - target[1]), stats)
+            self.assertAlmostEqual(cost, nx.dijkstra_path_length(graph, source, target))
+            self.assertEqual((path[0], path[-1]), (source, target))
+            self.assertLessEqual(stats['expanded'], graph.number_of_nodes())
+
+    def test_unreachable(self):
+        with self.assertRaises(RuntimeError):
+            astar(1, 2, lambda node: (), lambda node: 0)
+
+    def test_anytime(self):
+        graph = grid_graph(20, 2)
+
+        def neighbours(node):
+            return ((neighbour, data['weight']) for neighbour, data in graph.adj[node].items())
+
+        source, target = (0, 0), (19, 13)
+        lowest = nx.dijkstra_path_length(graph, source, target)
+
+        def heuristic(node):
+            return abs(node[0] - target[0]) + abs(node[1] - target[1])
+
+        stats = dict()
+        path, cost, bound = anytime_astar(source, target, neighbours, heuristic, 10, stats=stats)
+        self.assertAlmostEqual(cost, lowest)
+        self.assertEqual(bound, 1)
+        self.assertGreater(stats['searches'], 1)
+        self.assertAlmostEqual(sum(graph.edges[u, v]['weight'] for u, v in zip(path, path[1:])), cost)
+
+        previous = None
+        for max_expanded in (stats['expanded'] // 8, stats['expanded'] // 2, stats['expanded']):
+            path, cost, bound = anytime_astar(source, target, neighbours, heuristic, 10, max_expanded=max_expanded)
+            self.assertEqual((path[0], path[-1]), (source, target))
+            self.assertLessEqual(cost, lowest * bound + 1e-9)
+            if previous is not None:
+                self.assertLessEqual(cost, previous)
+            previous = cost
+
+        with self.assertRaises(TimeoutError):
+            anytime_astar(source, target, neighbours, heuristic, 10, max_expanded=1)
+        with self.assertRaises(RuntimeError):
+            anytime_astar(1, 2, lambda node: (), lambda node: 0, 10)
+        with self.assertRaises(ValueError):
+            anytime_astar(source, target, neighbours, heuristic, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
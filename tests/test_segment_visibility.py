@@ -0,0 +1,65 @@
+import unittest
+
+from offroad_routing.visibility.segment_visibility import SegmentVisibility
+
+point = (0, 0)
+segments = (
+    (((2, -1), 0, 0, True, 1), ((2, 1), 0, 1, True, 1)),
+    (((4, -2), 1, 0, True, 1), ((4, 2), 1, 1, True, 1)),
+    (((-1, 3), 2, 0, True, 1), ((1, 3), 2, 1, True, 1)),
+    (((-3, -3), 3, 0, False, 1), ((-3, 3), 3, 1, False, 1)),
+    (((-5, 1), 4, 0, False, 1), ((-5, 5), 4, 1, False, 1)),
+    (((3, 3), 5, 0, True, 1), ((-2, -4), 5, 1, True, 1)),
+)
+
+
+class TestSegmentVisibility(unittest.TestCase):
+    def test_sweepline(self):
+        visibility = SegmentVisibility()
+        for pair in segments:
+            visibility.add_pair(pair)
+        self.assertEqual({vertex[0] for vertex in visibility.get_edges_sweepline(point)},
+                         {(-1, 3), (1, 3), (-3, -3), (-3, 3), (3, 3), (-2, -4), (-5, 5)})
+
+    def test_restriction_angle(self):
+        visibility = SegmentVisibility()
+        for pair in segments:
+            visibility.add_pair(pair)
+        visibility.set_restriction_angle(((-1, 2), (-1, -2)), point, reverse_angle=False)
+        self.assertEqual({vertex[0] for vertex in visibility.get_edges_sweepline(point)},
+                         {(-3, -3), (-3, 3), (-5, 5)})
+
+    def test_crossing_segments(self):
+        # road (3, -3) - (5, 3) crosses segment 1 and polygon (-4, -1) - (-2, 4) crosses segment 3
+        visibility = SegmentVisibility()
+        for pair in segments + ((((3, -3), 6, 0, False, 1), ((5, 3), 6, 1, False, 1)),
+                                (((-4, -1), 7, 0, True, 1), ((-2, 4), 7, 1, True, 1))):
+            visibility.add_pair(pair)
+        self.assertEqual({vertex[0] for vertex in visibility.get_edges_sweepline(point)},
+                         {(-1, 3), (1, 3), (-3, -3), (3, 3), (-2, -4), (-2, 4)})
+
+    def test_segment_through_point(self):
+        # segment on a line through point does not cross rays to other points
+        visibility = SegmentVisibility()
+        for pair in segments + ((((-1, -1), 6, 0, True, 1), ((1, 1), 6, 1, True, 1)),):
+            visibility.add_pair(pair)
+        self.assertEqual({vertex[0] for vertex in visibility.get_edges_sweepline(point)},
+                         {(-1, 3), (1, 3), (-3, -3), (-3, 3), (3, 3), (-2, -4), (-5, 5), (-1, -1), (1, 1)})
+
+    def test_nearly_collinear_segment(self):
+        # point is almost on the chord line, the road in front of the chord hides its far end
+        point_near = (36.2791708349039, 56.628567911938404)
+        pairs = ((((36.2823165, 56.6287387), 0, 0, True, 1), ((36.273669, 56.6282692), 0, 1, True, 1)),
+                 (((36.2777245, 56.6294849), 1, 0, False, 1), ((36.274834, 56.6279068), 1, 1, False, 1)))
+        edges = list()
+        for method in (SegmentVisibility.get_edges_sweepline, SegmentVisibility.get_edges_brute):
+            visibility = SegmentVisibility()
+            for pair in pairs:
+                visibility.add_pair(pair)
+            edges.append({vertex[0] for vertex in method(visibility, point_near)})
+        self.assertEqual(edges[0], edges[1])
+        self.assertNotIn((36.273669, 56.6282692), edges[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,12 @@
 import unittest
 
+from math import cos
+from math import pi
+from math import sin
+
+from offroad_routing.osm_data.convex_hull import build_convex_hull
+from offroad_routing.visibility.supporting_line import _find_supporting_pair_loop
+from offroad_routing.visibility.supporting_line import _find_supporting_pair_vectorized
 from offroad_routing.visibility.supporting_line import find_restriction_pair
 from offroad_routing.visibility.supporting_line import find_supporting_line
 
@@ -10,6 +17,12 @@ point3 = (2, -1)
 point4 = (3, 3)
 
 
+def star(size):
+    points = [((1 + i % 3 / 4) * cos(2 * pi * i / size), (1 + i % 3 / 4) * sin(2 * pi * i / size))
+              for i in range(size)]
+    return tuple(points + points[:1])
+
+
 class TestSupportingLine(unittest.TestCase):
 
     def test_point_1(self):
@@ -38,6 +51,21 @@ class TestSupportingLine(unittest.TestCase):
     def test_point_4(self):
         self.assertIs(find_supporting_line(point4, polygon), None)
 
+    def test_pocket(self):
+        size = 60
+        _, convex_hull_points, _ = build_convex_hull(star(size))
+        for i in range(size):
+            # points in pockets, on the polygon side and inside polygon
+            for radius in (1.2, 1.125, 0.9):
+                point = (radius * cos(2 * pi * (i + 0.5) / size), radius * sin(2 * pi * (i + 0.5) / size))
+                line = find_supporting_line(point, star(size), convex_hull_points)
+                expected = find_supporting_line(point, star(size))
+                if expected is None:
+                    self.assertIs(line, None)
+                else:
+                    self.assertEqual({line[0], line[-1]}, {expected[0], expected[-1]})
+                    self.assertLessEqual(len(line), 4)
+
     def test_exception(self):
         with self.assertRaises(Exception):
             find_supporting_line((0, 0), ((0, 0),))
@@ -80,6 +108,23 @@ class TestRestrictionPair(unittest.TestCase):
         with self.assertRaises(Exception):
             find_restriction_pair((0, 0), ((0, 0), (1, 1), (2, 2)), 0)
 
+    def test_vectorized(self):
+        size = 120
+        polygon = star(size)
+        for point, point_number in [(polygon[i], i) for i in range(0, size, 7)] + [((0.1, 0.2), None), ((3, 0), None)]:
+            self.assertEqual(_find_supporting_pair_vectorized(point, polygon, size, point_number, range(size),
+                                                              range(size)),
+                             _find_supporting_pair_loop(point, polygon, size, point_number, range(size), range(size)))
+
+    def test_pocket(self):
+        size = 60
+        _, convex_hull_points, _ = build_convex_hull(star(size))
+        for point_number in range(size):
+            if point_number not in convex_hull_points:
+                point = star(size)[point_number]
+                self.assertEqual(find_restriction_pair(point, star(size), point_number, convex_hull_points),
+                                 find_restriction_pair(point, star(size), point_number))
+
 
 if __name__ == '__main__':
     unittest.main()
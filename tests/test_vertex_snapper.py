@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+from offroad_routing import Geometry
+from offroad_routing import VisibilityGraph
+from offroad_routing.visibility.csr_graph import CsrGraph
+from offroad_routing.visibility.vertex_snapper import VertexSnapper
+
+
+class TestVertexSnapper(unittest.TestCase):
+    def test_nearest(self):
+        rng = np.random.default_rng(0)
+        x, y = rng.uniform(34, 35, 500), rng.uniform(59, 60, 500)
+        graph = CsrGraph(x, y, np.zeros(501, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        snapper = VertexSnapper.from_csr(graph)
+        points = np.stack((rng.uniform(33.9, 35.1, 100), rng.uniform(58.9, 60.1, 100)), axis=1)
+        distances, positions = snapper.nearest_many(points, k=3)
+        self.assertEqual(positions.shape, (100, 3))
+        for point, point_distances, point_positions in zip(points, distances, positions):
+            expected = graph.distances(point)
+            self.assertEqual(point_positions.tolist(), np.argsort(expected)[:3].tolist())
+            self.assertTrue(np.allclose(point_distances, np.sort(expected)[:3]))
+        distance, position = snapper.nearest(points[0])
+        self.assertEqual(position.tolist(), positions[0, :1].tolist())
+        self.assertEqual(distance.tolist(), distances[0, :1].tolist())
+
+    def test_graph(self):
+        geom = Geometry.load('user_area', '../maps')
+        vgraph = VisibilityGraph(*geom.export(remove_inner=True))
+        vgraph.build(inside_percent=1, multiprocessing=False)
+        points = ((34.02, 59.01), (34.12, 59.09))
+        distances, nodes = vgraph.nearest_vertices(points, k=2)
+        graph = CsrGraph.from_networkx(vgraph.graph)
+        for point, point_distances, point_nodes in zip(points, distances, nodes):
+            expected = graph.distances(point)
+            self.assertEqual(point_nodes[0], graph.ids[np.argmin(expected)])
+            self.assertTrue(np.allclose(point_distances, np.sort(expected)[:2]))
+        self.assertIs(vgraph.snapper, vgraph.snapper)
+
+        snapper = vgraph.snapper
+        vgraph.build(inside_percent=1, multiprocessing=False, compact=True)
+        self.assertIsNot(vgraph.snapper, snapper)
+        compact_distances, compact_nodes = vgraph.nearest_vertices(points, k=2)
+        self.assertEqual(compact_nodes[:, 0].tolist(), nodes[:, 0].tolist())
+        self.assertTrue(np.allclose(compact_distances, distances))
+        self.assertRaises(ValueError, vgraph.nearest_vertices, points, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from offroad_routing.visibility.vertex_table import VertexTable
+
+polygons = (
+    {"geometry": (((0, 0), (1, 0), (1, 1), (0, 0)),)},
+    {"geometry": (((5, 5), (6, 5), (6, 6), (5, 6), (5, 5)),)},
+)
+linestrings = (
+    {"geometry": ((2, 2), (3, 3))},
+    {"geometry": ((3, 3), (4, 2))},
+)
+
+
+class TestVertexTable(unittest.TestCase):
+    def test_index(self):
+        table = VertexTable(polygons, linestrings)
+        self.assertEqual(len(table), 11)
+        self.assertEqual(table.index(0, 2, True), 2)
+        self.assertEqual(table.index(1, 0, True), 3)
+        self.assertEqual(table.index(0, 1, False), 8)
+        # road junction has the id of its first occurrence
+        self.assertEqual(table.index(1, 0, False), 8)
+        self.assertEqual(table.index(1, 1, False), 10)
+        for vertex in range(len(table)):
+            if vertex != 9:
+                self.assertEqual(table.index(*table.key(vertex)), vertex)
+        self.assertEqual(table.point(6), (5, 6))
+        self.assertEqual(table.point(10), (4, 2))
+
+    def test_points(self):
+        table = VertexTable(polygons, linestrings)
+        points = list(table.points())
+        self.assertEqual(len(points), 10)
+        self.assertEqual(points[3], ((5, 5), 1, 0, True, None))
+        self.assertEqual(points[8], ((3, 3), 0, 1, False, None))
+        self.assertEqual(points[9], ((4, 2), 1, 1, False, None))
+
+    def test_empty(self):
+        table = VertexTable((), ())
+        self.assertEqual(len(table), 0)
+        self.assertEqual(list(table.points()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()